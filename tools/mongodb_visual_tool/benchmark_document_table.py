@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MongoDB Visual Tool - Document Table Benchmark
+
+Compares the legacy grid data path (lists of document dicts, copied on
+set_items and clear-search, sorted with a key closure on every sort) with the
+columnar DocumentTable + SortIndex views on synthetic documents.
+
+The data source section does the same for collections opened through a
+PagedDocumentSource (an in-memory manager stands in for the server): typing
+a query and sorting its results, with the table, search corpus and sort
+index rebuilt on every keystroke and click, or kept per loaded generation.
+
+Usage: python benchmark_document_table.py [--sizes 10000 100000] [--repeat 3]
+"""
+import os
+import sys
+import time
+import random
+import string
+import datetime
+import argparse
+import math
+import tracemalloc
+
+# Add current directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from src.db.paged_source import PagedDocumentSource
+from src.utils.document_table import DocumentTable
+from src.utils.search_index import SearchIndex
+from src.utils.sort_index import SortIndex
+
+ART_MOVEMENTS = ["Impressionism", "Cubism", "Surrealism", "Baroque", "Pop Art", "Expressionism", None]
+SORTS = [("filename", False), ("size", True), ("importedAt", False), ("artMovement", False), ("filename", False)]
+PAGE_SIZE = 50
+
+
+def make_documents(count, seed=1):
+    """Synthetic documents shaped like the image collections"""
+    rng = random.Random(seed)
+    word = lambda: "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+    start = datetime.datetime(2020, 1, 1)
+    docs = []
+    for i in range(count):
+        imported = start + datetime.timedelta(minutes=rng.randint(0, 10 ** 6))
+        docs.append({
+            "_id": f"{i:024x}",
+            "filename": f"{word()}_{word()}.jpg",
+            "title": f"{word().title()} {word()}",
+            "artMovement": rng.choice(ART_MOVEMENTS),
+            "size": rng.randint(1000, 10 ** 7),
+            "importedAt": imported.isoformat() if i % 2 else imported,
+            "filePath": f"/images/{word()}/{i}.jpg",
+        })
+    return docs
+
+
+def legacy_key(field, reverse):
+    """Sort key closure of PaginatedGrid._sort_items before the document table"""
+    def get_key(item):
+        if field == "filename":
+            return str(item.get("filename") or item.get("title") or "").lower()
+        elif field == "importedAt":
+            value = item.get("importedAt")
+            if isinstance(value, datetime.datetime):
+                return value.timestamp()
+            elif isinstance(value, str):
+                try:
+                    from dateutil import parser
+                    return parser.parse(value).timestamp()
+                except Exception:
+                    return float('-inf') if not reverse else float('inf')
+            else:
+                return float('-inf') if not reverse else float('inf')
+        elif field == "size":
+            return item.get("size") or 0
+        elif field == "artMovement":
+            return str(item.get("artMovement") or "").lower()
+        return ""
+    return get_key
+
+
+class LegacyGrid:
+    """all_items / filtered_items handling of the grid before the document table"""
+    
+    def set_items(self, items):
+        self.all_items = items
+        self.sort(*SORTS[0])
+        self.filtered_items = self.all_items[:]
+        self.sort(*SORTS[0])
+    
+    def sort(self, field, reverse):
+        get_key = legacy_key(field, reverse)
+        self.all_items.sort(key=get_key, reverse=reverse)
+        self.filtered_items = getattr(self, "filtered_items", self.all_items)
+        self.filtered_items.sort(key=get_key, reverse=reverse)
+    
+    def search(self, positions):
+        self.filtered_items = [self.all_items[i] for i in positions]
+    
+    def clear_search(self):
+        self.filtered_items = self.all_items[:]
+    
+    def page(self, number):
+        return self.filtered_items[number * PAGE_SIZE:(number + 1) * PAGE_SIZE]
+
+
+class TableGrid:
+    """all_items / filtered_items handling of the grid with DocumentTable views"""
+    
+    def set_items(self, items):
+        self.all_items = DocumentTable(items)
+        self.sort_index = SortIndex(self.all_items)
+        self.filtered_items = self.all_items.view()
+        self.sort(*SORTS[0])
+    
+    def sort(self, field, reverse):
+        ordered = self.sort_index.sorted_view(field, reverse)
+        if len(self.filtered_items) == len(ordered):
+            self.filtered_items = ordered
+        else:
+            self.filtered_items = self.sort_index.sort_view(self.filtered_items, field, reverse)
+    
+    def search(self, positions):
+        self.filtered_items = self.all_items.view(positions)
+    
+    def clear_search(self):
+        self.filtered_items = self.sort_index.sorted_view(*SORTS[0])
+    
+    def page(self, number):
+        return self.filtered_items[number * PAGE_SIZE:(number + 1) * PAGE_SIZE]
+
+
+class MemoryManager:
+    """Methods of MongoDBManager used by PagedDocumentSource, over a list of documents"""
+    
+    def __init__(self, docs):
+        self.docs = docs
+    
+    def count_documents(self, database, collection, query=None):
+        return len(self.docs)
+    
+    def get_documents_page(self, database, collection, limit, query=None, sort_field="_id", reverse=False,
+                           token=None, skip=0, projection=None):
+        start = token or skip
+        end = start + limit
+        return self.docs[start:end], (end if end < len(self.docs) else None)
+    
+    def search_candidates(self, database, collection, text, query=None, projection=None):
+        words = text.lower().split()
+        return [doc for doc in self.docs if any(word in doc["title"].lower() for word in words)][:1000]
+    
+    def has_text_index(self, database, collection):
+        return True
+
+
+def open_source(docs, loaded_fraction):
+    """PagedDocumentSource over docs with the first loaded_fraction of the blocks loaded"""
+    source = PagedDocumentSource(MemoryManager(docs), "benchmark", "documents", page_size=1000)
+    source.close()
+    source.open()
+    for block in range(1, math.ceil(len(docs) * loaded_fraction / source.page_size)):
+        source._fetch_block(block, source._epoch)
+    return source
+
+
+class RebuildSourceGrid:
+    """Search and sort of data source results with the structures built per keystroke and click"""
+    
+    def __init__(self, source):
+        self.source = source
+    
+    def search(self, query):
+        items = {str(doc.get("_id")): doc for doc in self.source.loaded_items()}
+        if not self.source.is_fully_loaded():
+            for doc in self.source.search(query):
+                items.setdefault(str(doc.get("_id")), doc)
+        table = DocumentTable(items.values())
+        self.results = table.view(SearchIndex(table).search_positions(query))
+    
+    def sort(self, field, reverse):
+        self.results = SortIndex(DocumentTable(self.results)).sorted_view(field, reverse)
+
+
+class KeptSourceGrid:
+    """Search and sort of data source results with the corpus kept per loaded generation"""
+    
+    def __init__(self, source):
+        self.source = source
+        self.corpus = None
+        self.result_sort_index = None
+    
+    def loaded_corpus(self):
+        if self.corpus is None or self.corpus[0] != self.source.generation:
+            generation, items = self.source.loaded_snapshot()
+            table = DocumentTable(items)
+            self.corpus = (generation, table, SearchIndex(table), SortIndex(table))
+        return self.corpus
+    
+    def search(self, query):
+        _, table, index, sort_index = self.loaded_corpus()
+        scores = index.search_scores(query)
+        extra = SearchIndex(())
+        if not self.source.is_fully_loaded():
+            extra = SearchIndex(doc for doc in self.source.search(query) if table.row_of(str(doc.get("_id"))) is None)
+        extra_scores = extra.search_scores(query, narrow=False)
+        if not extra_scores:
+            self.results = table.view(sorted(scores, key=lambda row: (-scores[row], row)))
+            self.result_sort_index = sort_index
+            return
+        ranked = [(-score, 0, row) for row, score in scores.items()]
+        ranked.extend((-score, 1, position) for position, score in extra_scores.items())
+        ranked.sort()
+        self.results = DocumentTable(table[row] if part == 0 else extra.items[row] for _, part, row in ranked).view()
+        self.result_sort_index = None
+    
+    def sort(self, field, reverse):
+        if self.result_sort_index is None or self.result_sort_index.table is not self.results.table:
+            self.result_sort_index = SortIndex(self.results.table)
+        self.results = self.result_sort_index.sort_view(self.results, field, reverse)
+
+
+def measure_source(grid_class, docs, loaded_fraction, query, repeat):
+    """Latency of typing query and sorting the results of its first two characters on a data source
+    
+    Returns:
+        dict: operation -> milliseconds
+    """
+    source = open_source(docs, loaded_fraction)
+    grid = grid_class(source)
+    prefixes = [query[:length] for length in range(1, len(query) + 1)]
+    results = {}
+    results["type query"] = timed(lambda: [grid.search(prefix) for prefix in prefixes], 1)
+    results["retype query"] = timed(lambda: [grid.search(prefix) for prefix in prefixes], repeat)
+    # Sort the broad results of the first two characters
+    grid.search(prefixes[1])
+    results["sort results"] = timed(lambda: [grid.sort(*sort) for sort in SORTS], repeat)
+    return results
+
+
+def timed(func, repeat):
+    """Best wall time of `repeat` runs in milliseconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure(grid_class, docs, repeat):
+    """Latency of the grid operations and memory held by the grid structures
+    
+    Returns:
+        dict: operation -> milliseconds, plus "memory" (bytes retained) and "peak" (bytes)
+    """
+    results = {}
+    grid = grid_class()
+    results["set_items"] = timed(lambda: grid.set_items(list(docs)), repeat)
+    results["first sorts"] = timed(lambda: [grid.sort(*sort) for sort in SORTS], 1)
+    results["switch sort"] = timed(lambda: [grid.sort(*sort) for sort in SORTS], repeat)
+    matches = list(range(0, len(docs), 7))
+    results["sort results"] = timed(lambda: (grid.search(matches), grid.sort("size", True)), repeat)
+    results["clear search"] = timed(grid.clear_search, repeat)
+    results["page"] = timed(lambda: grid.page(len(docs) // PAGE_SIZE // 2), repeat)
+    
+    # Memory held by the grid structures, documents excluded
+    items = list(docs)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    grid = grid_class()
+    grid.set_items(items)
+    for sort in SORTS:
+        grid.sort(*sort)
+    grid.search(matches)
+    grid.clear_search()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results["memory"] = current - before
+    results["peak"] = peak - before
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the grid document table")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="Document counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per operation (best is kept)")
+    args = parser.parse_args()
+    
+    operations = ["set_items", "first sorts", "switch sort", "sort results", "clear search", "page"]
+    for count in args.sizes:
+        docs = make_documents(count)
+        legacy = measure(LegacyGrid, docs, args.repeat)
+        table = measure(TableGrid, docs, args.repeat)
+        
+        print(f"\n{count} documents")
+        print(f"{'operation':<14}{'legacy ms':>12}{'table ms':>12}{'speedup':>10}")
+        for operation in operations:
+            speedup = legacy[operation] / table[operation] if table[operation] else 0
+            print(f"{operation:<14}{legacy[operation]:>12.2f}{table[operation]:>12.2f}{speedup:>9.2f}x")
+        for key in ("memory", "peak"):
+            print(f"{key + ' MB':<14}{legacy[key] / 2 ** 20:>12.2f}{table[key] / 2 ** 20:>12.2f}")
+        
+        # Data source: the query is a word from a title, typed one character at a time
+        query = docs[len(docs) // 3]["title"].split()[0].lower()
+        for loaded_fraction in (1.0, 0.5):
+            rebuild = measure_source(RebuildSourceGrid, docs, loaded_fraction, query, args.repeat)
+            kept = measure_source(KeptSourceGrid, docs, loaded_fraction, query, args.repeat)
+            print(f"\n{count} documents, data source {loaded_fraction:.0%} loaded, query {query!r}")
+            print(f"{'operation':<14}{'rebuild ms':>12}{'kept ms':>12}{'speedup':>10}")
+            for operation in ("type query", "retype query", "sort results"):
+                speedup = rebuild[operation] / kept[operation] if kept[operation] else 0
+                print(f"{operation:<14}{rebuild[operation]:>12.2f}{kept[operation]:>12.2f}{speedup:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
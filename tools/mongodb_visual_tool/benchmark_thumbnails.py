@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MongoDB Visual Tool - Thumbnail Decoding Benchmark
+
+Compares the legacy card path (full decode + LANCZOS resize) with the fast
+thumbnailer (JPEG draft, reduce, first GIF frame) on a directory of images.
+
+Usage: python benchmark_thumbnails.py [--dir ../../database/TestPic] [--repeat 3]
+"""
+import os
+import sys
+import time
+import argparse
+from collections import defaultdict
+
+# Add current directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+if current_dir not in sys.path:
+    sys.path.insert(0, current_dir)
+
+from PIL import Image
+
+from src.ui.image_card import CARD_WIDTH, CARD_HEIGHT
+from src.utils.thumbnailer import make_thumbnail
+
+DEFAULT_IMAGE_DIR = os.path.join(current_dir, "..", "..", "database", "TestPic")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp")
+
+
+def legacy_thumbnail(path, max_width, max_height):
+    """Thumbnail path used by ImageCard.load_image before the fast thumbnailer"""
+    img = Image.open(path)
+    img_width, img_height = img.size
+    aspect_ratio = img_width / img_height
+    
+    if img_width > max_width or img_height > max_height:
+        if aspect_ratio > 1:
+            new_width = max_width
+            new_height = int(max_width / aspect_ratio)
+        else:
+            new_height = max_height
+            new_width = int(max_height * aspect_ratio)
+        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    else:
+        img.load()
+    return img
+
+
+def collect_images(image_dir):
+    """Collect image files of a directory
+    
+    Returns:
+        list: (path, format, size) tuples
+    """
+    images = []
+    for name in sorted(os.listdir(image_dir)):
+        if not name.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        path = os.path.join(image_dir, name)
+        try:
+            with Image.open(path) as img:
+                images.append((path, img.format, img.size))
+        except Exception as e:
+            print(f"Skipping {name}: {e}")
+    return images
+
+
+def run(func, images, max_width, max_height, repeat):
+    """Time a thumbnail function, best of `repeat` runs per image
+    
+    Returns:
+        dict: format -> list of per-image seconds
+    """
+    timings = defaultdict(list)
+    for path, fmt, _ in images:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(path, max_width, max_height)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[fmt].append(best)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark thumbnail decoding")
+    parser.add_argument("--dir", default=DEFAULT_IMAGE_DIR, help="Image directory")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per image (best is kept)")
+    parser.add_argument("--width", type=int, default=CARD_WIDTH - 20, help="Thumbnail width")
+    parser.add_argument("--height", type=int, default=CARD_HEIGHT - 20, help="Thumbnail height")
+    args = parser.parse_args()
+    
+    images = collect_images(args.dir)
+    if not images:
+        print(f"No images found in {args.dir}")
+        return 1
+    
+    large = sum(1 for _, _, (w, h) in images if w > args.width or h > args.height)
+    print(f"{len(images)} images ({large} larger than {args.width}x{args.height}) in {os.path.abspath(args.dir)}")
+    
+    results = {
+        "legacy": run(legacy_thumbnail, images, args.width, args.height, args.repeat),
+        "fast": run(make_thumbnail, images, args.width, args.height, args.repeat),
+    }
+    
+    print(f"\n{'format':<8}{'count':>7}{'legacy ms':>12}{'fast ms':>12}{'speedup':>10}")
+    formats = sorted(results["legacy"])
+    for fmt in formats + ["total"]:
+        if fmt == "total":
+            legacy = [t for ts in results["legacy"].values() for t in ts]
+            fast = [t for ts in results["fast"].values() for t in ts]
+        else:
+            legacy = results["legacy"][fmt]
+            fast = results["fast"][fmt]
+        legacy_ms = sum(legacy) * 1000
+        fast_ms = sum(fast) * 1000
+        speedup = legacy_ms / fast_ms if fast_ms else 0
+        print(f"{fmt:<8}{len(legacy):>7}{legacy_ms:>12.1f}{fast_ms:>12.1f}{speedup:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
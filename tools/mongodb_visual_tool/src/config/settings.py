@@ -2,6 +2,7 @@
 """
 MongoDB Visual Tool - Default Settings
 """
+import os
 
 # Database settings
 DEFAULT_DATABASE = "ismism"
@@ -13,6 +14,89 @@ WINDOW_SIZE = "1280x800"
 # Pagination settings
 DEFAULT_PAGE_SIZE = 20
 DEFAULT_GRID_COLUMNS = 4
+SOURCE_PAGE_SIZE = 100  # Documents fetched from the server per block, the next block is prefetched
+# Case-insensitive server side sorting, matches the lowercase ordering of in-memory sorts
+SORT_COLLATION = {"locale": "en", "strength": 2}
+# Fields rendered by grid cards, the list view adds its visible columns.
+# Full documents are fetched only when opened in the details panel
+GRID_PROJECTION_FIELDS = ["_id", "filePath", "imageUrl", "filename", "title", "size", "artMovement",
+                          "metadata", "importedAt"]
+ID_LOOKUP_BATCH_SIZE = 1000  # _ids per $in query when documents are fetched by id in bulk
+BULK_INSERT_BATCH_SIZE = 500  # Documents per insert_many call of bulk writes
+
+# Search settings: candidates are narrowed on the server (text index or
+# anchored regex on these fields) and re-ranked with rapidfuzz locally
+SEARCH_FIELDS = ["filename", "title", "artMovement"]
+SEARCH_CANDIDATE_LIMIT = 1000
+SEARCH_TEXT_INDEX_NAME = "search_text"
+SEARCH_DEBOUNCE_MS = 250  # Live search waits this long after the last keystroke
+
+# Relationship target picker: prefix range queries on these fields, served by
+# case-insensitive (SORT_COLLATION) indexes when they exist
+TARGET_PICKER_FIELDS = ["filename", "title"]
+TARGET_PICKER_LIMIT = 20  # Documents fetched per field and prefix
+TARGET_PICKER_CACHE_SIZE = 64  # Prefixes whose results are kept per picker
+TARGET_PICKER_DEBOUNCE_MS = 150
+TARGET_PICKER_CREATE_INDEXES = False  # True creates the missing prefix indexes when the picker opens
+
+# Grid rendering mode: "virtual" recycles a fixed pool of cards while scrolling
+# over all items, "paged" rebuilds the cards of one page at a time
+DEFAULT_GRID_MODE = "virtual"
+VIRTUAL_GRID_OVERSCAN_ROWS = 2  # Extra rows bound above/below the viewport
+
+# Thumbnail cache settings
+THUMBNAIL_CACHE_MAX_BYTES = 200 * 1024 * 1024  # LRU eviction above this size
+THUMBNAIL_CACHE_QUALITY = 80  # WebP/JPEG encoder quality
+
+# Query cache settings
+CACHE_TTL_DATABASES = 600  # Seconds before cached database lists expire
+CACHE_TTL_COLLECTIONS = 300
+CACHE_TTL_DOCUMENTS = 120
+CACHE_TTL_COUNTS = 120
+CACHE_STATS_FLUSH_OPS = 100  # Hit/miss counters are written back after this many lookups
+CACHE_STATS_FLUSH_INTERVAL = 5.0  # ...or after this many seconds
+
+# Cache eviction: "lru" (least recently used) or "lfu" (least frequently used)
+CACHE_EVICTION_POLICY = "lru"
+# Per-category budgets, None disables a limit
+CACHE_CATEGORY_BUDGETS = {
+    "documents": {"max_bytes": 64 * 1024 * 1024, "max_entries": 2000},
+    "images": {"max_bytes": 128 * 1024 * 1024, "max_entries": 5000},
+    "temp": {"max_bytes": 16 * 1024 * 1024, "max_entries": 500},
+}
+CACHE_DEFAULT_BUDGET = {"max_bytes": 32 * 1024 * 1024, "max_entries": 1000}
+
+# In-memory tier in front of the cache database (sizes are serialized sizes)
+CACHE_MEMORY_MAX_ENTRIES = 256
+CACHE_MEMORY_MAX_BYTES = 32 * 1024 * 1024
+
+# Live collection updates: change streams on replica sets, polling otherwise
+CHANGE_WATCHER_ENABLED = True
+CHANGE_POLL_INTERVAL = 10.0  # Seconds between polls in fallback mode (count and max _id only)
+CHANGE_POLL_FULL_SCAN_INTERVAL = 300.0  # Seconds between full fingerprint scans, which also find updates
+# Fields compared by the polling fallback to detect updates
+CHANGE_POLL_FIELDS = ["filename", "title", "filePath", "imageUrl", "artMovement", "size", "importedAt", "metadata"]
+# Last-modified fields: when one of them leads an index, each poll also reads its largest value
+# to find updates at once instead of at the next full scan
+CHANGE_POLL_UPDATE_FIELDS = ["updatedAt", "updated_at"]
+
+# Relationship edges: both endpoints are indexed with the relationship type,
+# so outbound and inbound edges of a document are found by index
+RELATIONSHIP_COLLECTION = "relationships"
+RELATIONSHIP_INDEXES = {
+    "source_id_relationship_type": [("source_id", 1), ("relationship_type", 1)],
+    "target_id_relationship_type": [("target_id", 1), ("relationship_type", 1)],
+}
+RELATIONSHIP_EDGE_LIMIT = 1000  # Edges shown per document in the relationship panel
+GRAPH_LOAD_BATCH_SIZE = 5000  # Edges per cursor batch when the relationship graph is loaded
+GRAPH_DISPLAY_LIMIT = 500  # Nodes listed by the relationship network dialog
+# Multi-hop queries: "memory" loads every edge into a RelationshipGraph,
+# "server" leaves the edges on the server and runs chain queries with $graphLookup
+RELATIONSHIP_GRAPH_MODE = "memory"
+CHAIN_RELATIONSHIP_TYPES = ["Influenced By", "Precedes"]  # Types followed by transitive chain queries
+GRAPH_LOOKUP_MAX_DEPTH = 10  # Hops of a $graphLookup chain query
+# Art movement data files merged into the relationship graph (connections.json, artStyles.json)
+ART_MOVEMENT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "..", "data")
 
 # Relationship type definitions
 RELATIONSHIP_TYPES = [
@@ -12,12 +12,16 @@ import queue
 from bson.objectid import ObjectId
 import datetime
 
-from ..config.settings import WINDOW_SIZE, DEFAULT_DATABASE, RELATIONSHIP_TYPES
+from ..config.settings import WINDOW_SIZE, DEFAULT_DATABASE, RELATIONSHIP_TYPES, CHANGE_WATCHER_ENABLED
 from ..config.config_manager import ConfigManager
 from ..db.mongo_manager import MongoDBManager
 from ..db.validator import DataValidator
+from ..db.change_watcher import ChangeWatcher
+from ..db.paged_source import PagedDocumentSource
 from ..ui.paginated_grid import PaginatedGrid
+from ..ui.image_card import ImageCard, CARD_WIDTH, CARD_HEIGHT
 from ..utils.cache_manager import CacheManager
+from ..utils.thumbnail_cache import ThumbnailCache
 from .view_settings import ViewSettings
 from .collection_views import CollectionViews
 from .relationship_manager import RelationshipManager
@@ -41,18 +45,27 @@ class MongoDBViewer(tk.Tk):
         self.current_db = None
         self.current_collection = None
         self.current_docs = []
+        self.current_source = None  # PagedDocumentSource of the open collection
+        self.tree_nodes = {}  # (数据库, 集合) -> 树节点，集合为None时是数据库节点
+        self.collection_databases = {}  # 集合名 -> 包含该集合的数据库
+        self._search_index_prompted = set()  # 已提示过创建搜索索引的集合
         
         # Initialize collection views manager
         self.collection_views = CollectionViews()
         
         # Initialize cache manager
         self.cache_manager = CacheManager()
+        self.thumbnail_cache = ThumbnailCache(os.path.join(self.cache_manager.cache_dir, "thumbnails"))
         
         # 初始化关系管理器（创建UI时才会真正创建实例）
         self.relationship_manager = None
         
         # 当前高亮的文档ID
         self.highlighted_doc_id = None
+        self._details_request = 0  # 详情面板的请求序号，只显示最后一次请求的文档
+        
+        # 当前集合的变更监听器
+        self.change_watcher = None
         
         # Create UI
         self.create_ui()
@@ -100,6 +113,8 @@ class MongoDBViewer(tk.Tk):
         cache_menu.add_checkbutton(label="启用缓存", variable=self.cache_enabled, 
                                   command=self.toggle_cache)
         
+        cache_menu.add_command(label="生成当前集合缩略图", command=self.generate_collection_thumbnails)
+        
         cache_menu.add_separator()
         cache_menu.add_command(label="清理所有缓存", command=lambda: self.clear_cache())
         cache_menu.add_command(label="清理图片缓存", command=lambda: self.clear_cache("images"))
@@ -112,8 +127,10 @@ class MongoDBViewer(tk.Tk):
         
         tools_menu.add_cascade(label="缓存管理", menu=cache_menu)
         tools_menu.add_separator()
-        tools_menu.add_command(label="批量导出", command=lambda: self.bulk_export_documents(self.current_docs))
-        tools_menu.add_command(label="批量关联", command=lambda: self.bulk_create_relationships(self.current_docs))
+        tools_menu.add_command(label="批量导出", command=lambda: self._with_current_documents(self.bulk_export_documents))
+        tools_menu.add_command(label="批量关联", command=lambda: self._with_current_documents(self.bulk_create_relationships))
+        tools_menu.add_separator()
+        tools_menu.add_command(label="创建搜索索引", command=lambda: self.create_search_index())
         
         self.menu_bar.add_cascade(label="工具", menu=tools_menu)
         
@@ -182,9 +199,11 @@ class MongoDBViewer(tk.Tk):
         self.center_pane.add(self.doc_frame, weight=2)  # 文档区域占据更多空间
         
         # Create paginated grid
-        self.paginated_grid = PaginatedGrid(self.doc_frame, on_show_details=self.show_document_details)
+        self.paginated_grid = PaginatedGrid(self.doc_frame, on_show_details=self.show_document_details,
+                                            thumbnail_cache=self.thumbnail_cache)
         self.paginated_grid.pack(fill=tk.BOTH, expand=True)
         self.paginated_grid.set_context_menu_callback(self.handle_context_menu)
+        self.paginated_grid.on_search_index_missing = self._on_search_index_missing
         
         # Relationship management panel (right)
         self.relationship_frame = ttk.Frame(self.center_pane)
@@ -215,7 +234,7 @@ class MongoDBViewer(tk.Tk):
             self.update_status(f"Auto connecting to {uri}...")
             
             # Create database manager
-            self.db_manager = MongoDBManager(uri)
+            self.db_manager = MongoDBManager(uri, cache_manager=self.cache_manager)
             self.db_manager.connect()
             
             # 更新关系管理器的数据库管理器引用
@@ -229,29 +248,19 @@ class MongoDBViewer(tk.Tk):
             last_db = self.user_config.get("last_db", "")
             last_collection = self.user_config.get("last_collection", "")
             
-            if last_db:
-                # Find and select database node
-                for db_id in self.db_tree.get_children():
-                    if self.db_tree.item(db_id, "text") == last_db:
-                        self.db_tree.selection_set(db_id)
-                        self.db_tree.see(db_id)
-                        self.db_tree.item(db_id, open=True)  # Expand database node
-                        
-                        # If there's a last selected collection, find and select it
-                        if last_collection:
-                            for coll_id in self.db_tree.get_children(db_id):
-                                if self.db_tree.item(coll_id, "text") == last_collection:
-                                    self.db_tree.selection_set(coll_id)
-                                    self.db_tree.see(coll_id)
-                                    self.on_tree_select(None)  # Manually trigger selection event
-                                    break
-                            else:
-                                # If last collection not found but database found, trigger database selection
-                                self.on_tree_select(None)
-                        else:
-                            # If no last collection, just trigger database selection
-                            self.on_tree_select(None)
-                        break
+            # Find and select database node
+            db_id = self.tree_nodes.get((last_db, None)) if last_db else None
+            if db_id:
+                self.db_tree.selection_set(db_id)
+                self.db_tree.see(db_id)
+                self.db_tree.item(db_id, open=True)  # Expand database node
+                
+                # If there's a last selected collection, select it, otherwise trigger database selection
+                coll_id = self.tree_nodes.get((last_db, last_collection)) if last_collection else None
+                if coll_id:
+                    self.db_tree.selection_set(coll_id)
+                    self.db_tree.see(coll_id)
+                self.on_tree_select(None)  # Manually trigger selection event
                 
         except Exception as e:
             self.update_status(f"Auto connect failed: {str(e)}")
@@ -264,7 +273,7 @@ class MongoDBViewer(tk.Tk):
             self.update_status(f"Connecting to {uri}...")
             
             # Create database manager
-            self.db_manager = MongoDBManager(uri)
+            self.db_manager = MongoDBManager(uri, cache_manager=self.cache_manager)
             self.db_manager.connect()
             
             # 更新关系管理器的数据库管理器引用
@@ -290,6 +299,8 @@ class MongoDBViewer(tk.Tk):
         """Populate database tree view"""
         # Clear existing content
         self.db_tree.delete(*self.db_tree.get_children())
+        self.tree_nodes = {}
+        self.collection_databases = {}
         
         if self.db_manager is None:
             return
@@ -301,13 +312,16 @@ class MongoDBViewer(tk.Tk):
             # Add databases to tree view
             for db_name in databases:
                 db_node = self.db_tree.insert("", "end", text=db_name, open=False, tags=("database",))
+                self.tree_nodes[(db_name, None)] = db_node
                 
                 # Get collection list
                 collections = self.db_manager.list_collections(db_name)
                 
                 # Add collections to tree view
                 for coll_name in collections:
-                    self.db_tree.insert(db_node, "end", text=coll_name, tags=("collection",))
+                    coll_node = self.db_tree.insert(db_node, "end", text=coll_name, tags=("collection",))
+                    self.tree_nodes[(db_name, coll_name)] = coll_node
+                    self.collection_databases.setdefault(coll_name, []).append(db_name)
                     
         except Exception as e:
             self.update_status(f"Failed to populate database tree: {str(e)}")
@@ -360,6 +374,8 @@ class MongoDBViewer(tk.Tk):
             # 更新当前选择
             self.current_db = db_name
             self.current_collection = None
+            self._stop_change_watcher()
+            self._close_current_source()
             
             # 更新关系管理器的数据库
             if hasattr(self, 'relationship_manager') and self.relationship_manager:
@@ -395,26 +411,86 @@ class MongoDBViewer(tk.Tk):
             
         self.update_status(f"Loading {self.current_db}.{self.current_collection} data...")
         
-        # Create and start loading thread
-        load_thread = threading.Thread(target=self._load_data_thread)
+        # 监听当前集合的变更
+        self._start_change_watcher()
+        
+        # Create and start loading thread（排序和投影在Tk线程读取，由服务器端分页使用）
+        load_thread = threading.Thread(target=self._load_data_thread,
+                                       args=(self.paginated_grid.get_sort(), self.paginated_grid.get_projection()))
         load_thread.daemon = True
         load_thread.start()
     
-    def _load_data_thread(self):
-        """Data loading thread"""
+    def _start_change_watcher(self):
+        """为当前集合启动变更监听（已在监听同一集合时不重复启动）"""
+        if not CHANGE_WATCHER_ENABLED:
+            return
+        
+        watcher = self.change_watcher
+        if (watcher and watcher.is_running() and watcher.db_manager is self.db_manager and
+                watcher.database == self.current_db and watcher.collection == self.current_collection):
+            return
+        
+        self._stop_change_watcher()
+        database, collection = self.current_db, self.current_collection
+        self.change_watcher = ChangeWatcher(
+            self.db_manager, database, collection,
+            on_changes=lambda events: self.after(0, self._apply_collection_changes, database, collection, events),
+            on_status=lambda message: self.after(0, self.update_status, message)
+        )
+        self.change_watcher.start()
+    
+    def _stop_change_watcher(self):
+        """停止变更监听"""
+        if self.change_watcher:
+            self.change_watcher.stop()
+            self.change_watcher = None
+    
+    def _apply_collection_changes(self, database, collection, events):
+        """将监听到的变更应用到网格（Tk线程）
+        
+        Args:
+            database (str): 数据库名
+            collection (str): 集合名
+            events (list): 变更事件
+        """
+        # 已切换到其他集合
+        if database != self.current_db or collection != self.current_collection:
+            return
+        
+        # 集合被删除或重命名等，重新加载
+        if any(event["op"] == "reload" for event in events):
+            self.load_collection_data()
+            return
+        
+        # 新文档和更新的文档同样需要检查文件是否存在
+        for event in events:
+            if event.get("doc") is not None:
+                valid_docs, inconsistencies = self.validate_documents_with_files([event["doc"]])
+                event["doc"] = valid_docs[0]
+                if inconsistencies:
+                    self.log_inconsistencies(inconsistencies)
+        
+        self.paginated_grid.apply_changes(events)
+        self.current_docs = self.paginated_grid.all_items
+        self.update_status(f"Applied {len(events)} changes from {database}.{collection}")
+    
+    def _load_data_thread(self, sort=None, projection=None):
+        """Data loading thread
+        
+        Args:
+            sort (tuple, optional): (field, reverse) of the grid
+            projection (dict, optional): Fields rendered by the grid and list view
+        """
         try:
-            # Get documents
-            docs = self.db_manager.get_documents(self.current_db, self.current_collection, limit=500)
-            
-            # Validate documents
-            valid_docs, inconsistencies = self.validate_documents_with_files(docs)
-            
-            # If there are inconsistencies, log them
-            if inconsistencies:
-                self.log_inconsistencies(inconsistencies)
+            # 统计文档数并加载第一页，其余页面在滚动/翻页时按需加载
+            field, reverse = sort or ("_id", False)
+            source = PagedDocumentSource(
+                self.db_manager, self.current_db, self.current_collection,
+                sort_field=field, reverse=reverse, projection=projection, transform=self._validate_page
+            ).open()
             
             # Update UI
-            self.after(0, lambda: self.update_grid_with_docs(valid_docs))
+            self.after(0, lambda: self.update_grid_with_source(source))
             
         except Exception as e:
             self.after(0, lambda: self.update_status(f"Failed to load data: {str(e)}"))
@@ -422,6 +498,20 @@ class MongoDBViewer(tk.Tk):
             import traceback
             traceback.print_exc()
     
+    def _validate_page(self, docs):
+        """Validate one page of the data source (loader thread)
+        
+        Args:
+            docs (list): Documents of the page
+        
+        Returns:
+            list: Valid documents
+        """
+        valid_docs, inconsistencies = self.validate_documents_with_files(docs)
+        if inconsistencies:
+            self.log_inconsistencies(inconsistencies)
+        return valid_docs
+    
     def validate_documents_with_files(self, docs):
         """Validate file paths in documents
         
@@ -481,6 +571,213 @@ class MongoDBViewer(tk.Tk):
         if self.highlighted_doc_id:
             self.highlight_document(self.highlighted_doc_id)
     
+    def update_grid_with_source(self, source):
+        """Show a paged data source in grid view
+        
+        Args:
+            source (PagedDocumentSource): Opened data source
+        """
+        # 已切换到其他集合
+        if source.database != self.current_db or source.collection != self.current_collection:
+            source.close()
+            return
+        
+        self._close_current_source()
+        self.current_source = source
+        self.current_docs = source
+        self.paginated_grid.set_columns(self.user_config.get("grid_columns", 4))
+        self.paginated_grid.set_data_source(source)
+        
+        self.update_status(f"Loaded {len(source)} documents")
+        
+        # 如果有高亮的文档ID，查找并高亮
+        if self.highlighted_doc_id:
+            self.highlight_document(self.highlighted_doc_id)
+    
+    def _close_current_source(self):
+        """Stop the page loader of the current data source"""
+        if self.current_source:
+            self.current_source.close()
+            self.current_source = None
+    
+    def _with_current_documents(self, callback):
+        """Call back with all documents of the open collection
+        
+        Pages that are not loaded yet are fetched in a worker thread, with the
+        progress in the status bar, and the documents are handed back on the
+        Tk thread. The callback is dropped if another collection was opened
+        in the meantime.
+        
+        Args:
+            callback (callable): callback(docs) on the Tk thread
+        """
+        source = self.current_source
+        if source is None:
+            callback(self.current_docs)
+            return
+        if source.is_fully_loaded():
+            callback(source.loaded_items())
+            return
+        
+        self.update_status(f"Loading {len(source)} documents...")
+        
+        def on_progress(loaded, total):
+            self.after(0, lambda: self.update_status(f"Loading documents {loaded}/{total}..."))
+        
+        def deliver(docs):
+            if source is not self.current_source:
+                self.update_status("Collection changed, action cancelled")
+                return
+            self.update_status(f"Loaded {len(docs)} documents")
+            callback(docs)
+        
+        def fail(message):
+            self.update_status(f"Failed to load documents: {message}")
+            messagebox.showerror("Load Error", f"Failed to load documents: {message}")
+        
+        def load():
+            try:
+                docs = source.load_all(on_progress=on_progress)
+                self.after(0, lambda: deliver(docs))
+            except Exception as e:
+                print(f"Failed to load documents: {e}")
+                import traceback
+                traceback.print_exc()
+                message = str(e)
+                self.after(0, lambda: fail(message))
+        
+        threading.Thread(target=load, daemon=True).start()
+    
+    def _full_document(self, doc):
+        """Fetch the whole document for a projected document of the grid (blocking, call from a worker thread)
+        
+        Args:
+            doc (dict): Document as loaded by the grid
+        
+        Returns:
+            dict: Whole document, doc itself if it is not projected or no longer exists
+        """
+        if not doc or self.current_source is None or not self.current_source.projection:
+            return doc
+        try:
+            full_doc = self.db_manager.get_document(self.current_db, self.current_collection, doc.get('_id'))
+        except Exception as e:
+            print(f"获取完整文档失败: {e}")
+            return doc
+        return full_doc if full_doc is not None else doc
+    
+    def _with_full_document(self, doc, callback):
+        """Call back with the whole document, fetched in a worker thread if the grid doc is projected
+        
+        Args:
+            doc (dict): Document as loaded by the grid
+            callback (callable): callback(doc) on the Tk thread, dropped if another collection was opened
+        """
+        if not doc or self.current_source is None or not self.current_source.projection:
+            callback(doc)
+            return
+        self._run_for_collection(lambda: self._full_document(doc), callback, "Loading document...")
+    
+    def _with_full_documents(self, docs, callback):
+        """Call back with the whole documents, fetched in a worker thread if the grid docs are projected
+        
+        Args:
+            docs (list): Documents as loaded by the grid
+            callback (callable): callback(docs) on the Tk thread, dropped if another collection was opened
+        """
+        if self.current_source is None or not self.current_source.projection:
+            callback(list(docs))
+            return
+        docs = list(docs)
+        self._run_for_collection(lambda: self._full_documents(docs), callback,
+                                 f"Loading {len(docs)} documents...")
+    
+    def _run_for_collection(self, fetch, callback, message):
+        """Run fetch() in a worker thread and hand its result to callback on the Tk thread
+        
+        The result is dropped if another collection was opened in the meantime.
+        
+        Args:
+            fetch (callable): Blocking call, run in the worker thread
+            callback (callable): callback(result) on the Tk thread
+            message (str): Status shown while fetching
+        """
+        source = self.current_source
+        self.update_status(message)
+        
+        def deliver(result):
+            if source is not self.current_source:
+                return
+            self.update_status("Ready")
+            callback(result)
+        
+        def run():
+            result = fetch()
+            self.after(0, lambda: deliver(result))
+        
+        threading.Thread(target=run, daemon=True).start()
+    
+    def _full_documents(self, docs):
+        """Fetch the whole documents for projected documents with batched $in queries (blocking, worker thread)
+        
+        Args:
+            docs (list): Documents as loaded by the grid
+        
+        Returns:
+            list: Whole documents
+        """
+        docs = list(docs)
+        if self.current_source is None or not self.current_source.projection:
+            return docs
+        try:
+            full_docs = self.db_manager.get_documents_by_ids(self.current_db, self.current_collection,
+                                                             [doc.get('_id') for doc in docs if doc])
+        except Exception as e:
+            print(f"获取完整文档失败: {e}")
+            return docs
+        return [full_docs.get(str(doc.get('_id')), doc) if doc else doc for doc in docs]
+    
+    def _on_search_index_missing(self, database, collection):
+        """搜索的集合没有文本索引时提示创建（每个集合只提示一次）
+        
+        Args:
+            database (str): 数据库名
+            collection (str): 集合名
+        """
+        if (database, collection) in self._search_index_prompted:
+            return
+        self._search_index_prompted.add((database, collection))
+        if messagebox.askyesno("搜索索引", f"集合 {collection} 没有文本索引，搜索只能匹配文件名、标题和艺术流派的开头。\n"
+                                           f"是否现在创建搜索索引？"):
+            self.create_search_index(database, collection)
+    
+    def create_search_index(self, database=None, collection=None):
+        """在后台为集合创建搜索用的文本索引
+        
+        Args:
+            database (str, optional): 数据库名，默认当前数据库
+            collection (str, optional): 集合名，默认当前集合
+        """
+        database = database or self.current_db
+        collection = collection or self.current_collection
+        if not self.db_manager or not database or not collection:
+            messagebox.showinfo("创建搜索索引", "请先在左侧选择数据库和集合")
+            return
+        
+        self.update_status(f"正在为 {database}.{collection} 创建搜索索引...")
+        
+        def create():
+            try:
+                name = self.db_manager.create_search_index(database, collection)
+                self.after(0, lambda: self.update_status(f"已为 {database}.{collection} 创建搜索索引 {name}"))
+            except Exception as e:
+                print(f"创建搜索索引失败: {e}")
+                error = str(e)
+                self.after(0, lambda: self.update_status(f"创建搜索索引失败: {error}"))
+                self.after(0, lambda: messagebox.showerror("创建搜索索引失败", error))
+        
+        threading.Thread(target=create, daemon=True).start()
+    
     def update_status(self, message):
         """Update status bar
         
@@ -543,6 +840,14 @@ class MongoDBViewer(tk.Tk):
         if not self.current_db or not self.current_collection:
             messagebox.showwarning("未选择集合", "请先在左侧选择目标数据库和集合！")
             return
+        self._with_full_document(doc, self._show_edit_dialog)
+    
+    def _show_edit_dialog(self, doc):
+        """显示完整文档的编辑表单
+        
+        Args:
+            doc (dict): 完整文档
+        """
         dialog = tk.Toplevel(self)
         dialog.title("编辑文件信息")
         dialog.grab_set()
@@ -607,6 +912,20 @@ class MongoDBViewer(tk.Tk):
         Args:
             doc: Document object
         """
+        # 网格只加载了显示用的字段，详情面板需要完整文档；只显示最后一次请求的文档
+        self._details_request += 1
+        request = self._details_request
+        self._with_full_document(doc, lambda full_doc: self._show_full_document_details(full_doc, request))
+    
+    def _show_full_document_details(self, doc, request):
+        """Show the details of a whole document
+        
+        Args:
+            doc: Whole document
+            request (int): Details request the document belongs to, older requests are ignored
+        """
+        if request != self._details_request:
+            return
         try:
             # Convert BSON document to JSON and display in text box
             json_text = self.bson_to_json(doc)
@@ -674,16 +993,25 @@ class MongoDBViewer(tk.Tk):
         )
         
         if file_path:
-            try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    # Convert document to JSON and write to file
-                    f.write(self.bson_to_json(doc))
-                    
-                self.update_status(f"Document exported to {file_path}")
-                messagebox.showinfo("Export Successful", f"Document exported to {file_path}")
-            except Exception as e:
-                self.update_status(f"Export failed: {str(e)}")
-                messagebox.showerror("Export Error", f"Failed to export document: {str(e)}")
+            self._with_full_document(doc, lambda full_doc: self._write_document(full_doc, file_path))
+    
+    def _write_document(self, doc, file_path):
+        """Write a document to a JSON file
+        
+        Args:
+            doc: Whole document
+            file_path (str): Target file
+        """
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                # Convert document to JSON and write to file
+                f.write(self.bson_to_json(doc))
+                
+            self.update_status(f"Document exported to {file_path}")
+            messagebox.showinfo("Export Successful", f"Document exported to {file_path}")
+        except Exception as e:
+            self.update_status(f"Export failed: {str(e)}")
+            messagebox.showerror("Export Error", f"Failed to export document: {str(e)}")
     
     def bulk_export_documents(self, docs):
         """Bulk export documents
@@ -700,35 +1028,44 @@ class MongoDBViewer(tk.Tk):
         )
         
         if folder_path:
-            try:
-                # Export each document
-                exported_count = 0
-                for doc in docs:
-                    # Get filename
-                    filename = doc.get('filename', str(doc.get('_id', 'document')))
-                    filename = f"{filename.split('.')[0]}.json"
-                    
-                    # Avoid filename conflicts
-                    base_name = os.path.splitext(filename)[0]
-                    ext = os.path.splitext(filename)[1]
-                    counter = 1
-                    while os.path.exists(os.path.join(folder_path, filename)):
-                        filename = f"{base_name}_{counter}{ext}"
-                        counter += 1
-                    
-                    # Write file
-                    file_path = os.path.join(folder_path, filename)
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(self.bson_to_json(doc))
-                    
-                    exported_count += 1
+            self._with_full_documents(docs, lambda full_docs: self._export_documents(full_docs, folder_path))
+    
+    def _export_documents(self, docs, folder_path):
+        """Write documents to JSON files in a folder
+        
+        Args:
+            docs (list): Whole documents
+            folder_path (str): Target folder
+        """
+        try:
+            # Export each document
+            exported_count = 0
+            for doc in docs:
+                # Get filename
+                filename = doc.get('filename', str(doc.get('_id', 'document')))
+                filename = f"{filename.split('.')[0]}.json"
                 
-                self.update_status(f"Exported {exported_count} documents to {folder_path}")
-                messagebox.showinfo("Export Successful", f"Exported {exported_count} documents to {folder_path}")
+                # Avoid filename conflicts
+                base_name = os.path.splitext(filename)[0]
+                ext = os.path.splitext(filename)[1]
+                counter = 1
+                while os.path.exists(os.path.join(folder_path, filename)):
+                    filename = f"{base_name}_{counter}{ext}"
+                    counter += 1
                 
-            except Exception as e:
-                self.update_status(f"Bulk export failed: {str(e)}")
-                messagebox.showerror("Export Error", f"Bulk document export failed: {str(e)}")
+                # Write file
+                file_path = os.path.join(folder_path, filename)
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.write(self.bson_to_json(doc))
+                
+                exported_count += 1
+            
+            self.update_status(f"Exported {exported_count} documents to {folder_path}")
+            messagebox.showinfo("Export Successful", f"Exported {exported_count} documents to {folder_path}")
+            
+        except Exception as e:
+            self.update_status(f"Bulk export failed: {str(e)}")
+            messagebox.showerror("Export Error", f"Bulk document export failed: {str(e)}")
     
     def bulk_create_relationships(self, docs):
         """Bulk create relationships
@@ -869,6 +1206,12 @@ class MongoDBViewer(tk.Tk):
         self.user_config["auto_connect"] = self.auto_connect_var.get()
         ConfigManager.save_config(self.user_config)
         
+        # Stop background work
+        self._stop_change_watcher()
+        self._close_current_source()
+        self.thumbnail_cache.stop_batch()
+        self.cache_manager.close()
+        
         # Destroy window
         self.destroy()
 
@@ -1015,7 +1358,7 @@ class MongoDBViewer(tk.Tk):
         # 创建统计信息显示窗口
         stats_window = tk.Toplevel(self)
         stats_window.title("缓存统计信息")
-        stats_window.geometry("400x300")
+        stats_window.geometry("400x330")
         stats_window.resizable(False, False)
         stats_window.transient(self)
         stats_window.grab_set()
@@ -1039,13 +1382,16 @@ class MongoDBViewer(tk.Tk):
         ttk.Label(frame, text="缓存未命中次数:").grid(row=4, column=0, sticky=tk.W, pady=2)
         ttk.Label(frame, text=str(stats["cache_misses"])).grid(row=4, column=1, sticky=tk.W, pady=2)
         
+        ttk.Label(frame, text="淘汰条目数:").grid(row=5, column=0, sticky=tk.W, pady=2)
+        ttk.Label(frame, text=str(stats.get("evictions", 0))).grid(row=5, column=1, sticky=tk.W, pady=2)
+        
         if stats["last_cleanup"]:
-            ttk.Label(frame, text="上次清理时间:").grid(row=5, column=0, sticky=tk.W, pady=2)
-            ttk.Label(frame, text=stats["last_cleanup"]).grid(row=5, column=1, sticky=tk.W, pady=2)
+            ttk.Label(frame, text="上次清理时间:").grid(row=6, column=0, sticky=tk.W, pady=2)
+            ttk.Label(frame, text=stats["last_cleanup"]).grid(row=6, column=1, sticky=tk.W, pady=2)
         
         # 添加操作按钮
         button_frame = ttk.Frame(frame)
-        button_frame.grid(row=6, column=0, columnspan=2, pady=20)
+        button_frame.grid(row=7, column=0, columnspan=2, pady=20)
         
         ttk.Button(button_frame, text="清理所有缓存", command=lambda: [self.clear_cache(), stats_window.destroy()]).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="清理旧缓存", command=lambda: [self.cleanup_old_cache(7), stats_window.destroy()]).pack(side=tk.LEFT, padx=5)
@@ -1056,6 +1402,8 @@ class MongoDBViewer(tk.Tk):
         category_name = "所有" if category is None else category
         if messagebox.askyesno("确认清理", f"确定要清理{category_name}缓存吗？"):
             success = self.cache_manager.clear_cache(category)
+            if category in (None, "thumbnails"):
+                self.thumbnail_cache.reset()
             if success:
                 self.update_status(f"已成功清理{category_name}缓存")
                 messagebox.showinfo("清理成功", f"已成功清理{category_name}缓存")
@@ -1063,10 +1411,48 @@ class MongoDBViewer(tk.Tk):
                 self.update_status("缓存清理失败")
                 messagebox.showerror("清理失败", "缓存清理失败，请查看日志")
     
+    def generate_collection_thumbnails(self):
+        """在后台为当前集合生成缩略图缓存"""
+        if not self.current_docs:
+            messagebox.showinfo("生成缩略图", "当前没有加载任何文档")
+            return
+        self._with_current_documents(self._generate_thumbnails)
+    
+    def _generate_thumbnails(self, docs):
+        """为文档中的图片在后台生成缩略图
+        
+        Args:
+            docs (list): 文档列表
+        """
+        paths = []
+        for doc in docs:
+            path = ImageCard.resolve_image_path(doc.get('filePath') or doc.get('imageUrl'))
+            if path:
+                paths.append(path)
+        
+        if not paths:
+            messagebox.showinfo("生成缩略图", "当前集合中没有可用的图片文件")
+            return
+        
+        def on_progress(done, total):
+            if done % 20 == 0 or done == total:
+                self.after(0, lambda: self.update_status(f"正在生成缩略图 {done}/{total}..."))
+        
+        def on_done(generated, failed):
+            self.after(0, lambda: self.update_status(f"缩略图生成完成：新生成{generated}个，失败{failed}个"))
+        
+        self.update_status(f"开始为{len(paths)}张图片生成缩略图...")
+        self.thumbnail_cache.generate_batch(
+            paths, CARD_WIDTH - 20, CARD_HEIGHT - 20, ImageCard.load_thumbnail,
+            on_progress=on_progress, on_done=on_done
+        )
+    
     def cleanup_old_cache(self, days):
         """清理旧缓存"""
         if messagebox.askyesno("确认清理", f"确定要清理{days}天前的旧缓存吗？"):
             cleaned_count, freed_space = self.cache_manager.cleanup_old_cache(days)
+            # 缩略图文件可能被删除，重建缩略图缓存的索引
+            self.thumbnail_cache.reset()
             if cleaned_count > 0:
                 freed_mb = freed_space / (1024 * 1024)
                 self.update_status(f"已清理{cleaned_count}个缓存文件，释放{freed_mb:.2f}MB空间")
@@ -1137,6 +1523,25 @@ MongoDB可视化工具
             status = "启用" if enabled else "禁用"
             self.update_status(f"缓存已{status}")
     
+    def _find_collection_node(self, collection, database=None):
+        """查找集合的树节点
+        
+        Args:
+            collection (str): 集合名称
+            database (str, optional): 数据库名称，省略时优先当前数据库
+        
+        Returns:
+            tuple: (数据库名称, 树节点)，未找到时返回None
+        """
+        databases = [database] if database else self.collection_databases.get(collection, [])
+        if not database and self.current_db in databases:
+            databases = [self.current_db]
+        for db_name in databases:
+            node = self.tree_nodes.get((db_name, collection))
+            if node:
+                return db_name, node
+        return None
+    
     def navigate_to_target_document(self, target_collection, target_id):
         """导航到目标文档
         
@@ -1145,44 +1550,30 @@ MongoDB可视化工具
             target_id (str): 目标文档ID
         """
         try:
-            # 保存当前DB，这样我们在导航后可以返回
-            previous_db = self.current_db
-            previous_collection = self.current_collection
+            # 在树索引中查找目标集合
+            found = self._find_collection_node(target_collection)
+            if found is None:
+                messagebox.showinfo("导航", f"未找到目标集合: {target_collection}")
+                return
+            db_name, coll_node = found
             
-            # 在树中查找目标集合
-            found = False
-            db_nodes = self.db_tree.get_children()
+            # 目标文档已在当前视图中，直接高亮
+            if (db_name, target_collection) == (self.current_db, self.current_collection) \
+                    and self.paginated_grid.locate(target_id) is not None:
+                self.highlight_document(target_id)
+                return
             
-            for db_node in db_nodes:
-                db_name = self.db_tree.item(db_node, "text")
-                
-                # 获取集合节点
-                collection_nodes = self.db_tree.get_children(db_node)
-                for coll_node in collection_nodes:
-                    coll_name = self.db_tree.item(coll_node, "text")
-                    
-                    if coll_name == target_collection:
-                        # 找到目标集合，选中它
-                        self.db_tree.see(coll_node)
-                        self.db_tree.selection_set(coll_node)
-                        self.db_tree.item(db_node, open=True)  # 确保数据库节点展开
-                        
-                        # 触发选择事件，加载集合数据
-                        self.on_tree_select(None)
-                        
-                        # 记住我们正在查找的ID
-                        self.highlighted_doc_id = target_id
-                        
-                        # 使用loadDocument会设置highlighted_doc_id
-                        self.load_collection_data(target_id)
-                        found = True
-                        break
-                if found:
-                    break
+            # 记住我们正在查找的ID，集合加载完成后高亮
+            self.highlighted_doc_id = target_id
             
-            if not found:
-                messagebox.showinfo("导航", f"未找到目标集合: {target_collection}")
+            # 找到目标集合，选中它
+            self.db_tree.item(self.tree_nodes[(db_name, None)], open=True)  # 确保数据库节点展开
+            self.db_tree.see(coll_node)
+            self.db_tree.selection_set(coll_node)
             
+            # 触发选择事件，加载集合数据
+            self.on_tree_select(None)
+        
         except Exception as e:
             print(f"导航到目标文档失败: {e}")
             import traceback
@@ -1196,62 +1587,19 @@ MongoDB可视化工具
             doc_id (str): 文档ID
         """
         try:
-            # 查找文档
-            target_doc = None
-            target_index = -1
-            
-            for i, doc in enumerate(self.current_docs):
-                doc_id_str = str(doc.get('_id', ''))
-                if doc_id_str == doc_id:
-                    target_doc = doc
-                    target_index = i
-                    break
-            
-            if target_doc:
-                # 计算文档在哪一页
-                if hasattr(self.paginated_grid, 'items_per_page'):
-                    items_per_page = self.paginated_grid.items_per_page
-                    target_page = target_index // items_per_page + 1
-                    
-                    # 跳转到目标页
-                    if hasattr(self.paginated_grid, 'current_page') and self.paginated_grid.current_page != target_page:
-                        self.paginated_grid.go_to_page(target_page)
+            # 通过网格的_id索引定位文档，跳转到所在页并选中
+            target_doc = self.paginated_grid.reveal_document(doc_id)
+            if target_doc is not None:
+                self.update_status(f"已导航到文档: {doc_id}")
                 
-                # 如果支持选中，选中文档
-                highlighted = False
-                for card in self.paginated_grid.displayed_cards:
-                    card_id = str(card.doc.get('_id', ''))
-                    if card_id == doc_id:
-                        # 先取消所有选中
-                        for c in self.paginated_grid.displayed_cards:
-                            if hasattr(c, 'set_selected'):
-                                c.set_selected(False)
-                        
-                        # 高亮目标文档
-                        if hasattr(card, 'set_selected'):
-                            card.set_selected(True)
-                            
-                        # 滚动到可见区域
-                        if hasattr(card, 'winfo_y') and hasattr(self.paginated_grid, 'canvas'):
-                            y_pos = card.winfo_y()
-                            self.paginated_grid.canvas.yview_moveto(y_pos / self.paginated_grid.canvas.winfo_height())
-                            
-                        highlighted = True
-                        
-                        # 显示文档详情
-                        self.show_document_details(target_doc)
-                        break
-                
-                if highlighted:
-                    self.update_status(f"已导航到文档: {doc_id}")
-                else:
-                    self.update_status(f"文档已加载，但无法高亮显示: {doc_id}")
+                # 显示文档详情
+                self.show_document_details(target_doc)
             else:
                 self.update_status(f"未找到文档: {doc_id}")
             
             # 重置高亮ID
             self.highlighted_doc_id = None
-            
+        
         except Exception as e:
             print(f"高亮文档失败: {e}")
             import traceback
@@ -6,8 +6,19 @@ MongoDB Visual Tool - Relationship Manager Module
 import tkinter as tk
 from tkinter import ttk, messagebox
 import datetime
+import threading
+import itertools
 from bson.objectid import ObjectId
 
+from ..config.settings import (RELATIONSHIP_COLLECTION, RELATIONSHIP_INDEXES, RELATIONSHIP_EDGE_LIMIT,
+                               GRAPH_LOAD_BATCH_SIZE, GRAPH_DISPLAY_LIMIT, ART_MOVEMENT_DATA_DIR,
+                               RELATIONSHIP_GRAPH_MODE, CHAIN_RELATIONSHIP_TYPES, GRAPH_LOOKUP_MAX_DEPTH)
+from ..utils.relationship_graph import RelationshipGraph, load_art_movement_edges
+from ..ui.target_picker import TargetDocPicker
+
+GRAPH_EDGE_PROJECTION = {"source_id": 1, "source_collection": 1, "target_id": 1, "target_collection": 1,
+                         "relationship_type": 1}
+
 class RelationshipManager:
     """关系管理器类，处理文档之间的关系管理"""
     
@@ -30,7 +41,15 @@ class RelationshipManager:
         self.current_collection = None
         self.current_doc = None
         self.relationship_types = []
-        self._rel_target_docs = []  # 临时存储目标文档列表
+        self._rel_targets = {}  # 关系ID -> (另一端集合, 另一端文档ID)，双击导航时使用
+        self._indexed_dbs = set()  # 已确保关系索引的数据库
+        self._rel_docs = {}  # 关系ID -> 关系记录，删除时更新关系图
+        
+        # 内存关系图（多跳查询），后台加载；"server"模式下不加载，链式查询使用$graphLookup
+        self.graph_mode = RELATIONSHIP_GRAPH_MODE
+        self.graph = None
+        self._graph_key = None  # (数据库管理器, 数据库名称)
+        self._graph_generation = 0  # 加载期间的关系变更计数，变更后重新加载
         
         # 创建UI
         self._create_ui()
@@ -45,13 +64,14 @@ class RelationshipManager:
         rel_display_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # 创建关系列表
-        columns = ("关系类型", "目标集合", "目标文档")
+        columns = ("方向", "关系类型", "关联集合", "关联文档")
         self.rel_tree = ttk.Treeview(rel_display_frame, columns=columns, show="headings", height=10)
         
         # 设置列标题
         for col in columns:
             self.rel_tree.heading(col, text=col)
             self.rel_tree.column(col, width=100)
+        self.rel_tree.column("方向", width=40)
         
         # 添加滚动条
         rel_scrollbar = ttk.Scrollbar(rel_display_frame, orient="vertical", command=self.rel_tree.yview)
@@ -81,11 +101,10 @@ class RelationshipManager:
         self.rel_target_coll_combo.grid(row=1, column=1, sticky=tk.EW, padx=5, pady=5)
         self.rel_target_coll_combo.bind("<<ComboboxSelected>>", self._load_target_docs)
         
-        # 目标文档选择
-        ttk.Label(add_rel_frame, text="目标文档:").grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
-        self.rel_target_doc_var = tk.StringVar()
-        self.rel_target_doc_combo = ttk.Combobox(add_rel_frame, textvariable=self.rel_target_doc_var, width=20)
-        self.rel_target_doc_combo.grid(row=2, column=1, sticky=tk.EW, padx=5, pady=5)
+        # 目标文档选择（按文件名/标题前缀搜索）
+        ttk.Label(add_rel_frame, text="目标文档:").grid(row=2, column=0, sticky=tk.NW, padx=5, pady=5)
+        self.rel_target_picker = TargetDocPicker(add_rel_frame, self.db_manager, height=4, width=20)
+        self.rel_target_picker.grid(row=2, column=1, sticky=tk.EW, padx=5, pady=5)
         
         # 按钮区域
         btn_frame = ttk.Frame(self.parent)
@@ -102,6 +121,10 @@ class RelationshipManager:
         # 刷新关系按钮
         self.refresh_rel_btn = ttk.Button(btn_frame, text="刷新关系", command=self.refresh_relationships)
         self.refresh_rel_btn.pack(side=tk.LEFT, padx=5)
+        
+        # 多跳关系网络按钮
+        self.network_btn = ttk.Button(btn_frame, text="关系网络", command=self.show_relationship_network)
+        self.network_btn.pack(side=tk.LEFT, padx=5)
     
     def set_relationship_types(self, types):
         """设置关系类型列表
@@ -122,6 +145,181 @@ class RelationshipManager:
         if self.db_manager and db_name:
             collections = self.db_manager.list_collections(db_name)
             self.rel_target_coll_combo['values'] = collections
+            self.ensure_indexes(db_name)
+            self.load_graph(db_name)
+    
+    def ensure_indexes(self, db_name=None):
+        """在后台线程中为关系集合创建复合索引（每个数据库每次连接一次）
+        
+        (source_id, relationship_type) 和 (target_id, relationship_type)
+        两个索引分别支持出边和入边查询。关系集合还不存在时不创建它，
+        写入关系后会再次调用。
+        
+        Args:
+            db_name (str, optional): 数据库名称，省略时使用当前数据库
+        """
+        db_name = db_name or self.current_db
+        db_manager = self.db_manager
+        if not db_name or not db_manager or (id(db_manager), db_name) in self._indexed_dbs:
+            return
+        self._indexed_dbs.add((id(db_manager), db_name))
+        
+        def create():
+            try:
+                if RELATIONSHIP_COLLECTION not in db_manager.list_collections(db_name):
+                    self._indexed_dbs.discard((id(db_manager), db_name))
+                    return
+                created = db_manager.ensure_indexes(db_name, RELATIONSHIP_COLLECTION, RELATIONSHIP_INDEXES)
+                if created:
+                    print(f"已创建关系索引 {db_name}.{RELATIONSHIP_COLLECTION}: {', '.join(created)}")
+            except Exception as e:
+                # 例如没有createIndex权限，下次选择数据库时重试
+                self._indexed_dbs.discard((id(db_manager), db_name))
+                print(f"创建关系索引失败: {e}")
+        
+        threading.Thread(target=create, daemon=True).start()
+    
+    @staticmethod
+    def _graph_edge(rel):
+        """关系记录在关系图中的边：((源集合, 源ID), (目标集合, 目标ID), 关系类型)"""
+        return ((rel.get('source_collection'), str(rel.get('source_id'))),
+                (rel.get('target_collection'), str(rel.get('target_id'))),
+                rel.get('relationship_type', ''))
+    
+    def load_graph(self, db_name=None, force=False):
+        """在后台线程中加载关系图
+        
+        关系集合的所有边（流式读取，不经过缓存）和艺术流派数据文件中的
+        影响关系一起构建为RelationshipGraph。之后面板中的增删直接更新关系图，
+        不再重新查询。
+        
+        Args:
+            db_name (str, optional): 数据库名称，省略时使用当前数据库
+            force (bool): 已加载时也重新加载
+        """
+        if self.graph_mode != "memory":
+            return
+        db_name = db_name or self.current_db
+        db_manager = self.db_manager
+        key = (id(db_manager), db_name)
+        if not db_name or not db_manager or (self._graph_key == key and not force):
+            return
+        self._graph_key = key
+        self.graph = None
+        generation = self._graph_generation
+        
+        def build():
+            try:
+                edges = load_art_movement_edges(ART_MOVEMENT_DATA_DIR)
+                if RELATIONSHIP_COLLECTION in db_manager.list_collections(db_name):
+                    rels = db_manager.iter_documents(db_name, RELATIONSHIP_COLLECTION,
+                                                     query={"source_id": {"$exists": True}},
+                                                     projection=GRAPH_EDGE_PROJECTION,
+                                                     batch_size=GRAPH_LOAD_BATCH_SIZE)
+                    edges = itertools.chain(edges, map(self._graph_edge, rels))
+                graph = RelationshipGraph(edges)
+            except Exception as e:
+                print(f"加载关系图失败: {e}")
+                import traceback
+                traceback.print_exc()
+                return
+            
+            def apply():
+                if self._graph_key != key:
+                    return
+                if self._graph_generation != generation:
+                    # 加载期间关系有变更，重新加载
+                    self.load_graph(db_name, force=True)
+                    return
+                self.graph = graph
+                print(f"关系图已加载 {db_name}: {graph.node_count} 个节点，{len(graph)} 条边")
+            
+            self.parent.after(0, apply)
+        
+        threading.Thread(target=build, daemon=True).start()
+    
+    def _update_graph(self, database, rels, add=True):
+        """把面板中的关系增删同步到关系图
+        
+        Args:
+            database (str): 关系所在的数据库
+            rels (list): 关系记录
+            add (bool): 添加还是删除
+        """
+        if self._graph_key != (id(self.db_manager), database):
+            return
+        if self.graph is None:
+            # 正在加载，加载完成时重新加载
+            self._graph_generation += 1
+            return
+        for rel in rels:
+            if add:
+                self.graph.add_edge(*self._graph_edge(rel))
+            else:
+                self.graph.remove_edge(*self._graph_edge(rel))
+    
+    def get_chain(self, doc_id, relationship_types=None, max_depth=GRAPH_LOOKUP_MAX_DEPTH, reverse=False):
+        """在服务器端用一次$graphLookup聚合获取传递关系链
+        
+        例如"Influenced By"链：文档受A影响，A受B影响……不在客户端逐跳查询。
+        
+        Args:
+            doc_id: 起点文档ID（ObjectId会转换为字符串）
+            relationship_types (list, optional): 沿哪些关系类型前进，默认CHAIN_RELATIONSHIP_TYPES
+            max_depth (int): 最多跳数
+            reverse (bool): 沿入边反向前进（例如哪些文档受该文档影响）
+            
+        Returns:
+            list: 链上的关系记录（depth字段为跳数减一），按跳数排序
+        """
+        doc_id = str(doc_id) if isinstance(doc_id, ObjectId) else doc_id
+        types = list(relationship_types or CHAIN_RELATIONSHIP_TYPES)
+        connect_from, connect_to = ('source_id', 'target_id') if reverse else ('target_id', 'source_id')
+        return self.db_manager.graph_lookup(
+            self.current_db,
+            RELATIONSHIP_COLLECTION,
+            doc_id,
+            connect_from,
+            connect_to,
+            max_depth=max_depth,
+            restrict={"relationship_type": {"$in": types}},
+            projection=GRAPH_EDGE_PROJECTION
+        )
+    
+    def get_edges(self, doc_id, relationship_type=None, limit=RELATIONSHIP_EDGE_LIMIT):
+        """一次查询获取文档的出边和入边
+        
+        $or的两个分支分别命中source_id和target_id的复合索引。
+        
+        Args:
+            doc_id: 文档ID（ObjectId会转换为字符串）
+            relationship_type (str, optional): 只返回该类型的关系
+            limit (int): 最多返回的关系数量
+            
+        Returns:
+            tuple: (出边列表, 入边列表)，指向自身的关系只算作出边
+        """
+        doc_id = str(doc_id) if isinstance(doc_id, ObjectId) else doc_id
+        branches = [{"source_id": doc_id}, {"target_id": doc_id}]
+        if relationship_type:
+            for branch in branches:
+                branch["relationship_type"] = relationship_type
+        
+        edges = self.db_manager.get_documents(
+            self.current_db,
+            RELATIONSHIP_COLLECTION,
+            limit=limit,
+            query={"$or": branches}
+        )
+        
+        outbound = []
+        inbound = []
+        for edge in edges:
+            if edge.get('source_id') == doc_id:
+                outbound.append(edge)
+            else:
+                inbound.append(edge)
+        return outbound, inbound
     
     def set_current_collection(self, collection_name):
         """设置当前集合
@@ -147,89 +345,69 @@ class RelationshipManager:
         self.rel_tree.delete(*self.rel_tree.get_children())
         
         try:
-            # 查询当前文档作为源的关系
-            rel_collection = "relationships"
-            if rel_collection not in self.db_manager.list_collections(self.current_db):
-                return
-            
-            # 查询关系
             doc_id = doc.get('_id')
             if not doc_id:
                 return
-                
-            # 将ObjectId转换为字符串用于查询
-            if isinstance(doc_id, ObjectId):
-                source_id_str = str(doc_id)
-            else:
-                source_id_str = doc_id
-                
-            # 查询关系 - 使用字符串ID
-            relationships = self.db_manager.get_documents(
-                self.current_db,
-                "relationships",
-                query={"source_id": source_id_str}
-            )
             
-            # 更新关系树
-            for rel in relationships:
-                target_coll = rel.get('target_collection', '')
-                target_id = rel.get('target_id', '')
-                
-                # 获取目标文档信息
-                target_doc_name = str(target_id)
+            # 一次查询获取出边和入边（关系集合不存在时结果为空）
+            outbound, inbound = self.get_edges(doc_id)
+            
+            # 每条关系的另一端：出边为目标文档，入边为源文档
+            edges = [("→", rel, rel.get('target_collection', ''), rel.get('target_id', '')) for rel in outbound]
+            edges += [("←", rel, rel.get('source_collection', ''), rel.get('source_id', '')) for rel in inbound]
+            
+            # 按另一端的集合分组，每个集合一次$in查询获取文档的显示名称
+            other_ids = {}
+            for _, _, other_coll, other_id in edges:
+                if other_coll:
+                    other_ids.setdefault(other_coll, []).append(other_id)
+            other_docs = {}
+            for other_coll, ids in other_ids.items():
                 try:
-                    # 尝试将target_id转换回ObjectId用于查询
-                    query_id = target_id
-                    try:
-                        if not isinstance(target_id, ObjectId) and ObjectId.is_valid(target_id):
-                            query_id = ObjectId(target_id)
-                    except:
-                        query_id = target_id
-                        
-                    target_doc = self.db_manager.get_documents(
+                    other_docs[other_coll] = self.db_manager.get_documents_by_ids(
                         self.current_db,
-                        target_coll,
-                        query={"_id": query_id}
+                        other_coll,
+                        ids,
+                        projection={"filename": 1, "title": 1}
                     )
-                    if target_doc and len(target_doc) > 0:
-                        target_doc_name = target_doc[0].get('filename', target_doc[0].get('title', str(target_id)))
                 except Exception as e:
-                    print(f"获取目标文档失败: {e}")
+                    print(f"获取关联文档失败: {e}")
+            
+            # 更新关系树
+            self._rel_targets = {}
+            self._rel_docs = {}
+            for direction, rel, other_coll, other_id in edges:
+                # 获取关联文档信息
+                other_doc_name = str(other_id)
+                other_doc = other_docs.get(other_coll, {}).get(str(other_id))
+                if other_doc:
+                    other_doc_name = other_doc.get('filename', other_doc.get('title', str(other_id)))
                 
                 # 添加到关系树
+                rel_id = str(rel.get('_id'))
+                self._rel_targets[rel_id] = (other_coll, other_id)
+                self._rel_docs[rel_id] = rel
                 self.rel_tree.insert("", "end", values=(
+                    direction,
                     rel.get('relationship_type', ''),
-                    target_coll,
-                    target_doc_name
-                ), tags=(str(rel.get('_id')),))
+                    other_coll,
+                    other_doc_name
+                ), tags=(rel_id,))
         except Exception as e:
             print(f"加载关系失败: {e}")
             messagebox.showerror("错误", f"加载关系失败: {e}")
     
     def _load_target_docs(self, event=None):
-        """加载目标集合中的文档"""
+        """切换目标文档选择器的集合"""
         if not self.current_db:
             return
             
         target_coll = self.rel_target_coll_var.get()
         if not target_coll:
             return
-            
-        try:
-            # 获取目标集合中的文档
-            target_docs = self.db_manager.get_documents(self.current_db, target_coll, limit=100)
-            
-            # 更新目标文档下拉框
-            self.rel_target_doc_combo['values'] = [
-                doc.get('filename', doc.get('title', str(doc.get('_id', '')))) 
-                for doc in target_docs
-            ]
-            
-            # 保存目标文档列表以供后续使用
-            self._rel_target_docs = target_docs
-        except Exception as e:
-            print(f"加载目标文档失败: {e}")
-            messagebox.showerror("错误", f"加载目标文档失败: {e}")
+        
+        # 选择器按输入的前缀分页查询，不再一次加载集合中的文档
+        self.rel_target_picker.set_collection(self.current_db, target_coll, self.db_manager)
     
     def add_relationship(self):
         """添加关系"""
@@ -239,7 +417,7 @@ class RelationshipManager:
             
         rel_type = self.rel_type_var.get()
         target_coll = self.rel_target_coll_var.get()
-        target_doc_name = self.rel_target_doc_var.get()
+        target_doc = self.rel_target_picker.selected_document()
         
         if not rel_type:
             messagebox.showwarning("缺少关系类型", "请选择关系类型")
@@ -249,19 +427,15 @@ class RelationshipManager:
             messagebox.showwarning("缺少目标集合", "请选择目标集合")
             return
             
-        if not target_doc_name:
+        if target_doc is None:
             messagebox.showwarning("缺少目标文档", "请选择目标文档")
             return
             
-        try:
-            # 获取目标文档
-            target_idx = self.rel_target_doc_combo.current()
-            if target_idx < 0 or not hasattr(self, '_rel_target_docs') or target_idx >= len(self._rel_target_docs):
-                messagebox.showwarning("无效目标", "请选择有效的目标文档")
-                return
-                
-            target_doc = self._rel_target_docs[target_idx]
+        if self.rel_target_picker.collection != target_coll:
+            messagebox.showwarning("无效目标", "请选择有效的目标文档")
+            return
             
+        try:
             # 创建关系文档 - 将ObjectId转换为字符串
             source_id = self.current_doc.get('_id')
             target_id = target_doc.get('_id')
@@ -282,11 +456,13 @@ class RelationshipManager:
             }
             
             # 保存关系到数据库
-            rel_collection = "relationships"
+            rel_collection = RELATIONSHIP_COLLECTION
             if rel_collection not in self.db_manager.list_collections(self.current_db):
                 self.db_manager.insert_document(self.current_db, rel_collection, {"_placeholder": True})
                 
             self.db_manager.insert_document(self.current_db, rel_collection, rel_doc)
+            self.ensure_indexes()
+            self._update_graph(self.current_db, [rel_doc])
             
             # 刷新关系显示
             self.load_document_relationships(self.current_doc)
@@ -317,6 +493,7 @@ class RelationshipManager:
                 
             # 获取关系ID
             rel_id = self.rel_tree.item(selected[0], "tags")[0]
+            rel_doc = self._rel_docs.get(rel_id)
             
             # 尝试将字符串ID转换为ObjectId
             try:
@@ -327,7 +504,8 @@ class RelationshipManager:
                 pass
                 
             # 删除关系
-            self.db_manager.delete_document(self.current_db, "relationships", rel_id)
+            if self.db_manager.delete_document(self.current_db, RELATIONSHIP_COLLECTION, rel_id) and rel_doc:
+                self._update_graph(self.current_db, [rel_doc], add=False)
             
             # 刷新关系显示
             if self.current_doc:
@@ -343,9 +521,172 @@ class RelationshipManager:
             messagebox.showerror("删除失败", f"删除关系时出错: {e}")
     
     def refresh_relationships(self):
-        """刷新关系显示"""
+        """刷新关系显示，并重新加载关系图（包含其他客户端的变更）"""
         if self.current_doc:
             self.load_document_relationships(self.current_doc)
+        self.load_graph(force=True)
+    
+    def _node_names(self, nodes):
+        """关系图节点的显示名称
+        
+        Args:
+            nodes (iterable): (集合, 文档ID) 节点
+            
+        Returns:
+            dict: 节点 -> 显示名称（文件名或标题，找不到文档时为ID）
+        """
+        by_collection = {}
+        for coll, doc_id in nodes:
+            by_collection.setdefault(coll, []).append(doc_id)
+        names = {}
+        for coll, ids in by_collection.items():
+            docs = {}
+            if coll:
+                try:
+                    docs = self.db_manager.get_documents_by_ids(self.current_db, coll, ids,
+                                                                projection={"filename": 1, "title": 1})
+                except Exception as e:
+                    print(f"获取关联文档失败: {e}")
+            for doc_id in ids:
+                doc = docs.get(doc_id)
+                names[(coll, doc_id)] = doc.get('filename', doc.get('title', doc_id)) if doc else doc_id
+        return names
+    
+    def show_relationship_network(self):
+        """显示当前文档的多跳关系网络和影响链"""
+        if not self.current_doc:
+            messagebox.showwarning("未选择文档", "请先选择文档")
+            return
+        if self.graph is None and self.graph_mode == "memory":
+            self.load_graph()
+            messagebox.showinfo("关系网络", "关系图正在加载，请稍后再试")
+            return
+        
+        doc_key = (self.current_collection, str(self.current_doc.get('_id')))
+        
+        dialog = tk.Toplevel(self.parent)
+        dialog.title("关系网络")
+        dialog.geometry("560x480")
+        
+        # 查询条件
+        options = ttk.Frame(dialog, padding=10)
+        options.pack(fill=tk.X)
+        
+        ttk.Label(options, text="模式:").pack(side=tk.LEFT)
+        # 传递关系链由服务器端$graphLookup计算，其他模式使用内存关系图
+        modes = ["多跳邻域", "影响来源链", "传递关系链"] if self.graph is not None else ["传递关系链"]
+        mode_var = tk.StringVar(value=modes[0])
+        mode_combo = ttk.Combobox(options, textvariable=mode_var, values=modes, state="readonly", width=10)
+        mode_combo.pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(options, text="跳数:").pack(side=tk.LEFT)
+        hops_var = tk.IntVar(value=2)
+        ttk.Spinbox(options, from_=1, to=6, textvariable=hops_var, width=4).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(options, text="关系类型:").pack(side=tk.LEFT)
+        type_var = tk.StringVar(value="全部")
+        type_combo = ttk.Combobox(options, textvariable=type_var, values=["全部"] + list(self.relationship_types),
+                                  state="readonly", width=14)
+        type_combo.pack(side=tk.LEFT, padx=5)
+        
+        # 结果列表
+        tree_frame = ttk.Frame(dialog, padding=(10, 0))
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        columns = ("跳数", "集合", "文档")
+        tree = ttk.Treeview(tree_frame, columns=columns, show="headings")
+        for col in columns:
+            tree.heading(col, text=col)
+        tree.column("跳数", width=50)
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        status_var = tk.StringVar()
+        ttk.Label(dialog, textvariable=status_var, wraplength=520, padding=(10, 5)).pack(fill=tk.X)
+        
+        nodes = {}  # 树节点 -> 关系图节点
+        chain_parents = {}  # 传递关系链中节点 -> 上一跳节点
+        
+        def refresh(event=None):
+            """按当前条件查询关系图"""
+            tree.delete(*tree.get_children())
+            nodes.clear()
+            chain_parents.clear()
+            try:
+                hops = max(1, int(hops_var.get()))
+            except (tk.TclError, ValueError):
+                hops = 1
+            if mode_var.get() == "传递关系链":
+                types = CHAIN_RELATIONSHIP_TYPES if type_var.get() == "全部" else [type_var.get()]
+                try:
+                    chain = self.get_chain(self.current_doc.get('_id'), types, max_depth=hops)
+                except Exception as e:
+                    print(f"查询关系链失败: {e}")
+                    messagebox.showerror("错误", f"查询关系链失败: {e}", parent=dialog)
+                    return
+                reached = []
+                for edge in chain:
+                    source, node, _ = self._graph_edge(edge)
+                    if node != doc_key and node not in chain_parents:
+                        chain_parents[node] = source
+                        reached.append((node, edge.get('depth', 0) + 1))
+            elif mode_var.get() == "影响来源链":
+                reached = self.graph.influence_chain(doc_key, max_depth=hops)
+            else:
+                types = None if type_var.get() == "全部" else [type_var.get()]
+                reached = list(self.graph.k_hop(doc_key, hops, types=types).items())
+            
+            shown = reached[:GRAPH_DISPLAY_LIMIT]
+            names = self._node_names(node for node, _ in shown)
+            for node, depth in shown:
+                item = tree.insert("", "end", values=(depth, node[0] or "", names.get(node, node[1])))
+                nodes[item] = node
+            status_var.set(f"共 {len(reached)} 个文档" +
+                           (f"，显示前 {GRAPH_DISPLAY_LIMIT} 个" if len(reached) > GRAPH_DISPLAY_LIMIT else ""))
+        
+        def show_influence_path():
+            """所选文档与当前文档之间的最短影响路径"""
+            selection = tree.selection()
+            if not selection:
+                messagebox.showwarning("未选择文档", "请先在列表中选择文档", parent=dialog)
+                return
+            node = nodes[selection[0]]
+            if chain_parents:
+                # 沿传递关系链回溯到当前文档
+                path = [node]
+                while path[-1] in chain_parents and len(path) <= len(chain_parents):
+                    path.append(chain_parents[path[-1]])
+                path.reverse()
+            else:
+                path = self.graph.shortest_influence_path(node, doc_key) or \
+                    self.graph.shortest_influence_path(doc_key, node)
+            if not path:
+                status_var.set("两个文档之间没有影响路径")
+                return
+            names = self._node_names(path)
+            label = "关系路径: " if chain_parents else "影响路径: "
+            status_var.set(label + " → ".join(str(names.get(step, step[1])) for step in path))
+        
+        def on_double_click(event):
+            """导航到所选文档"""
+            selection = tree.selection()
+            if selection and self.on_navigate_to_target:
+                collection, doc_id = nodes[selection[0]]
+                if collection:
+                    self.on_navigate_to_target(collection, doc_id)
+        
+        mode_combo.bind("<<ComboboxSelected>>", refresh)
+        type_combo.bind("<<ComboboxSelected>>", refresh)
+        tree.bind("<Double-1>", on_double_click)
+        
+        btn_frame = ttk.Frame(dialog, padding=10)
+        btn_frame.pack(fill=tk.X)
+        ttk.Button(btn_frame, text="关闭", command=dialog.destroy).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(btn_frame, text="最短影响路径", command=show_influence_path).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(btn_frame, text="查询", command=refresh).pack(side=tk.RIGHT, padx=5)
+        
+        refresh()
     
     def bulk_create_relationships(self, docs):
         """批量创建关系
@@ -387,28 +728,24 @@ class RelationshipManager:
         target_coll_combo = ttk.Combobox(main_frame, textvariable=target_coll_var, values=collections)
         target_coll_combo.grid(row=2, column=1, sticky=tk.EW, pady=5)
         
-        target_docs = []
-        
         def load_targets(event=None):
-            """加载目标文档"""
-            nonlocal target_docs
+            """切换目标文档选择器的集合"""
             coll = target_coll_var.get()
             if coll:
-                try:
-                    target_docs = self.db_manager.get_documents(self.current_db, coll, limit=100)
-                    target_doc_combo['values'] = [doc.get('filename', str(doc.get('_id'))) for doc in target_docs]
-                except Exception as e:
-                    messagebox.showerror("错误", f"加载目标文档失败: {e}")
+                target_picker.set_collection(self.current_db, coll, self.db_manager)
         
         target_coll_combo.bind("<<ComboboxSelected>>", load_targets)
         
-        ttk.Label(main_frame, text="目标文档:").grid(row=3, column=0, sticky=tk.W, pady=5)
-        target_doc_frame = ttk.Frame(main_frame)
-        target_doc_frame.grid(row=3, column=1, sticky=tk.EW, pady=5)
+        ttk.Label(main_frame, text="目标文档:").grid(row=3, column=0, sticky=tk.NW, pady=5)
+        target_picker = TargetDocPicker(main_frame, self.db_manager, width=30)
+        target_picker.grid(row=3, column=1, sticky=tk.EW, pady=5)
         
-        target_doc_var = tk.StringVar()
-        target_doc_combo = ttk.Combobox(target_doc_frame, textvariable=target_doc_var, values=[], width=30)
-        target_doc_combo.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        # 写入进度
+        progress_var = tk.DoubleVar(value=0)
+        ttk.Progressbar(main_frame, variable=progress_var, maximum=len(docs)).grid(
+            row=4, column=0, columnspan=2, sticky=tk.EW, pady=(10, 0))
+        progress_label = ttk.Label(main_frame, text="")
+        progress_label.grid(row=5, column=0, columnspan=2, sticky=tk.W)
         
         # 按钮
         btn_frame = ttk.Frame(dialog)
@@ -426,31 +763,28 @@ class RelationshipManager:
                 messagebox.showwarning("缺少数据", "请选择目标集合")
                 return
                 
-            if not target_doc_var.get():
+            target_doc = target_picker.selected_document()
+            if target_doc is None:
                 messagebox.showwarning("缺少数据", "请选择目标文档")
                 return
                 
-            try:
-                # 获取目标文档
-                target_idx = target_doc_combo.current()
-                if target_idx < 0 or target_idx >= len(target_docs):
-                    messagebox.showwarning("缺少数据", "请选择有效的目标文档")
-                    return
-                    
-                target_doc = target_docs[target_idx]
+            if target_picker.collection != target_coll_var.get():
+                messagebox.showwarning("缺少数据", "请选择有效的目标文档")
+                return
                 
-                # 创建关系集合
-                rel_collection = "relationships"
-                if rel_collection not in self.db_manager.list_collections(self.current_db):
-                    self.db_manager.insert_document(self.current_db, rel_collection, {"_placeholder": True})
+            try:
+                # 关系集合由首次写入自动创建
+                rel_collection = RELATIONSHIP_COLLECTION
+                database = self.current_db
                 
                 # 获取目标ID并确保是字符串
                 target_id = target_doc.get('_id')
                 if isinstance(target_id, ObjectId):
                     target_id = str(target_id)
                 
-                # 为每个选定文档创建关系
-                successful = 0
+                # 为每个选定文档构建关系
+                created_at = datetime.datetime.now()
+                rel_docs = []
                 for source_doc in docs:
                     # 获取源ID并确保是字符串
                     source_id = source_doc.get('_id')
@@ -463,26 +797,71 @@ class RelationshipManager:
                         "target_id": target_id,
                         "target_collection": target_coll_var.get(),
                         "relationship_type": rel_type_var.get(),
-                        "created_at": datetime.datetime.now()
+                        "created_at": created_at
                     }
-                    
-                    # 保存到数据库
-                    self.db_manager.insert_document(self.current_db, rel_collection, rel_doc)
-                    successful += 1
-                
-                result['success'] = True
-                messagebox.showinfo("成功", f"成功创建 {successful} 个关系！")
-                dialog.destroy()
-                
-                # 触发回调
-                if self.on_relationship_change:
-                    self.on_relationship_change()
+                    rel_docs.append(rel_doc)
                 
             except Exception as e:
                 print(f"创建关系失败: {e}")
                 messagebox.showerror("错误", f"创建关系失败: {e}")
+                return
+            
+            create_button.config(state=tk.DISABLED)
+            progress_label.config(text=f"正在写入 0/{len(rel_docs)}")
+            
+            def on_progress(done, total):
+                """写入线程的进度回调，转交给Tk线程"""
+                def update():
+                    if dialog.winfo_exists():
+                        progress_var.set(done)
+                        progress_label.config(text=f"正在写入 {done}/{total}")
+                # 对话框可能已被关闭，经由父组件转交
+                self.parent.after(0, update)
+            
+            def on_finished(inserted, failed, error=None):
+                """写入完成后在Tk线程中报告结果"""
+                if error is not None:
+                    messagebox.showerror("错误", f"创建关系失败: {error}")
+                    if dialog.winfo_exists():
+                        create_button.config(state=tk.NORMAL)
+                        progress_label.config(text="")
+                else:
+                    result['success'] = True
+                    if failed:
+                        messagebox.showwarning("部分成功", f"成功创建 {inserted} 个关系，{failed} 个失败")
+                    else:
+                        messagebox.showinfo("成功", f"成功创建 {inserted} 个关系！")
+                    if dialog.winfo_exists():
+                        dialog.destroy()
+                
+                self.ensure_indexes(database)
+                if error is None and not failed:
+                    self._update_graph(database, rel_docs)
+                elif self._graph_key == (id(self.db_manager), database):
+                    # 不知道哪些关系写入了，重新加载关系图
+                    self.load_graph(database, force=True)
+                
+                # 触发回调（出错时也可能已写入一部分）
+                if (inserted or error is not None) and self.on_relationship_change:
+                    self.on_relationship_change()
+            
+            def write_relationships():
+                """后台线程：分批写入所有关系"""
+                try:
+                    inserted, failed = self.db_manager.bulk_insert(database, rel_collection, rel_docs,
+                                                                   on_progress=on_progress)
+                    self.parent.after(0, lambda: on_finished(inserted, failed))
+                except Exception as e:
+                    print(f"创建关系失败: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    error = str(e)
+                    self.parent.after(0, lambda: on_finished(0, len(rel_docs), error))
+            
+            threading.Thread(target=write_relationships, daemon=True).start()
         
-        ttk.Button(btn_frame, text="创建", command=on_create).pack(side=tk.RIGHT, padx=5)
+        create_button = ttk.Button(btn_frame, text="创建", command=on_create)
+        create_button.pack(side=tk.RIGHT, padx=5)
         ttk.Button(btn_frame, text="取消", command=dialog.destroy).pack(side=tk.RIGHT, padx=5)
         
         # 居中对话框
@@ -531,32 +910,30 @@ class RelationshipManager:
             item = selection[0]
             values = self.rel_tree.item(item, "values")
             
-            if len(values) >= 3:
-                target_collection = values[1]
-                target_doc_name = values[2]
+            if len(values) >= 4:
+                direction = values[0]
+                target_collection = values[2]
                 rel_id = self.rel_tree.item(item, "tags")[0]
                 
-                # 获取关系记录
-                rel_doc = None
-                try:
-                    rel_id_query = rel_id
-                    if ObjectId.is_valid(rel_id):
-                        rel_id_query = ObjectId(rel_id)
-                    
-                    rel_docs = self.db_manager.get_documents(
-                        self.current_db,
-                        "relationships",
-                        query={"_id": rel_id_query}
-                    )
-                    if rel_docs and len(rel_docs) > 0:
-                        rel_doc = rel_docs[0]
-                except Exception as e:
-                    print(f"获取关系记录失败: {e}")
-                
-                # 获取目标ID
-                target_id = None
-                if rel_doc:
-                    target_id = rel_doc.get('target_id')
+                # 获取关联文档ID（加载关系时已记录，否则查询关系记录）
+                target_collection, target_id = self._rel_targets.get(rel_id, (target_collection, None))
+                if not target_id:
+                    try:
+                        rel_id_query = rel_id
+                        if ObjectId.is_valid(rel_id):
+                            rel_id_query = ObjectId(rel_id)
+                        
+                        rel_docs = self.db_manager.get_documents(
+                            self.current_db,
+                            RELATIONSHIP_COLLECTION,
+                            query={"_id": rel_id_query}
+                        )
+                        if rel_docs and len(rel_docs) > 0:
+                            # 入边导航到源文档
+                            end = 'source_id' if direction == "←" else 'target_id'
+                            target_id = rel_docs[0].get(end)
+                    except Exception as e:
+                        print(f"获取关系记录失败: {e}")
                 
                 if self.on_navigate_to_target and target_collection and target_id:
                     self.on_navigate_to_target(target_collection, target_id)
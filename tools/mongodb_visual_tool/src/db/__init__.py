@@ -2,4 +2,6 @@
 """MongoDB Visual Tool Database Module"""
 
 from .mongo_manager import MongoDBManager
-from .validator import DataValidator 
\ No newline at end of file
+from .validator import DataValidator
+from .change_watcher import ChangeWatcher 
+from .paged_source import PagedDocumentSource 
\ No newline at end of file
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+MongoDB Visual Tool - Collection Change Watcher
+"""
+import time
+import queue
+import threading
+from bson import json_util
+from pymongo.errors import PyMongoError, OperationFailure, ConfigurationError
+
+from ..config.settings import (CHANGE_POLL_INTERVAL, CHANGE_POLL_FULL_SCAN_INTERVAL, CHANGE_POLL_FIELDS,
+                               CHANGE_POLL_UPDATE_FIELDS)
+
+# Normalized event operations
+OP_INSERT = "insert"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+OP_RELOAD = "reload"  # Collection dropped/renamed or stream invalidated, reload everything
+
+
+def make_event(op, doc_id=None, doc=None):
+    """Build a normalized change event
+    
+    Args:
+        op (str): insert, update, delete or reload
+        doc_id: Document _id
+        doc (dict, optional): Full document after the change
+    
+    Returns:
+        dict: {"op", "_id", "doc"}
+    """
+    if doc_id is None and doc is not None:
+        doc_id = doc.get("_id")
+    return {"op": op, "_id": doc_id, "doc": doc}
+
+
+class ChangeStreamSource:
+    """Change source backed by a MongoDB change stream (replica sets only)"""
+    
+    mode = "change_stream"
+    
+    def __init__(self, collection, max_await_ms=1000, max_batch=500):
+        """Open the change stream
+        
+        Args:
+            collection: pymongo Collection
+            max_await_ms (int): Server side wait for new changes per request
+            max_batch (int): Maximum events returned by one next_events call
+        
+        Raises:
+            OperationFailure: If the server does not support change streams
+        """
+        self.collection = collection
+        self.max_await_ms = max_await_ms
+        self.max_batch = max_batch
+        self._resume_token = None
+        self._stream = self._open()
+    
+    def describe(self):
+        """Short description of how changes are detected, for the status bar"""
+        return "Watching changes (change stream)"
+    
+    def _open(self):
+        """Open (or resume) the change stream"""
+        return self.collection.watch(
+            full_document="updateLookup",
+            max_await_time_ms=self.max_await_ms,
+            resume_after=self._resume_token
+        )
+    
+    def _normalize(self, change):
+        """Convert a change stream document into a normalized event"""
+        operation = change.get("operationType")
+        doc_id = change.get("documentKey", {}).get("_id")
+        if operation == "insert":
+            return make_event(OP_INSERT, doc_id, change.get("fullDocument"))
+        if operation in ("update", "replace"):
+            doc = change.get("fullDocument")
+            # Document deleted before the lookup, its delete event follows
+            if doc is None:
+                return None
+            return make_event(OP_UPDATE, doc_id, doc)
+        if operation == "delete":
+            return make_event(OP_DELETE, doc_id)
+        return make_event(OP_RELOAD)
+    
+    def next_events(self, timeout):
+        """Wait up to timeout seconds for changes
+        
+        Args:
+            timeout (float): Maximum wait in seconds
+        
+        Returns:
+            list: Normalized events, empty if nothing changed
+        """
+        events = []
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and len(events) < self.max_batch:
+            try:
+                change = self._stream.try_next()
+            except PyMongoError as e:
+                # Transient failure, resume after the last seen event
+                print(f"Change stream interrupted, resuming: {str(e)}")
+                self._stream.close()
+                self._stream = self._open()
+                continue
+            
+            self._resume_token = self._stream.resume_token
+            if change is None:
+                if events:
+                    break
+                continue
+            
+            event = self._normalize(change)
+            if event is not None:
+                events.append(event)
+                if event["op"] == OP_RELOAD:
+                    break
+        return events
+    
+    def close(self):
+        """Close the change stream"""
+        try:
+            self._stream.close()
+        except PyMongoError:
+            pass
+
+
+class PollingSource:
+    """Change source for deployments without change streams
+    
+    A regular poll only compares watermarks with the previous poll: the
+    estimated document count (collection metadata), the largest _id (one
+    _id index entry) and, when a last-modified field (update_fields) leads an
+    index, its largest value. Documents whose last-modified value moved past
+    the old one are updates. When the largest _id moved and the count grew by
+    the number of documents above the old one, those documents are inserts.
+    Any other difference, and every full_scan_interval seconds, a full scan
+    reads _id and the displayed fields of the collection and compares
+    per-document fingerprints with the previous scan. Without a last-modified
+    index, updates are therefore only found by the full scan. Full documents
+    are fetched only for inserted and changed ids.
+    
+    The first scan runs on the first poll, in the watcher thread.
+    """
+    
+    mode = "polling"
+    
+    def __init__(self, collection, interval=CHANGE_POLL_INTERVAL, fields=CHANGE_POLL_FIELDS,
+                 full_scan_interval=CHANGE_POLL_FULL_SCAN_INTERVAL, update_fields=CHANGE_POLL_UPDATE_FIELDS):
+        """Initialize polling source
+        
+        Args:
+            collection: pymongo Collection
+            interval (float): Seconds between watermark polls
+            fields (list): Fields whose changes are detected (besides inserts/deletes)
+            full_scan_interval (float): Seconds between full fingerprint scans
+            update_fields (list): Last-modified fields, the first one leading an index is polled
+        """
+        self.collection = collection
+        self.interval = interval
+        self.full_scan_interval = full_scan_interval
+        self.projection = {field: 1 for field in fields}
+        self.update_field = self._indexed_field(update_fields)
+        if self.update_field:
+            self.projection[self.update_field] = 1
+        self._fingerprints = None  # Taken by the first poll
+        self._watermark = None
+        self._next_poll = time.monotonic()
+        self._next_full_scan = time.monotonic() + full_scan_interval
+    
+    def describe(self):
+        """Short description of how changes are detected, for the status bar"""
+        if self.update_field:
+            return f"Polling for changes every {self.interval:.0f}s"
+        return (f"Polling for changes every {self.interval:.0f}s, edits by other clients appear "
+                f"within {self.full_scan_interval / 60:.0f} min (no indexed updatedAt field)")
+    
+    def _indexed_field(self, fields):
+        """First of fields that leads an index of the collection, None if none does"""
+        try:
+            leading = {info["key"][0][0] for info in self.collection.index_information().values()}
+        except PyMongoError as e:
+            print(f"Failed to list indexes for change polling: {str(e)}")
+            return None
+        return next((field for field in fields if field in leading), None)
+    
+    def _fingerprint(self, doc):
+        """Fingerprint of _id and the detected fields of a document"""
+        fields = {key: value for key, value in doc.items() if key == "_id" or key in self.projection}
+        return hash(json_util.dumps(fields, sort_keys=True))
+    
+    def _snapshot(self):
+        """Fingerprint every document of the collection
+        
+        Returns:
+            dict: _id -> fingerprint
+        """
+        return {doc["_id"]: self._fingerprint(doc) for doc in self.collection.find({}, self.projection)}
+    
+    def _read_watermark(self):
+        """Cheap change indicator: (estimated document count, largest _id, largest last-modified value)"""
+        last = self.collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        updated = None
+        if self.update_field:
+            latest = self.collection.find_one({self.update_field: {"$exists": True}}, {self.update_field: 1},
+                                              sort=[(self.update_field, -1)])
+            updated = latest.get(self.update_field) if latest else None
+        return self.collection.estimated_document_count(), last["_id"] if last else None, updated
+    
+    def _modified(self, updated):
+        """Update (or insert) events for documents modified after the previous watermark
+        
+        Args:
+            updated: Previous largest last-modified value, None if no document had one
+        
+        Returns:
+            list: Events
+        """
+        # $gte: documents modified within the same clock tick as the previous maximum
+        query = {self.update_field: {"$gte": updated} if updated is not None else {"$exists": True}}
+        events = []
+        for doc in self.collection.find(query):
+            fingerprint = self._fingerprint(doc)
+            previous = self._fingerprints.get(doc["_id"])
+            if previous == fingerprint:
+                continue
+            self._fingerprints[doc["_id"]] = fingerprint
+            events.append(make_event(OP_UPDATE if previous is not None else OP_INSERT, doc["_id"], doc))
+        return events
+    
+    def _appended(self, watermark):
+        """Insert events if the only changes since the last poll are documents above the old largest _id
+        
+        Returns:
+            list: Insert events, None if a full scan is needed
+        """
+        count, last_id, _ = self._watermark
+        new_count = watermark[0]
+        if last_id is None or new_count <= count:
+            return None
+        docs = list(self.collection.find({"_id": {"$gt": last_id}}))
+        if count + len(docs) != new_count:
+            return None
+        for doc in docs:
+            self._fingerprints[doc["_id"]] = self._fingerprint(doc)
+        return [make_event(OP_INSERT, doc["_id"], doc) for doc in docs]
+    
+    def _full_scan(self):
+        """Diff the fingerprints of the whole collection with the previous scan"""
+        current = self._snapshot()
+        previous = self._fingerprints
+        self._fingerprints = current
+        
+        events = [make_event(OP_DELETE, doc_id) for doc_id in previous.keys() - current.keys()]
+        changed = [doc_id for doc_id, fingerprint in current.items() if previous.get(doc_id) != fingerprint]
+        if changed:
+            for doc in self.collection.find({"_id": {"$in": changed}}):
+                op = OP_UPDATE if doc["_id"] in previous else OP_INSERT
+                events.append(make_event(op, doc["_id"], doc))
+        return events
+    
+    def next_events(self, timeout):
+        """Poll the collection if the interval elapsed
+        
+        Args:
+            timeout (float): Maximum wait in seconds
+        
+        Returns:
+            list: Normalized events, empty if nothing changed
+        """
+        now = time.monotonic()
+        if now < self._next_poll:
+            time.sleep(min(timeout, self._next_poll - now))
+            return []
+        self._next_poll = time.monotonic() + self.interval
+        
+        watermark = self._read_watermark()
+        if self._fingerprints is None:
+            # First poll: changes after the watermark are found by the next one
+            self._fingerprints = self._snapshot()
+            self._watermark = watermark
+            return []
+        
+        if time.monotonic() < self._next_full_scan:
+            if watermark == self._watermark:
+                return []
+            events = []
+            if watermark[2] != self._watermark[2]:
+                events = self._modified(self._watermark[2])
+            if watermark[:2] == self._watermark[:2]:
+                self._watermark = watermark
+                return events
+            appended = self._appended(watermark)
+            if appended is not None:
+                self._watermark = watermark
+                # Inserts with a last-modified value are found by both
+                modified = {event["_id"] for event in events}
+                return events + [event for event in appended if event["_id"] not in modified]
+        
+        events = self._full_scan()
+        self._watermark = watermark
+        self._next_full_scan = time.monotonic() + self.full_scan_interval
+        return events
+    
+    def close(self):
+        """Nothing to release"""
+        pass
+
+
+class FakeChangeSource:
+    """In-process change source for tests and manual experiments"""
+    
+    mode = "fake"
+    
+    def __init__(self):
+        self._queue = queue.Queue()
+    
+    def describe(self):
+        """Short description of how changes are detected, for the status bar"""
+        return "Watching changes (fake source)"
+    
+    def push(self, op, doc=None, doc_id=None):
+        """Queue a change event
+        
+        Args:
+            op (str): insert, update, delete or reload
+            doc (dict, optional): Full document after the change
+            doc_id: Document _id, taken from doc if omitted
+        """
+        self._queue.put(make_event(op, doc_id, doc))
+    
+    def next_events(self, timeout):
+        """Wait up to timeout seconds for queued events
+        
+        Returns:
+            list: Normalized events
+        """
+        try:
+            events = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                return events
+    
+    def close(self):
+        """Nothing to release"""
+        pass
+
+
+def create_change_source(collection):
+    """Open a change stream, falling back to polling when unsupported
+    
+    Args:
+        collection: pymongo Collection
+    
+    Returns:
+        ChangeStreamSource or PollingSource
+    """
+    try:
+        return ChangeStreamSource(collection)
+    except (OperationFailure, ConfigurationError) as e:
+        # Standalone servers do not support change streams
+        print(f"Change streams unavailable ({str(e)}), falling back to polling")
+        return PollingSource(collection)
+
+
+class ChangeWatcher:
+    """Watch one collection in a background thread
+    
+    Every batch of changes invalidates the collection's query cache and is
+    passed to on_changes from the watcher thread; UI callers should hand it
+    over to the Tk thread with after().
+    """
+    
+    def __init__(self, db_manager, database, collection, on_changes, source=None, poll_timeout=1.0,
+                 on_status=None):
+        """Initialize watcher
+        
+        Args:
+            db_manager (MongoDBManager): Connected database manager
+            database (str): Database name
+            collection (str): Collection name
+            on_changes (callable): on_changes(events) with a list of normalized events
+            source (optional): Change source, opened with create_change_source if omitted
+            poll_timeout (float): Maximum wait per source call, bounds stop latency
+            on_status (callable, optional): on_status(message) from the watcher thread when a source
+                is opened, describing how (and how quickly) changes are detected
+        """
+        self.db_manager = db_manager
+        self.database = database
+        self.collection = collection
+        self.on_changes = on_changes
+        self.source = source
+        self.poll_timeout = poll_timeout
+        self.on_status = on_status
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    @property
+    def mode(self):
+        """Active source mode (change_stream, polling, fake), None before start"""
+        return getattr(self.source, "mode", None)
+    
+    def start(self):
+        """Start watching in a daemon thread"""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop watching and close the source"""
+        self._stop_event.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=self.poll_timeout + 1.0)
+        self._thread = None
+        if self.source is not None:
+            self.source.close()
+    
+    def is_running(self):
+        """Check whether the watcher thread is running
+        
+        Returns:
+            bool: Whether running
+        """
+        return self._thread is not None and self._thread.is_alive()
+    
+    def _run(self):
+        """Watcher thread"""
+        while not self._stop_event.is_set():
+            try:
+                if self.source is None:
+                    self.source = create_change_source(self.db_manager.client[self.database][self.collection])
+                    print(f"Watching {self.database}.{self.collection} ({self.mode})")
+                    if self.on_status:
+                        self.on_status(self.source.describe())
+                
+                events = self.source.next_events(self.poll_timeout)
+                if events and not self._stop_event.is_set():
+                    self.db_manager.invalidate_collection_cache(self.database, self.collection)
+                    self.on_changes(events)
+            except Exception as e:
+                print(f"Change watcher error on {self.database}.{self.collection}: {str(e)}")
+                # Back off and reopen the source
+                if self.source is not None and self.source.mode != "fake":
+                    self.source.close()
+                    self.source = None
+                self._stop_event.wait(5.0)
@@ -3,25 +3,32 @@
 MongoDB Visual Tool - MongoDB Manager
 """
 import pymongo
+from pymongo.errors import BulkWriteError
 from bson.objectid import ObjectId
-import json
+from bson import json_util
 import hashlib
-import time
+import re
 
+from ..config.settings import (CACHE_TTL_DATABASES, CACHE_TTL_COLLECTIONS,
+                               CACHE_TTL_DOCUMENTS, CACHE_TTL_COUNTS, SORT_COLLATION, ID_LOOKUP_BATCH_SIZE,
+                               BULK_INSERT_BATCH_SIZE, TARGET_PICKER_FIELDS, TARGET_PICKER_LIMIT,
+                               SEARCH_FIELDS, SEARCH_CANDIDATE_LIMIT, SEARCH_TEXT_INDEX_NAME)
 from ..utils.cache_manager import CacheManager
+from .pagination import sort_spec, position_after, encode_token, decode_token, keyset_filter
 
 class MongoDBManager:
     """MongoDB Database Manager"""
     
-    def __init__(self, uri="mongodb://localhost:27017/"):
+    def __init__(self, uri="mongodb://localhost:27017/", cache_manager=None):
         """Initialize MongoDB Manager
         
         Args:
             uri (str): MongoDB connection URI
+            cache_manager (CacheManager, optional): Shared cache, a new one is created if omitted
         """
         self.uri = uri
         self.client = None
-        self.cache_manager = CacheManager()
+        self.cache_manager = cache_manager or CacheManager()
         self.use_cache = True  # 是否使用缓存，默认启用
     
     def connect(self):
@@ -50,13 +57,11 @@ class MongoDBManager:
         # 生成缓存键
         cache_key = f"db_list_{hashlib.md5(self.uri.encode()).hexdigest()}"
         
-        # 如果启用缓存，尝试从缓存获取
+        # 如果启用缓存，尝试从缓存获取（过期条目返回None）
         if self.use_cache:
             cached_data = self.cache_manager.get_cache_entry(cache_key)
-            if cached_data and "timestamp" in cached_data:
-                # 检查缓存是否有效（10分钟内）
-                if time.time() - cached_data["timestamp"] < 600:
-                    return cached_data["data"]
+            if cached_data is not None:
+                return cached_data
         
         # 从数据库获取
         db_list = sorted([db for db in self.client.list_database_names() 
@@ -64,10 +69,7 @@ class MongoDBManager:
         
         # 如果启用缓存，保存到缓存
         if self.use_cache:
-            self.cache_manager.set_cache_entry(cache_key, {
-                "timestamp": time.time(),
-                "data": db_list
-            })
+            self.cache_manager.set_cache_entry(cache_key, db_list, ttl=CACHE_TTL_DATABASES)
             
         return db_list
     
@@ -84,29 +86,25 @@ class MongoDBManager:
             raise ConnectionError("Not connected to MongoDB")
         
         # 生成缓存键
-        cache_key = f"coll_list_{database}_{hashlib.md5(self.uri.encode()).hexdigest()}"
+        generation = self.cache_manager.get_generation(self._cache_namespace(database))
+        cache_key = f"coll_list_{database}_g{generation}_{hashlib.md5(self.uri.encode()).hexdigest()}"
         
-        # 如果启用缓存，尝试从缓存获取
+        # 如果启用缓存，尝试从缓存获取（过期条目返回None）
         if self.use_cache:
             cached_data = self.cache_manager.get_cache_entry(cache_key)
-            if cached_data and "timestamp" in cached_data:
-                # 检查缓存是否有效（5分钟内）
-                if time.time() - cached_data["timestamp"] < 300:
-                    return cached_data["data"]
+            if cached_data is not None:
+                return cached_data
         
         # 从数据库获取
         collection_list = sorted(self.client[database].list_collection_names())
         
         # 如果启用缓存，保存到缓存
         if self.use_cache:
-            self.cache_manager.set_cache_entry(cache_key, {
-                "timestamp": time.time(),
-                "data": collection_list
-            })
+            self.cache_manager.set_cache_entry(cache_key, collection_list, ttl=CACHE_TTL_COLLECTIONS)
             
         return collection_list
     
-    def get_documents(self, database, collection, limit=100, skip=0, query=None):
+    def get_documents(self, database, collection, limit=100, skip=0, query=None, sort=None, projection=None):
         """Get documents
         
         Args:
@@ -115,6 +113,8 @@ class MongoDBManager:
             limit (int): Maximum number of documents to return
             skip (int): Number of documents to skip
             query (dict): Query conditions
+            sort (list, optional): (field, direction) pairs, natural order if omitted
+            projection (dict, optional): Fields to return, whole documents if omitted
             
         Returns:
             list: List of documents
@@ -124,31 +124,255 @@ class MongoDBManager:
             
         query = query or {}
         
-        # 生成缓存键（包含查询条件、限制和偏移）
-        query_str = json.dumps(query, sort_keys=True)
-        cache_key = f"docs_{database}_{collection}_{limit}_{skip}_{hashlib.md5(query_str.encode()).hexdigest()}"
+        # 生成缓存键（包含集合缓存代数、查询条件、排序、投影、限制和偏移）
+        if sort or projection:
+            query_str = json_util.dumps([query, sort, projection], sort_keys=True)
+        else:
+            query_str = json_util.dumps(query, sort_keys=True)
+        generation = self.cache_manager.get_generation(self._cache_namespace(database, collection))
+        cache_key = f"docs_{database}_{collection}_g{generation}_{limit}_{skip}_{hashlib.md5(query_str.encode()).hexdigest()}"
         
-        # 如果启用缓存，尝试从缓存获取
+        # 如果启用缓存，尝试从缓存获取（过期条目返回None）
         if self.use_cache:
             cached_data = self.cache_manager.get_cache_entry(cache_key)
-            if cached_data and "timestamp" in cached_data:
-                # 检查缓存是否有效（2分钟内）
-                if time.time() - cached_data["timestamp"] < 120:
-                    return cached_data["data"]
+            if cached_data is not None:
+                return cached_data
         
         # 从数据库获取
-        docs = list(self.client[database][collection].find(query).limit(limit).skip(skip))
+        cursor = self.client[database][collection].find(query, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        docs = list(cursor.limit(limit).skip(skip))
         
-        # 序列化文档，确保可以缓存
-        docs_serializable = self.bson_to_json(docs)
+        # 如果启用缓存，保存到缓存（保留ObjectId、datetime等BSON类型，命中时与数据库结果一致）
+        if self.use_cache:
+            self.cache_manager.set_cache_entry(cache_key, docs, ttl=CACHE_TTL_DOCUMENTS)
+            
+        return docs
+    
+    def iter_documents(self, database, collection, query=None, projection=None, batch_size=1000):
+        """Stream every matching document, bypassing the cache
+        
+        For reading whole collections (e.g. building an in-memory index)
+        without holding them in the cache or in one list.
+        
+        Args:
+            database (str): Database name
+            collection (str): Collection name
+            query (dict, optional): Query conditions
+            projection (dict, optional): Fields to return, whole documents if omitted
+            batch_size (int): Documents per cursor batch
+            
+        Yields:
+            dict: Documents in natural order
+        """
+        if not self.client:
+            raise ConnectionError("Not connected to MongoDB")
+        
+        cursor = self.client[database][collection].find(query or {}, projection, batch_size=batch_size)
+        try:
+            yield from cursor
+        finally:
+            cursor.close()
+    
+    def graph_lookup(self, database, collection, start_value, connect_from_field, connect_to_field,
+                     max_depth=None, restrict=None, projection=None, depth_field="depth"):
+        """Follow edges transitively on the server with one $graphLookup aggregation
+        
+        Edge documents whose connect_to_field equals start_value are the
+        first hop (depth 0); from each reached edge the search continues with
+        the edges whose connect_to_field equals its connect_from_field. Every
+        edge is returned once, at the smallest depth it was reached.
+        
+        Args:
+            database (str): Database name
+            collection (str): Collection holding the edges
+            start_value: Value the first hop is matched against
+            connect_from_field (str): Field of a reached edge that continues the search
+            connect_to_field (str): Field matched against it
+            max_depth (int, optional): Maximum hops (at least one), unlimited if omitted
+            restrict (dict, optional): Filter every followed edge must match (restrictSearchWithMatch)
+            projection (dict, optional): Fields of the edges to return, inclusion only
+                (depth_field is added to it, so only _id may be excluded)
+            depth_field (str): Field receiving the depth of each edge
+            
+        Returns:
+            list: Edge documents ordered by depth
+            
+        Raises:
+            ValueError: If projection excludes a field other than _id
+        """
+        if not self.client:
+            raise ConnectionError("Not connected to MongoDB")
+        
+        if projection:
+            excluded = [field for field, value in projection.items()
+                        if field != "_id" and value in (0, False)]
+            if excluded:
+                raise ValueError(f"graph_lookup projection must be inclusion-only, got exclusions: {excluded}")
+        
+        lookup = {
+            "from": collection,
+            "startWith": {"$literal": start_value},
+            "connectFromField": connect_from_field,
+            "connectToField": connect_to_field,
+            "as": "edges",
+            "depthField": depth_field,
+        }
+        if max_depth is not None:
+            lookup["maxDepth"] = max(0, max_depth - 1)
+        if restrict:
+            lookup["restrictSearchWithMatch"] = restrict
+        
+        # $graphLookup needs one input document; any document of the collection serves as the anchor
+        pipeline = [
+            {"$limit": 1},
+            {"$graphLookup": lookup},
+            {"$unwind": "$edges"},
+            {"$replaceRoot": {"newRoot": "$edges"}},
+            {"$sort": {depth_field: 1, "_id": 1}},
+        ]
+        if projection:
+            pipeline.append({"$project": dict(projection, **{depth_field: 1})})
+        
+        pipeline_str = json_util.dumps(pipeline, sort_keys=True)
+        generation = self.cache_manager.get_generation(self._cache_namespace(database, collection))
+        cache_key = f"graph_{database}_{collection}_g{generation}_{hashlib.md5(pipeline_str.encode()).hexdigest()}"
+        
+        if self.use_cache:
+            cached_data = self.cache_manager.get_cache_entry(cache_key)
+            if cached_data is not None:
+                return cached_data
+        
+        docs = list(self.client[database][collection].aggregate(pipeline, allowDiskUse=True))
         
-        # 如果启用缓存，保存到缓存
         if self.use_cache:
-            self.cache_manager.set_cache_entry(cache_key, {
-                "timestamp": time.time(),
-                "data": docs_serializable
-            })
+            self.cache_manager.set_cache_entry(cache_key, docs, ttl=CACHE_TTL_DOCUMENTS)
+        
+        return docs
+    
+    def get_documents_page(self, database, collection, limit=100, query=None, sort_field="_id",
+                           reverse=False, token=None, skip=0, projection=None):
+        """Get one page of documents with keyset pagination
+        
+        The page continues after the position encoded in token instead of
+        skipping documents on the server. skip is only used to jump to a page
+        without a token, and by the tokens of sort fields that hold arrays in
+        some document (see has_array_values).
+        
+        Args:
+            database (str): Database name
+            collection (str): Collection name
+            limit (int): Page size
+            query (dict): Query conditions
+            sort_field (str): Sort field (_id breaks ties), strings sort case-insensitively
+            reverse (bool): Descending order
+            token (str, optional): Continuation token returned with the previous page
+            skip (int): Documents to skip when no token is given
+            projection (dict, optional): Fields to return, whole documents if omitted
             
+        Returns:
+            tuple: (list of documents, next page token or None after the last page)
+        
+        Raises:
+            ValueError: If the token belongs to another sort order
+        """
+        if not self.client:
+            raise ConnectionError("Not connected to MongoDB")
+        
+        query = query or {}
+        sort_field = sort_field or "_id"
+        find_query = query
+        after, offset = decode_token(token, sort_field, reverse) if token else (None, skip)
+        if after is not None:
+            keyset = keyset_filter(sort_field, reverse, *after)
+            find_query = {"$and": [query, keyset]} if query else keyset
+        
+        # 缓存键包含续页令牌而不是偏移量（只有无令牌的跳页才使用skip）
+        page_str = json_util.dumps([query, sort_field, bool(reverse), token, offset, projection], sort_keys=True)
+        generation = self.cache_manager.get_generation(self._cache_namespace(database, collection))
+        cache_key = f"page_{database}_{collection}_g{generation}_{limit}_{hashlib.md5(page_str.encode()).hexdigest()}"
+        
+        if self.use_cache:
+            cached_data = self.cache_manager.get_cache_entry(cache_key)
+            if cached_data is not None:
+                return cached_data["docs"], cached_data["next"]
+        
+        # 多取一条判断是否还有下一页
+        collation = SORT_COLLATION if sort_field != "_id" else None
+        if projection and sort_field not in projection:
+            # 续页令牌需要最后一个文档的排序值
+            projection = dict(projection, **{sort_field: 1})
+        cursor = self.client[database][collection].find(find_query, projection, collation=collation)
+        docs = list(cursor.sort(sort_spec(sort_field, reverse)).skip(offset).limit(limit + 1))
+        next_token = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            # 排序字段含数组时范围条件会匹配任一元素，文档可能重复或遗漏，改为跳过偏移量
+            keyset = sort_field == "_id" or not self.has_array_values(database, collection, sort_field)
+            position = position_after(sort_field, docs[-1]) if keyset else None
+            if position is not None:
+                next_token = encode_token(sort_field, reverse, position)
+            else:
+                next_token = encode_token(sort_field, reverse, after, offset + limit)
+        
+        if self.use_cache:
+            self.cache_manager.set_cache_entry(cache_key, {"docs": docs, "next": next_token}, ttl=CACHE_TTL_DOCUMENTS)
+        
+        return docs, next_token
+    
+    def get_document(self, database, collection, document_id):
+        """Get one whole document by _id (not cached, used for the details panel)
+        
+        Args:
+            database (str): Database name
+            collection (str): Collection name
+            document_id: Document ID (ObjectId strings are converted)
+            
+        Returns:
+            dict: Document, None if not found
+        """
+        if not self.client:
+            raise ConnectionError("Not connected to MongoDB")
+        
+        doc_id = document_id
+        if isinstance(document_id, str) and ObjectId.is_valid(document_id):
+            doc_id = ObjectId(document_id)
+        return self.client[database][collection].find_one({'_id': doc_id})
+    
+    def get_documents_by_ids(self, database, collection, document_ids, projection=None):
+        """Get documents by _id with one $in query per ID_LOOKUP_BATCH_SIZE ids (not cached)
+        
+        Args:
+            database (str): Database name
+            collection (str): Collection name
+            document_ids (iterable): Document IDs (ObjectId strings also match ObjectId _ids)
+            projection (dict, optional): Fields to return, whole documents if omitted
+            
+        Returns:
+            dict: str(_id) -> document, ids that were not found are missing
+        """
+        if not self.client:
+            raise ConnectionError("Not connected to MongoDB")
+        
+        ids = []
+        seen = set()
+        for document_id in document_ids:
+            candidates = [document_id]
+            if isinstance(document_id, str) and ObjectId.is_valid(document_id):
+                candidates.append(ObjectId(document_id))
+            for candidate in candidates:
+                key = (type(candidate), str(candidate))
+                if key not in seen:
+                    seen.add(key)
+                    ids.append(candidate)
+        
+        docs = {}
+        coll = self.client[database][collection]
+        for start in range(0, len(ids), ID_LOOKUP_BATCH_SIZE):
+            batch = ids[start:start + ID_LOOKUP_BATCH_SIZE]
+            for doc in coll.find({'_id': {'$in': batch}}, projection):
+                docs[str(doc['_id'])] = doc
         return docs
     
     def bson_to_json(self, data):
@@ -192,27 +416,23 @@ class MongoDBManager:
             
         query = query or {}
         
-        # 生成缓存键（包含查询条件）
-        query_str = json.dumps(query, sort_keys=True)
-        cache_key = f"count_{database}_{collection}_{hashlib.md5(query_str.encode()).hexdigest()}"
+        # 生成缓存键（包含集合缓存代数和查询条件）
+        query_str = json_util.dumps(query, sort_keys=True)
+        generation = self.cache_manager.get_generation(self._cache_namespace(database, collection))
+        cache_key = f"count_{database}_{collection}_g{generation}_{hashlib.md5(query_str.encode()).hexdigest()}"
         
-        # 如果启用缓存，尝试从缓存获取
+        # 如果启用缓存，尝试从缓存获取（过期条目返回None）
         if self.use_cache:
             cached_data = self.cache_manager.get_cache_entry(cache_key)
-            if cached_data and "timestamp" in cached_data:
-                # 检查缓存是否有效（2分钟内）
-                if time.time() - cached_data["timestamp"] < 120:
-                    return cached_data["data"]
+            if cached_data is not None:
+                return cached_data
         
         # 从数据库获取
         count = self.client[database][collection].count_documents(query)
         
         # 如果启用缓存，保存到缓存
         if self.use_cache:
-            self.cache_manager.set_cache_entry(cache_key, {
-                "timestamp": time.time(),
-                "data": count
-            })
+            self.cache_manager.set_cache_entry(cache_key, count, ttl=CACHE_TTL_COUNTS)
             
         return count
     
@@ -233,20 +453,47 @@ class MongoDBManager:
         result = self.client[database][collection].insert_one(document)
         
         # 插入新文档后，使相关缓存失效
-        self._invalidate_collection_cache(database, collection)
+        self._invalidate_collection_cache(database, collection, collection_list_changed=True)
         
         return str(result.inserted_id)
     
-    def _invalidate_collection_cache(self, database, collection):
+    def _cache_namespace(self, database, collection=None):
+        """缓存代数的命名空间
+        
+        Args:
+            database (str): 数据库名
+            collection (str, optional): 集合名，为None时表示数据库的集合列表
+            
+        Returns:
+            str: 命名空间
+        """
+        if collection is None:
+            return database
+        return f"{database}.{collection}"
+    
+    def invalidate_collection_cache(self, database, collection):
+        """使集合的缓存失效（供外部变更通知使用，如ChangeWatcher）
+        
+        Args:
+            database (str): 数据库名
+            collection (str): 集合名
+        """
+        self._invalidate_collection_cache(database, collection)
+    
+    def _invalidate_collection_cache(self, database, collection, collection_list_changed=False):
         """使特定集合的缓存失效
         
+        递增集合的缓存代数，该集合旧的文档和计数缓存键不再被访问，
+        其他数据库和集合的缓存不受影响。
+        
         Args:
             database (str): 数据库名
             collection (str): 集合名
+            collection_list_changed (bool): 插入可能创建了新集合时，同时使集合列表缓存失效
         """
-        # 为简单起见，我们只是清理documents缓存目录
-        # 在实际应用中，可以使用更精确的缓存失效策略
-        self.cache_manager.clear_cache("documents")
+        self.cache_manager.bump_generation(self._cache_namespace(database, collection))
+        if collection_list_changed:
+            self.cache_manager.bump_generation(self._cache_namespace(database))
     
     def set_cache_enabled(self, enabled):
         """设置是否启用缓存
@@ -343,6 +590,9 @@ class MongoDBManager:
                 documents = processed_docs
             
             result = self.client[database][collection].insert_many(documents)
+            
+            # 插入新文档后，使相关缓存失效
+            self._invalidate_collection_cache(database, collection, collection_list_changed=True)
             return bool(result.inserted_ids)
         except Exception as e:
             print(f"Failed to insert documents: {e}")
@@ -350,6 +600,48 @@ class MongoDBManager:
                 print(f"Error details: {e.details}")
             return False
     
+    def bulk_insert(self, database, collection, documents, batch_size=BULK_INSERT_BATCH_SIZE, on_progress=None):
+        """Insert many documents with chunked unordered insert_many calls
+        
+        Unlike insert_many, documents are written as they are (no schema
+        processing). A failing document does not stop the rest of its chunk,
+        and the collection cache is invalidated once at the end.
+        
+        Args:
+            database (str): Database name
+            collection (str): Collection name
+            documents (list): Documents to insert
+            batch_size (int): Documents per insert_many call
+            on_progress (callable, optional): on_progress(done, total) after each chunk
+            
+        Returns:
+            tuple: (inserted count, failed count)
+        """
+        if not self.client:
+            raise ConnectionError("Not connected to MongoDB")
+        
+        coll = self.client[database][collection]
+        total = len(documents)
+        inserted = 0
+        failed = 0
+        try:
+            for start in range(0, total, batch_size):
+                batch = documents[start:start + batch_size]
+                try:
+                    result = coll.insert_many(batch, ordered=False)
+                    inserted += len(result.inserted_ids)
+                except BulkWriteError as e:
+                    inserted += e.details.get('nInserted', 0)
+                    failed += len(e.details.get('writeErrors', []))
+                    print(f"Bulk insert into {database}.{collection}: {len(e.details.get('writeErrors', []))} documents failed")
+                if on_progress:
+                    on_progress(min(start + batch_size, total), total)
+        finally:
+            # 写入结束后（包括出错时）只使缓存失效一次
+            if total:
+                self._invalidate_collection_cache(database, collection, collection_list_changed=True)
+        return inserted, failed
+    
     def _process_document_for_schema(self, doc, schema):
         """处理文档以符合schema要求
         
@@ -395,6 +687,251 @@ class MongoDBManager:
         
         return processed
 
+    def has_text_index(self, database, collection):
+        """Check whether a collection has a text index
+        
+        The answer is cached under the collection's cache generation, which
+        create_search_index bumps, so searches do not list the indexes on
+        every keystroke.
+        
+        Args:
+            database (str): Database name
+            collection (str): Collection name
+            
+        Returns:
+            bool: Whether a text index exists
+        """
+        if not self.client:
+            raise ConnectionError("Not connected to MongoDB")
+        
+        generation = self.cache_manager.get_generation(self._cache_namespace(database, collection))
+        cache_key = f"textindex_{database}_{collection}_g{generation}"
+        if self.use_cache:
+            cached_data = self.cache_manager.get_cache_entry(cache_key)
+            if cached_data is not None:
+                return cached_data
+        
+        indexes = self.client[database][collection].index_information()
+        has_index = any(direction == "text" for info in indexes.values() for _, direction in info.get("key", []))
+        
+        if self.use_cache:
+            self.cache_manager.set_cache_entry(cache_key, has_index, ttl=CACHE_TTL_COLLECTIONS)
+        
+        return has_index
+    
+    def has_array_values(self, database, collection, field):
+        """Check whether any document of a collection holds an array in a field
+        
+        Range filters on such a field match any array element, so keyset
+        pages cannot continue after a sort value of it. Cached under the
+        collection's cache generation.
+        
+        Args:
+            database (str): Database name
+            collection (str): Collection name
+            field (str): Field name
+            
+        Returns:
+            bool: Whether an array value exists
+        """
+        if not self.client:
+            raise ConnectionError("Not connected to MongoDB")
+        
+        generation = self.cache_manager.get_generation(self._cache_namespace(database, collection))
+        cache_key = f"arrayfield_{database}_{collection}_{field}_g{generation}"
+        if self.use_cache:
+            cached_data = self.cache_manager.get_cache_entry(cache_key)
+            if cached_data is not None:
+                return cached_data
+        
+        has_arrays = self.client[database][collection].find_one({field: {"$type": "array"}}, {"_id": 1}) is not None
+        
+        if self.use_cache:
+            self.cache_manager.set_cache_entry(cache_key, has_arrays, ttl=CACHE_TTL_COLLECTIONS)
+        
+        return has_arrays
+    
+    def create_search_index(self, database, collection, fields=None):
+        """Create the text index used by search_candidates
+        
+        Args:
+            database (str): Database name
+            collection (str): Collection name
+            fields (list, optional): Indexed fields, SEARCH_FIELDS if omitted
+            
+        Returns:
+            str: Index name
+        
+        Raises:
+            OperationFailure: If the collection already has another text index
+        """
+        if not self.client:
+            raise ConnectionError("Not connected to MongoDB")
+        
+        # 不做词干提取和停用词过滤，文件名和标题按原词匹配
+        keys = [(field, pymongo.TEXT) for field in (fields or SEARCH_FIELDS)]
+        name = self.client[database][collection].create_index(keys, name=SEARCH_TEXT_INDEX_NAME,
+                                                              default_language="none")
+        self._invalidate_collection_cache(database, collection)
+        return name
+    
+    def ensure_indexes(self, database, collection, indexes, collation=None):
+        """Create the indexes of a collection that do not exist yet
+        
+        An index counts as existing when the collection has an index with the
+        same keys and collation, whatever its name.
+        
+        Args:
+            database (str): Database name
+            collection (str): Collection name
+            indexes (dict): Index name -> list of (field, direction) keys
+            collation (dict, optional): Collation of the indexes, simple binary comparison if omitted
+            
+        Returns:
+            list: Names of the indexes created
+        """
+        if not self.client:
+            raise ConnectionError("Not connected to MongoDB")
+        
+        def same_collation(info):
+            index_collation = info.get("collation")
+            if not collation:
+                return not index_collation
+            return bool(index_collation) and all(index_collation.get(key) == value for key, value in collation.items())
+        
+        coll = self.client[database][collection]
+        existing = {tuple((field, direction) for field, direction in info.get("key", []))
+                    for info in coll.index_information().values() if same_collation(info)}
+        options = {"collation": collation} if collation else {}
+        models = [pymongo.IndexModel(keys, name=name, **options) for name, keys in indexes.items()
+                  if tuple(keys) not in existing]
+        if not models:
+            return []
+        
+        # 集合不存在时createIndexes会创建它
+        created = coll.create_indexes(models)
+        self._invalidate_collection_cache(database, collection, collection_list_changed=True)
+        return created
+    
+    def find_by_prefix(self, database, collection, prefix, fields=None, limit=TARGET_PICKER_LIMIT,
+                       projection=None):
+        """Documents whose fields start with a prefix, case-insensitively
+        
+        Each field is queried with a range [prefix, prefix + U+FFFF) under
+        SORT_COLLATION, sorted by the field, so a case-insensitive index on
+        it (see ensure_indexes) answers the query by scanning limit + 1 keys.
+        
+        Args:
+            database (str): Database name
+            collection (str): Collection name
+            prefix (str): Typed prefix, empty for the first documents of each field
+            fields (list, optional): Fields matched, TARGET_PICKER_FIELDS if omitted
+            limit (int): Documents fetched per field
+            projection (dict, optional): Fields to return, whole documents if omitted
+            
+        Returns:
+            tuple: (documents, complete), complete is False when some field had more
+                than limit matches
+        """
+        if not self.client:
+            raise ConnectionError("Not connected to MongoDB")
+        
+        fields = fields or TARGET_PICKER_FIELDS
+        prefix_str = json_util.dumps([prefix, fields, projection], sort_keys=True)
+        generation = self.cache_manager.get_generation(self._cache_namespace(database, collection))
+        cache_key = f"prefix_{database}_{collection}_g{generation}_{limit}_{hashlib.md5(prefix_str.encode()).hexdigest()}"
+        
+        if self.use_cache:
+            cached_data = self.cache_manager.get_cache_entry(cache_key)
+            if cached_data is not None:
+                return cached_data["docs"], cached_data["complete"]
+        
+        # U+FFFF排在所有字符之后，[prefix, prefix + U+FFFF) 即以prefix开头的字符串
+        docs = {}
+        complete = True
+        coll = self.client[database][collection]
+        for field in fields:
+            condition = {"$gte": prefix, "$lt": prefix + "\uffff"} if prefix else {"$gte": ""}
+            cursor = coll.find({field: condition}, projection, collation=SORT_COLLATION)
+            matches = list(cursor.sort(field, pymongo.ASCENDING).limit(limit + 1))
+            if len(matches) > limit:
+                complete = False
+                matches = matches[:limit]
+            for doc in matches:
+                docs.setdefault(str(doc.get("_id")), doc)
+        docs = list(docs.values())
+        
+        if self.use_cache:
+            self.cache_manager.set_cache_entry(cache_key, {"docs": docs, "complete": complete}, ttl=CACHE_TTL_DOCUMENTS)
+        
+        return docs, complete
+    
+    def search_candidates(self, database, collection, text, query=None, projection=None,
+                          limit=SEARCH_CANDIDATE_LIMIT):
+        """Narrow a fuzzy search down to candidate documents on the server
+        
+        Matches the words of text with the collection's text index (if any)
+        and prefixes of SEARCH_FIELDS with an anchored, case-insensitive regex.
+        Callers re-rank the candidates locally.
+        
+        Args:
+            database (str): Database name
+            collection (str): Collection name
+            text (str): Search text
+            query (dict, optional): Filter the candidates must also match
+            projection (dict, optional): Fields to return
+            limit (int): Maximum number of candidates
+            
+        Returns:
+            list: Candidate documents, text index matches first (by relevance)
+        """
+        if not self.client:
+            raise ConnectionError("Not connected to MongoDB")
+        
+        text = text.strip()
+        query = query or {}
+        if not text:
+            return []
+        
+        search_str = json_util.dumps([text, query, projection, limit], sort_keys=True)
+        generation = self.cache_manager.get_generation(self._cache_namespace(database, collection))
+        cache_key = f"search_{database}_{collection}_g{generation}_{hashlib.md5(search_str.encode()).hexdigest()}"
+        
+        if self.use_cache:
+            cached_data = self.cache_manager.get_cache_entry(cache_key)
+            if cached_data is not None:
+                return cached_data
+        
+        coll = self.client[database][collection]
+        candidates = {}
+        
+        # 文本索引：按相关度排序的整词匹配
+        if self.has_text_index(database, collection):
+            text_query = {"$text": {"$search": text}}
+            if query:
+                text_query = {"$and": [query, text_query]}
+            score = {"score": {"$meta": "textScore"}}
+            text_projection = dict(projection, **score) if projection else score
+            for doc in coll.find(text_query, text_projection).sort([("score", {"$meta": "textScore"})]).limit(limit):
+                doc.pop("score", None)
+                candidates[doc["_id"]] = doc
+        
+        # 前缀匹配：覆盖没有文本索引的集合和输入到一半的词
+        if len(candidates) < limit:
+            pattern = {"$regex": "^" + re.escape(text), "$options": "i"}
+            regex_query = {"$or": [{field: pattern} for field in SEARCH_FIELDS]}
+            if query:
+                regex_query = {"$and": [query, regex_query]}
+            for doc in coll.find(regex_query, projection).limit(limit):
+                candidates.setdefault(doc["_id"], doc)
+                if len(candidates) >= limit:
+                    break
+        
+        docs = list(candidates.values())
+        if self.use_cache:
+            self.cache_manager.set_cache_entry(cache_key, docs, ttl=CACHE_TTL_DOCUMENTS)
+        return docs
+    
     def get_collection_info(self, database, collection):
         """Get collection information including validation rules
         
@@ -434,6 +971,10 @@ class MongoDBManager:
             {'_id': ObjectId(document_id)},
             {'$set': update_data}
         )
+        
+        # 更新文档后，使相关缓存失效
+        if result.modified_count > 0:
+            self._invalidate_collection_cache(database, collection)
         return result.modified_count > 0
     
     def delete_document(self, database, collection, document_id):
@@ -473,6 +1014,7 @@ class MongoDBManager:
                                 {'_id': movement_id},
                                 {'$pull': {'representative_artists': doc_id}}
                             )
+                            self._invalidate_collection_cache(database, 'art_movements')
                         except Exception as e:
                             print(f"Error updating movement {movement_id}: {e}")
 
@@ -482,6 +1024,7 @@ class MongoDBManager:
                         try:
                             print(f"[DEBUG] Deleting artwork: {work_id}")
                             self.client[database]['artworks'].delete_one({'_id': work_id})
+                            self._invalidate_collection_cache(database, 'artworks')
                         except Exception as e:
                             print(f"Error deleting artwork {work_id}: {e}")
 
@@ -490,6 +1033,10 @@ class MongoDBManager:
             result = self.client[database][collection].delete_one({'_id': doc_id})
             success = result.deleted_count > 0
             print(f"[DEBUG] Deletion result: {success}")
+            
+            # 删除文档后，使相关缓存失效
+            if success:
+                self._invalidate_collection_cache(database, collection)
             return success
             
         except Exception as e:
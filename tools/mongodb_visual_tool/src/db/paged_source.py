@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+MongoDB Visual Tool - Paged Document Source
+"""
+import queue
+import threading
+import traceback
+from collections.abc import Sequence
+
+from ..config.settings import SOURCE_PAGE_SIZE
+from .pagination import local_sort_key
+
+
+class PagedDocumentSource(Sequence):
+    """Lazily loaded, read-only sequence over the documents of a collection
+    
+    len() is the server side document count. Indexing a document whose block
+    (page of SOURCE_PAGE_SIZE documents) is not loaded yet returns None and
+    queues the block for a background fetch; on_page_loaded is called from the
+    worker thread once it arrives, and the block after it is prefetched.
+    
+    Blocks are fetched in sort order (_id breaks ties) with
+    MongoDBManager.get_documents_page. When the previous block is loaded the
+    next one continues from its page token (keyset pagination); random jumps
+    fall back to skip.
+    """
+    
+    def __init__(self, db_manager, database, collection, query=None, page_size=SOURCE_PAGE_SIZE,
+                 sort_field="_id", reverse=False, projection=None, transform=None, on_page_loaded=None):
+        """Initialize the source
+        
+        Args:
+            db_manager (MongoDBManager): Connected database manager
+            database (str): Database name
+            collection (str): Collection name
+            query (dict, optional): Filter applied on the server
+            page_size (int): Documents per fetched block
+            sort_field (str): Server side sort field
+            reverse (bool): Descending order
+            projection (dict, optional): Fields to fetch, whole documents if omitted
+            transform (callable, optional): transform(docs) -> docs, applied to each block
+                in the worker thread (e.g. file validation)
+            on_page_loaded (callable, optional): on_page_loaded(block) called from the worker thread
+        """
+        self.db_manager = db_manager
+        self.database = database
+        self.collection = collection
+        self.query = query or {}
+        self.page_size = page_size
+        self.transform = transform
+        self.on_page_loaded = on_page_loaded
+        
+        self.sort_field = sort_field or "_id"
+        self.reverse = reverse
+        self.projection = projection
+        
+        self._total = 0
+        self._blocks = {}  # block number -> list of documents
+        self._tokens = {}  # block number -> token of the following block
+        self._positions = {}  # str(_id) -> index of the loaded documents
+        self._requested = set()
+        self._epoch = 0  # Incremented by reset(), results of older fetches are dropped
+        self._generation = 0  # Incremented whenever the loaded documents change
+        self._lock = threading.Lock()
+        
+        self._queue = queue.Queue()
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+    
+    def open(self):
+        """Count the documents and load the first block (blocking, call from a worker thread)
+        
+        Returns:
+            PagedDocumentSource: self
+        """
+        self._total = self.db_manager.count_documents(self.database, self.collection, self.query)
+        if self._total:
+            self._fetch_block(0, self._epoch, prefetch_next=True)
+        return self
+    
+    def set_sort(self, field, reverse=False):
+        """Change the server side sort order, dropping loaded blocks
+        
+        Args:
+            field (str): Sort field
+            reverse (bool): Descending order
+        """
+        field = field or "_id"
+        if field == self.sort_field and reverse == self.reverse:
+            return
+        self.sort_field = field
+        self.reverse = reverse
+        self.reset()
+    
+    def set_projection(self, projection):
+        """Change the fetched fields, loaded blocks are refetched only if fields were added
+        
+        Args:
+            projection (dict): Fields to fetch, None for whole documents
+        """
+        if self.projection is None:
+            return
+        if projection is not None and set(projection) <= set(self.projection):
+            return
+        self.projection = projection
+        self.reset(total=self._total)
+    
+    def reset(self, total=None):
+        """Drop loaded blocks, e.g. after the collection changed
+        
+        Args:
+            total (int, optional): New document count, recounted in the background if omitted
+        """
+        with self._lock:
+            self._epoch += 1
+            self._generation += 1
+            self._blocks = {}
+            self._tokens = {}
+            self._positions = {}
+            self._requested = set()
+            if total is not None:
+                self._total = total
+            epoch = self._epoch
+        if total is None:
+            self._queue.put(("count", epoch, False))
+        self._queue.put((0, epoch, True))
+    
+    def apply_changes(self, events):
+        """Apply change events from ChangeWatcher
+        
+        Updates of loaded documents are replaced in place. Inserts that sort
+        after the last document grow the source and its last block; deletes
+        of loaded documents remove them and shift the following loaded blocks.
+        The loaded blocks are dropped and refetched only when the position of
+        a change cannot be determined (reloads, inserts elsewhere or into a
+        filtered source, deletes of documents that are not loaded).
+        
+        Block lists are replaced, never changed in place: without a transform
+        they are the page lists held by the query cache.
+        
+        Args:
+            events (list): Normalized change events
+        
+        Returns:
+            bool: Whether the blocks were reset
+        """
+        changes = []
+        for event in events:
+            op, doc = event["op"], event.get("doc")
+            if op == "delete":
+                changes.append((op, str(event["_id"]), None, None))
+                continue
+            if op not in ("insert", "update") or doc is None:
+                self.reset()
+                return True
+            # Sort key of the whole document, the projection may leave out the sort field
+            sort_key = local_sort_key(self.sort_field, doc)
+            if self.projection:
+                doc = {key: value for key, value in doc.items() if key in self.projection}
+            # Documents the transform rejects (e.g. invalid files) are not shown
+            if self.transform:
+                docs = self.transform([doc])
+                doc = docs[0] if docs else None
+            changes.append((op, str(event["_id"]), doc, sort_key))
+        
+        with self._lock:
+            shifted = False
+            for op, key, doc, sort_key in changes:
+                if op == "update" or (op == "insert" and key in self._positions):
+                    self._replace(key, doc)
+                    continue
+                applied = self._append(doc, sort_key) if op == "insert" else self._remove(key)
+                if applied is None:
+                    break
+                shifted = shifted or applied
+            else:
+                self._generation += 1
+                if shifted:
+                    # Fetches in flight use the old positions, drop their results
+                    self._epoch += 1
+                    self._requested = set()
+                return False
+        self.reset()
+        return True
+    
+    def _replace(self, key, doc):
+        """Replace a loaded document (lock held)"""
+        index = self._positions.get(key)
+        if index is None or doc is None:
+            return
+        block, offset = divmod(index, self.page_size)
+        docs = list(self._blocks[block])
+        docs[offset] = doc
+        self._blocks[block] = docs
+    
+    def _append(self, doc, sort_key):
+        """Append an inserted document that sorts after the last one (lock held)
+        
+        Args:
+            doc (dict): Document to show, None if the transform rejected it
+            sort_key (tuple): local_sort_key() of the whole document
+        
+        Returns:
+            bool: Whether positions shifted, None if the position of the document is unknown
+        """
+        if self.query:
+            # The document may not match the filter
+            return None
+        if self._total:
+            # The last block must be loaded and complete to know the last document
+            last_block = (self._total - 1) // self.page_size
+            docs = self._blocks.get(last_block)
+            if docs is None or len(docs) != self._total - last_block * self.page_size:
+                return None
+            last_key = local_sort_key(self.sort_field, docs[-1]) if docs else None
+            if sort_key is None or last_key is None:
+                return None
+            try:
+                if (sort_key < last_key) if not self.reverse else (sort_key > last_key):
+                    return None
+            except TypeError:
+                return None
+        
+        index = self._total
+        self._total += 1
+        block, offset = divmod(index, self.page_size)
+        docs = self._blocks.get(block)
+        if docs is not None and doc is not None:
+            self._blocks[block] = docs + [doc]
+            self._positions[str(doc.get("_id"))] = index
+        return True
+    
+    def _remove(self, key):
+        """Remove a deleted document and shift the loaded blocks after it (lock held)
+        
+        Full blocks following the document's block move up by one position.
+        The last block of that run keeps its documents only if it is the
+        last block of the source; otherwise it and every loaded block after
+        it lose their place and are dropped (fetched again when shown).
+        
+        Returns:
+            bool: Whether positions shifted, None if the position of the document is unknown
+        """
+        index = self._positions.get(key)
+        if index is None:
+            # Every document is loaded, so the deleted one was not part of the source
+            # (unless the transform hid it, then its position is unknown)
+            return False if self.is_fully_loaded() and not self.transform else None
+        
+        first = index // self.page_size
+        last_block = (self._total - 1) // self.page_size
+        run = [first]
+        while len(self._blocks[run[-1]]) == self.page_size and run[-1] + 1 in self._blocks:
+            run.append(run[-1] + 1)
+        docs = []
+        for block in run:
+            docs.extend(self._blocks[block])
+        del docs[index - first * self.page_size]
+        
+        self._total -= 1
+        for position, block in enumerate(run):
+            self._blocks[block] = docs[position * self.page_size:(position + 1) * self.page_size]
+        if run[-1] != last_block or not self._blocks[run[-1]]:
+            del self._blocks[run[-1]]
+        for block in [block for block in self._blocks if block > run[-1]]:
+            del self._blocks[block]
+        for block in [block for block in self._tokens if block >= first]:
+            del self._tokens[block]
+        
+        self._positions.pop(key, None)
+        start = first * self.page_size
+        self._positions = {doc_key: position for doc_key, position in self._positions.items() if position < start}
+        for block in range(first, run[-1] + 1):
+            for offset, doc in enumerate(self._blocks.get(block, ())):
+                self._positions[str(doc.get("_id"))] = block * self.page_size + offset
+        return True
+    
+    def close(self):
+        """Stop the background worker"""
+        self._running = False
+        self._queue.put(None)
+    
+    def __len__(self):
+        return self._total
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("document index out of range")
+        
+        block, offset = divmod(index, self.page_size)
+        docs = self._blocks.get(block)
+        if docs is None:
+            self.request_block(block)
+            return None
+        return docs[offset] if offset < len(docs) else None
+    
+    def request_block(self, block, prefetch_next=True):
+        """Queue a block for loading if it is neither loaded nor requested
+        
+        Args:
+            block (int): Block number
+            prefetch_next (bool): Also prefetch the following block once this one arrives
+        """
+        with self._lock:
+            if block in self._blocks or block in self._requested:
+                return
+            if block * self.page_size >= self._total:
+                return
+            self._requested.add(block)
+            epoch = self._epoch
+        self._queue.put((block, epoch, prefetch_next))
+    
+    def is_loaded(self, index):
+        """Check whether the document at index is loaded
+        
+        Returns:
+            bool: Whether loaded
+        """
+        return index // self.page_size in self._blocks
+    
+    def index_of(self, key):
+        """Index of a loaded document
+        
+        Args:
+            key (str): str() of the document _id
+        
+        Returns:
+            int: Index, None if the document is not loaded
+        """
+        return self._positions.get(key)
+    
+    def is_fully_loaded(self):
+        """Check whether every block is loaded
+        
+        Returns:
+            bool: Whether fully loaded
+        """
+        blocks = (self._total + self.page_size - 1) // self.page_size
+        return len(self._blocks) >= blocks
+    
+    def loaded_items(self):
+        """Loaded documents in order, skipping blocks that are not loaded
+        
+        Returns:
+            list: Documents
+        """
+        items = []
+        for block in sorted(self._blocks):
+            items.extend(self._blocks[block])
+        return items
+    
+    def loaded_snapshot(self):
+        """Loaded documents together with the generation they belong to
+        
+        The generation changes whenever a block is loaded, updated or dropped,
+        so callers can keep structures built from the documents until it does.
+        
+        Returns:
+            tuple: (generation, list of documents in order)
+        """
+        with self._lock:
+            items = []
+            for block in sorted(self._blocks):
+                items.extend(self._blocks[block])
+            return self._generation, items
+    
+    @property
+    def generation(self):
+        """Generation of the loaded documents, see loaded_snapshot()"""
+        return self._generation
+    
+    def load_all(self, on_progress=None):
+        """Load every missing block (blocking, call from a worker thread)
+        
+        Args:
+            on_progress (callable, optional): on_progress(loaded, total) after each block
+        
+        Returns:
+            list: All documents in order
+        """
+        # Blocks dropped by apply_changes() or reset() meanwhile are loaded again
+        while self._running and not self.is_fully_loaded():
+            blocks = (self._total + self.page_size - 1) // self.page_size
+            block = next((block for block in range(blocks) if block not in self._blocks), None)
+            if block is None:
+                break
+            self._fetch_block(block, self._epoch)
+            if on_progress:
+                on_progress(min(len(self._blocks) * self.page_size, self._total), self._total)
+        return self.loaded_items()
+    
+    def search(self, text):
+        """Candidate documents for a fuzzy search over the whole collection (blocking)
+        
+        Args:
+            text (str): Search text
+        
+        Returns:
+            list: Candidates narrowed on the server, not ranked
+        """
+        docs = self.db_manager.search_candidates(self.database, self.collection, text,
+                                                 query=self.query, projection=self.projection)
+        if self.transform:
+            docs = self.transform(docs)
+        return docs
+    
+    def has_search_index(self):
+        """Whether the collection has a text index for search
+        
+        Returns:
+            bool: Whether a text index exists
+        """
+        return self.db_manager.has_text_index(self.database, self.collection)
+    
+    def _fetch_block(self, block, epoch, prefetch_next=False):
+        """Fetch one block from the server (worker thread)"""
+        if epoch != self._epoch:
+            return
+        
+        # Continue from the previous block when it is loaded, skip otherwise
+        token = self._tokens.get(block - 1)
+        docs, next_token = self.db_manager.get_documents_page(
+            self.database, self.collection, limit=self.page_size, query=self.query,
+            sort_field=self.sort_field, reverse=self.reverse, token=token,
+            skip=0 if token else block * self.page_size, projection=self.projection
+        )
+        if self.transform:
+            docs = self.transform(docs)
+        
+        with self._lock:
+            if epoch != self._epoch:
+                return
+            self._blocks[block] = docs
+            self._generation += 1
+            start = block * self.page_size
+            for offset, doc in enumerate(docs):
+                self._positions[str(doc.get("_id"))] = start + offset
+            if next_token:
+                self._tokens[block] = next_token
+            self._requested.discard(block)
+        
+        if self.on_page_loaded:
+            self.on_page_loaded(block)
+        
+        # Prefetch the following block (prefetched blocks do not chain further)
+        if prefetch_next:
+            self.request_block(block + 1, prefetch_next=False)
+    
+    def _worker(self):
+        """Background fetch loop"""
+        while self._running:
+            task = self._queue.get()
+            if task is None:
+                break
+            block, epoch, prefetch_next = task
+            try:
+                if block == "count":
+                    total = self.db_manager.count_documents(self.database, self.collection, self.query)
+                    if epoch == self._epoch:
+                        self._total = total
+                else:
+                    self._fetch_block(block, epoch, prefetch_next)
+            except Exception as e:
+                print(f"Failed to load block {block} of {self.database}.{self.collection}: {str(e)}")
+                traceback.print_exc()
+                with self._lock:
+                    self._requested.discard(block)
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+MongoDB Visual Tool - Keyset Pagination Helpers
+
+A page continues after the (sort value, _id) of the last document of the
+previous page instead of skipping over it. The position is carried in an
+opaque token so callers (and the query cache) never see skip offsets.
+"""
+import base64
+import datetime
+from decimal import Decimal
+
+from bson import json_util
+from bson.binary import Binary
+from bson.decimal128 import Decimal128
+from bson.int64 import Int64
+from bson.objectid import ObjectId
+from bson.regex import Regex
+from bson.timestamp import Timestamp
+
+# MongoDB compares values of different types by type bracket, in this order.
+# $gt/$lt only match values inside the bracket of the operand, so a keyset
+# filter adds the brackets that sort after it explicitly. Missing fields sort
+# like null.
+TYPE_BRACKETS = [
+    ["null"],
+    ["int", "long", "double", "decimal"],
+    ["string", "symbol"],
+    ["object"],
+    ["array"],
+    ["binData"],
+    ["objectId"],
+    ["bool"],
+    ["date"],
+    ["timestamp"],
+    ["regex"],
+]
+
+# Characters whose collation order (locale en, strength 2) matches their lower-case code points
+LOCAL_SORT_CHARS = frozenset(" -.0123456789abcdefghijklmnopqrstuvwxyz")
+
+
+def type_bracket(value):
+    """Index of the MongoDB comparison bracket of a value
+    
+    Args:
+        value: BSON value
+    
+    Returns:
+        int: Index into TYPE_BRACKETS, None for unsupported types
+    """
+    if value is None:
+        return 0
+    if isinstance(value, bool):  # bool is an int subclass, check it first
+        return 7
+    if isinstance(value, (int, float, Int64, Decimal128, Decimal)):
+        return 1
+    if isinstance(value, str):
+        return 2
+    if isinstance(value, dict):
+        return 3
+    if isinstance(value, list):
+        return 4
+    if isinstance(value, (bytes, Binary)):
+        return 5
+    if isinstance(value, ObjectId):
+        return 6
+    if isinstance(value, datetime.datetime):
+        return 8
+    if isinstance(value, Timestamp):
+        return 9
+    if isinstance(value, Regex):
+        return 10
+    return None
+
+
+def sort_spec(sort_field="_id", reverse=False):
+    """Sort specification for a keyset page, _id breaks ties
+    
+    Args:
+        sort_field (str): Sort field
+        reverse (bool): Descending order
+    
+    Returns:
+        list: (field, direction) pairs
+    """
+    direction = -1 if reverse else 1
+    if sort_field == "_id":
+        return [("_id", direction)]
+    return [(sort_field, direction), ("_id", direction)]
+
+
+def position_after(sort_field, doc):
+    """Keyset position of a document
+    
+    Args:
+        sort_field (str): Sort field
+        doc (dict): Document
+    
+    Returns:
+        tuple: (sort value, _id), None if the value cannot be used in a range filter
+    """
+    value = doc.get(sort_field) if sort_field != "_id" else None
+    if type_bracket(value) in (None, 4):
+        # Arrays compare by their smallest/largest element, no range filter for them
+        return None
+    return value, doc.get("_id")
+
+
+def _local_value(value, collated):
+    """Comparable form of a sort value, see local_sort_key()"""
+    bracket = type_bracket(value)
+    if bracket == 0:
+        return (0, 0)
+    if bracket == 1 and isinstance(value, (int, float)):
+        return (1, value)
+    if bracket == 2 and not collated:
+        return (2, value)
+    if bracket == 2:
+        lowered = value.lower()
+        if all(char in LOCAL_SORT_CHARS for char in lowered):
+            return (2, lowered)
+        return None
+    if bracket in (6, 7, 8):
+        return (bracket, value)
+    return None
+
+
+def local_sort_key(sort_field, doc):
+    """Key ordering documents like the server sort of a keyset page
+    
+    Only computed when Python can reproduce the server order exactly: null,
+    int/float, ObjectId, bool and date values, and strings; other sort
+    fields than _id use SORT_COLLATION, so their strings must be made of
+    ASCII letters, digits, space, '-' and '.' (which it orders like their
+    lower-case code points). Keys of different documents may still
+    fail to compare (e.g. naive and aware dates), callers treat TypeError
+    as unknown.
+    
+    Args:
+        sort_field (str): Sort field
+        doc (dict): Document
+    
+    Returns:
+        tuple: Comparable key, None if the order cannot be computed locally
+    """
+    collated = sort_field != "_id"
+    doc_id = _local_value(doc.get("_id"), collated)
+    if doc_id is None:
+        return None
+    if not collated:
+        return doc_id
+    value = _local_value(doc.get(sort_field), collated)
+    return None if value is None else (value, doc_id)
+
+
+def encode_token(sort_field, reverse, after=None, offset=0):
+    """Build a continuation token
+    
+    Args:
+        sort_field (str): Sort field of the page
+        reverse (bool): Descending order
+        after (tuple, optional): Keyset position (sort value, _id) the next page starts after
+        offset (int): Documents to skip after that position (used when a position cannot be expressed)
+    
+    Returns:
+        str: Opaque token
+    """
+    state = {"f": sort_field, "r": bool(reverse), "k": offset}
+    if after is not None:
+        state["v"], state["id"] = after
+    return base64.urlsafe_b64encode(json_util.dumps(state).encode("utf-8")).decode("ascii")
+
+
+def decode_token(token, sort_field, reverse):
+    """Read a continuation token
+    
+    Args:
+        token (str): Token returned by encode_token
+        sort_field (str): Sort field of the requested page
+        reverse (bool): Descending order of the requested page
+    
+    Returns:
+        tuple: (keyset position or None, offset)
+    
+    Raises:
+        ValueError: If the token is malformed or belongs to another sort order
+    """
+    try:
+        state = json_util.loads(base64.urlsafe_b64decode(token.encode("ascii")).decode("utf-8"))
+    except Exception as e:
+        raise ValueError(f"Invalid page token: {str(e)}")
+    if state.get("f") != sort_field or state.get("r") != bool(reverse):
+        raise ValueError("Page token belongs to a different sort order")
+    after = (state.get("v"), state["id"]) if "id" in state else None
+    return after, state.get("k", 0)
+
+
+def keyset_filter(sort_field, reverse, last_value, last_id):
+    """Filter selecting the documents after (last_value, last_id) in sort order
+    
+    Args:
+        sort_field (str): Sort field
+        reverse (bool): Descending order
+        last_value: Sort value of the last document (ignored for _id)
+        last_id: _id of the last document
+    
+    Returns:
+        dict: Query filter
+    """
+    operator = "$lt" if reverse else "$gt"
+    if sort_field == "_id":
+        return {"_id": {operator: last_id}}
+    
+    clauses = []
+    bracket = type_bracket(last_value)
+    if last_value is None:
+        # {field: None} also matches documents without the field
+        clauses.append({sort_field: None, "_id": {operator: last_id}})
+    else:
+        clauses.append({sort_field: {operator: last_value}})
+        clauses.append({sort_field: last_value, "_id": {operator: last_id}})
+    
+    # Values of other types that sort after the last one
+    if reverse:
+        following = range(bracket - 1, -1, -1)
+    else:
+        following = range(bracket + 1, len(TYPE_BRACKETS))
+    types = []
+    for index in following:
+        if index == 0:
+            clauses.append({sort_field: None})
+        else:
+            types.extend(TYPE_BRACKETS[index])
+    if types:
+        clauses.append({sort_field: {"$type": types}})
+    
+    return {"$or": clauses} if len(clauses) > 1 else clauses[0]
@@ -2,4 +2,5 @@
 """MongoDB Visual Tool UI Module"""
 
 from .paginated_grid import PaginatedGrid
-from .image_card import ImageCard 
\ No newline at end of file
+from .image_card import ImageCard
+from .target_picker import TargetDocPicker 
\ No newline at end of file
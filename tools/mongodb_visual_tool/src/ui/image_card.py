@@ -5,7 +5,9 @@ Image Card Component - For displaying images and metadata from documents
 import os
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageTk
+from PIL import ImageTk
+
+from ..utils.thumbnailer import make_thumbnail
 
 # Card default dimensions
 CARD_WIDTH = 220
@@ -34,6 +36,7 @@ class ImageCard(ttk.Frame):
         self.image = None
         self.is_selected = False  # Selection state flag
         self.on_select_callback = on_select_callback
+        self.item_index = None  # Position in the grid's item list when recycled by a virtualized grid
         
         # Default background color
         default_bg = "#f0f0f0"
@@ -53,9 +56,6 @@ class ImageCard(ttk.Frame):
                                  padx=0, pady=0)
         self.main_frame.pack(fill=tk.BOTH, expand=True, padx=0, pady=0)
         
-        # Extract metadata
-        self._extract_metadata()
-        
         # Create image display area
         self.image_frame = tk.Frame(self.main_frame, width=width-10, height=height-10, background=default_bg)
         self.image_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -82,30 +82,22 @@ class ImageCard(ttk.Frame):
         self.select_checkbox.pack(side=tk.LEFT, padx=(8,4), pady=2)
         
         # Display filename or title
-        name = self.metadata.get('filename', "Untitled")
-        self.name_label = ttk.Label(self.meta_frame, text=name, wraplength=width-40)
+        self.name_label = ttk.Label(self.meta_frame, text="", wraplength=width-40)
         self.name_label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=8, pady=2)
         
-        # Add warning mark if file doesn't exist
-        if self.doc.get('_file_missing'):
-            warning_label = ttk.Label(self.meta_frame, text="⚠️", foreground="red", 
-                                    font=("Arial", 12, "bold"))
-            warning_label.pack(side=tk.RIGHT, padx=8, pady=2)
+        # Warning mark if file doesn't exist (packed on demand)
+        self.warning_label = ttk.Label(self.meta_frame, text="⚠️", foreground="red", 
+                                     font=("Arial", 12, "bold"))
         
-        # Add size information (if available)
-        info_frame = tk.Frame(self.main_frame, background=default_bg)
-        info_frame.pack(fill=tk.X, padx=5, pady=(0,4))
+        # Size and art movement information (packed on demand)
+        self.info_frame = tk.Frame(self.main_frame, background=default_bg)
+        self.info_frame.pack(fill=tk.X, padx=5, pady=(0,4))
+        self.size_label = ttk.Label(self.info_frame)
+        self.movement_label = ttk.Label(self.info_frame)
         
-        if 'size' in self.metadata:
-            size_kb = int(self.metadata['size'] / 1024) if isinstance(self.metadata['size'], (int, float)) else '?'
-            size_text = f"Size: {size_kb} KB"
-            size_label = ttk.Label(info_frame, text=size_text)
-            size_label.pack(side=tk.LEFT, padx=(8, 10), pady=2)
-            
-        # Add art movement (if available)
-        if 'artMovement' in self.metadata:
-            movement_label = ttk.Label(info_frame, text=f"Style: {self.metadata['artMovement']}")
-            movement_label.pack(side=tk.LEFT, padx=8, pady=2)
+        # Extract metadata and fill labels
+        self._extract_metadata()
+        self._update_labels()
         
         # Bind left click event
         self.bind("<Button-1>", self._on_click)
@@ -114,7 +106,43 @@ class ImageCard(ttk.Frame):
         self.main_frame.bind("<Button-1>", self._on_click)
         self.image_frame.bind("<Button-1>", self._on_click)
         self.meta_frame.bind("<Button-1>", self._on_click)
-        info_frame.bind("<Button-1>", self._on_click)
+        self.info_frame.bind("<Button-1>", self._on_click)
+    
+    def _update_labels(self):
+        """Fill name, warning and info labels from the current document"""
+        self.name_label.configure(text=self.metadata.get('filename', "Untitled"))
+        
+        # Add warning mark if file doesn't exist
+        if self.doc.get('_file_missing'):
+            self.warning_label.pack(side=tk.RIGHT, padx=8, pady=2)
+        else:
+            self.warning_label.pack_forget()
+        
+        # Add size information and art movement (if available)
+        self.size_label.pack_forget()
+        self.movement_label.pack_forget()
+        
+        if 'size' in self.metadata:
+            size_kb = int(self.metadata['size'] / 1024) if isinstance(self.metadata['size'], (int, float)) else '?'
+            self.size_label.configure(text=f"Size: {size_kb} KB")
+            self.size_label.pack(side=tk.LEFT, padx=(8, 10), pady=2)
+            
+        if 'artMovement' in self.metadata:
+            self.movement_label.configure(text=f"Style: {self.metadata['artMovement']}")
+            self.movement_label.pack(side=tk.LEFT, padx=8, pady=2)
+    
+    def bind_doc(self, doc):
+        """Rebind the card to another document (used when recycling cards)
+        
+        Args:
+            doc (dict): Document data
+        """
+        self.doc = doc or {}
+        self.metadata = {}
+        self.image_path = None
+        self.show_placeholder()
+        self._extract_metadata()
+        self._update_labels()
     
     def _extract_metadata(self):
         """Extract metadata from document"""
@@ -131,7 +159,6 @@ class ImageCard(ttk.Frame):
                 path = os.path.join(project_root, path)
             self.image_path = path
             self.metadata['filepath'] = path
-            print(f"Found filePath: {self.image_path} (Absolute: {os.path.isabs(self.image_path)})")
         elif 'imageUrl' in self.doc:
             path = self.doc['imageUrl']
             # 处理相对路径
@@ -140,9 +167,6 @@ class ImageCard(ttk.Frame):
                 path = os.path.join(project_root, path)
             self.image_path = path
             self.metadata['imageurl'] = path
-            print(f"Found imageUrl: {self.image_path} (Absolute: {os.path.isabs(self.image_path)})")
-        else:
-            print(f"No image path found in document: {self.doc.get('_id')}")
                 
         # Extract other metadata
         if 'filename' in self.doc:
@@ -250,83 +274,115 @@ class ImageCard(ttk.Frame):
             self.select_var.set(selected)
             self._on_checkbox_toggle(None)
     
-    def load_image(self):
-        """Load and display image"""
-        try:
-            if not self.image_path:
-                print(f"No image path available for document: {self.doc.get('_id')}")
-                self.image_label.configure(text="No image path")
-                return False
-            
-            # 尝试不同的路径组合
-            paths_to_try = [
-                self.image_path,  # 原始路径
-                os.path.abspath(self.image_path),  # 绝对路径
-            ]
-            
-            # 如果是相对路径，尝试在不同的基准目录下查找
-            if not os.path.isabs(self.image_path):
-                project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-                paths_to_try.extend([
-                    os.path.join(project_root, self.image_path),  # 项目根目录
-                    os.path.join(project_root, 'public', self.image_path),  # public目录
-                    os.path.join(project_root, 'data', self.image_path),  # data目录
-                ])
-            
-            # 尝试所有可能的路径
-            image_found = False
-            for path in paths_to_try:
-                print(f"Trying path: {path}")
-                if os.path.exists(path):
-                    print(f"Found image at: {path}")
-                    self.image_path = path
-                    image_found = True
-                    break
-            
-            if not image_found:
-                print(f"Image not found in any of these locations: {paths_to_try}")
-                self.image_label.configure(text="Image not found")
-                return False
-            
-            print(f"Loading image from: {self.image_path}")
-            
-            # Open and resize image
-            img = Image.open(self.image_path)
-            img_width, img_height = img.size
-            print(f"Original image size: {img_width}x{img_height}")
-            
-            # Calculate aspect ratio
-            aspect_ratio = img_width / img_height
-            
-            # Calculate new dimensions to fit in the frame while preserving aspect ratio
-            frame_width = self.width - 20
-            frame_height = self.height - 20
+    @staticmethod
+    def resolve_image_path(image_path):
+        """Find the image file on disk
+        
+        Args:
+            image_path (str): Image path from the document
             
-            if img_width > frame_width or img_height > frame_height:
-                if aspect_ratio > 1:  # Wider than tall
-                    new_width = frame_width
-                    new_height = int(frame_width / aspect_ratio)
-                else:  # Taller than wide
-                    new_height = frame_height
-                    new_width = int(frame_height * aspect_ratio)
-                    
-                print(f"Resizing image to: {new_width}x{new_height}")
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        Returns:
+            str: Existing path, or None if not found
+        """
+        if not image_path:
+            return None
+        
+        # 尝试不同的路径组合
+        paths_to_try = [
+            image_path,  # 原始路径
+            os.path.abspath(image_path),  # 绝对路径
+        ]
+        
+        # 如果是相对路径，尝试在不同的基准目录下查找
+        if not os.path.isabs(image_path):
+            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+            paths_to_try.extend([
+                os.path.join(project_root, image_path),  # 项目根目录
+                os.path.join(project_root, 'public', image_path),  # public目录
+                os.path.join(project_root, 'data', image_path),  # data目录
+            ])
+        
+        # 尝试所有可能的路径
+        for path in paths_to_try:
+            if os.path.exists(path):
+                return path
+        return None
+    
+    @staticmethod
+    def load_thumbnail(image_path, max_width, max_height):
+        """Open, decode and downscale an image to fit the given box
+        
+        Does not touch any Tk object, so it is safe to call from a worker thread.
+        
+        Args:
+            image_path (str): Image path from the document
+            max_width (int): Maximum thumbnail width
+            max_height (int): Maximum thumbnail height
             
-            # Convert to Tkinter format
-            self.image = ImageTk.PhotoImage(img)
+        Returns:
+            PIL.Image.Image: Decoded thumbnail
             
-            # Update image label
-            self.image_label.configure(image=self.image, text="")
-            print(f"Successfully loaded image for document: {self.doc.get('_id')}")
+        Raises:
+            ValueError: If there is no image path
+            FileNotFoundError: If the image cannot be found
+        """
+        if not image_path:
+            raise ValueError("No image path")
+        
+        path = ImageCard.resolve_image_path(image_path)
+        if not path:
+            raise FileNotFoundError("Image not found")
+        
+        # Decode at reduced scale where the format allows it, then resize
+        return make_thumbnail(path, max_width, max_height)
+    
+    def set_thumbnail(self, img):
+        """Display a decoded thumbnail (Tk thread only)
+        
+        Args:
+            img (PIL.Image.Image): Thumbnail produced by load_thumbnail
+        """
+        # Convert to Tkinter format
+        self.image = ImageTk.PhotoImage(img)
+        
+        # Update image label
+        self.image_label.configure(image=self.image, text="")
+    
+    def show_placeholder(self, text="Loading..."):
+        """Show a text placeholder instead of the image
+        
+        Args:
+            text (str): Placeholder text
+        """
+        self.image = None
+        self.image_label.configure(image="", text=text)
+    
+    def show_load_error(self, error):
+        """Show why the image could not be loaded
+        
+        Args:
+            error (Exception): Error raised by load_thumbnail
+        """
+        if isinstance(error, (ValueError, FileNotFoundError)):
+            self.show_placeholder(str(error))
+        else:
+            self.show_placeholder(f"Error: {str(error)}")
+    
+    def load_image(self):
+        """Load and display image synchronously
+        
+        Returns:
+            bool: Whether the image was loaded
+        """
+        try:
+            img = self.load_thumbnail(self.image_path, self.width - 20, self.height - 20)
+            self.set_thumbnail(img)
             return True
             
         except Exception as e:
             print(f"Error loading image for document {self.doc.get('_id')}: {str(e)}")
-            import traceback
-            traceback.print_exc()
             # Show error message
-            self.image_label.configure(text=f"Error: {str(e)}")
+            self.show_load_error(e)
             return False
     
     def setup_context_menu(self, callback):
@@ -368,7 +424,10 @@ class ImageCard(ttk.Frame):
     
     def _get_delete_docs(self):
         # 如果有多选，批量删除，否则只删自己
-        grid = self.master.master.master  # cards_frame->canvas->grid_frame->PaginatedGrid
-        if hasattr(grid, 'selected_docs') and len(grid.selected_docs) > 0:
+        # 卡片可能位于cards_frame或直接位于canvas中，向上查找PaginatedGrid
+        grid = self.master
+        while grid is not None and not hasattr(grid, 'selected_docs'):
+            grid = grid.master
+        if grid is not None and len(grid.selected_docs) > 0:
             return grid.selected_docs
         return self.doc 
\ No newline at end of file
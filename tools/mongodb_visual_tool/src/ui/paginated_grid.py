@@ -6,24 +6,35 @@ import tkinter as tk
 from tkinter import ttk, Menu, messagebox
 import math
 import os
+import threading
 from PIL import Image, ImageTk
-from rapidfuzz import fuzz
 import json
 
-from ..config.settings import DEFAULT_PAGE_SIZE
-from .image_card import ImageCard
+from ..config.settings import (DEFAULT_PAGE_SIZE, DEFAULT_GRID_MODE, VIRTUAL_GRID_OVERSCAN_ROWS,
+                               GRID_PROJECTION_FIELDS)
+from .image_card import ImageCard, CARD_HEIGHT
 from ..utils.image_loader import ImageLoader
+from ..utils.search_index import SearchIndex
+from ..utils.sort_index import SortIndex
+from ..utils.document_table import DocumentTable
+from ..utils.search_scheduler import SearchScheduler
+
+# Virtualized grid cell geometry (card + grid padding)
+CELL_PADDING = 5
+CELL_HEIGHT = CARD_HEIGHT + 80 + 2 * CELL_PADDING
+MIN_CELL_WIDTH = 240  # Same minimum as automatic column adjustment
 
 class PaginatedGrid(ttk.Frame):
     """Paginated grid component for displaying image cards"""
     
-    def __init__(self, parent, page_size=DEFAULT_PAGE_SIZE, on_show_details=None):
+    def __init__(self, parent, page_size=DEFAULT_PAGE_SIZE, on_show_details=None, thumbnail_cache=None):
         """Initialize the paginated grid
         
         Args:
             parent: Parent component
             page_size (int, optional): Number of items to display per page
             on_show_details (callable, optional): Callback function for showing document details
+            thumbnail_cache (ThumbnailCache, optional): Persistent thumbnail store
         """
         super().__init__(parent)
         
@@ -33,14 +44,23 @@ class PaginatedGrid(ttk.Frame):
         self.columns = 3     # Initial column count, will be adjusted automatically
         self.current_page = 1
         self.total_pages = 1
-        self.all_items = []  # All items
-        self.filtered_items = []  # Filtered items
+        self.all_items = DocumentTable()  # All items
+        self.filtered_items = []  # Filtered items, a DocumentView of all_items for in-memory tables
+        self.data_source = None  # PagedDocumentSource backing all_items, None for in-memory lists
+        self._search_index = SearchIndex()  # Search corpus of all_items, rebuilt when the items change
+        self._sort_index = SortIndex(self.all_items)  # Cached sort orders of all_items, rebuilt with the search corpus
+        self._source_total = 0
+        self._source_corpus = None  # (source, generation, DocumentTable, SearchIndex, SortIndex) of the loaded documents of data_source
+        self._result_sort_index = None  # SortIndex of the table behind the displayed search results of data_source
+        self._corpus_lock = threading.Lock()
+        self.on_search_index_missing = None  # Called with (database, collection) after searching without a text index
         self.displayed_cards = []  # Currently displayed cards
         self.selected_docs = []  # Selected documents
         self.context_menu_callback = None
         self.current_view = "grid"  # Default view mode (grid or list)
         self.on_show_details = on_show_details
         self.current_schema = None  # 添加：当前集合的schema
+        self.thumbnail_cache = thumbnail_cache
         
         # Control key states
         self.ctrl_pressed = False
@@ -65,11 +85,22 @@ class PaginatedGrid(ttk.Frame):
         # Selection mode
         self.selection_mode = "multi"  # multi/single selection mode
         
+        # Virtualized grid state
+        self.grid_mode = DEFAULT_GRID_MODE  # virtual/paged grid rendering
+        self._card_pool = []  # Recycled cards in virtual mode
+        self._card_windows = {}  # Card -> canvas window id
+        self._virtual_anchor_index = 0  # Index of the first visible item
+        self._virtual_selection = {}  # str(_id) -> doc, survives card recycling
+        self._viewport_job = None
+        
         # Create UI
         self._create_ui()
         
         # Create image loader
-        self.image_loader = ImageLoader(self._on_image_loaded, num_workers=4)
+        self.image_loader = ImageLoader(self._on_image_loaded, num_workers=4, load_func=self._load_thumbnail)
+        
+        # Live search runs debounced in a worker thread
+        self._search_scheduler = SearchScheduler(self, self._prepare_search, self._apply_search_result)
         
         # Bind keyboard shortcuts
         self._bind_keyboard_shortcuts()
@@ -108,7 +139,9 @@ class PaginatedGrid(ttk.Frame):
     def _select_all_shortcut(self, event):
         """Handle Ctrl+A shortcut"""
         if self.selection_mode == "multi":
-            if self.current_view == "grid":
+            if self._is_virtual_grid():
+                self._set_virtual_selection(self._loaded_filtered_items())
+            elif self.current_view == "grid":
                 for card in self.displayed_cards:
                     card.set_selected(True)
             else:
@@ -121,7 +154,9 @@ class PaginatedGrid(ttk.Frame):
     def _deselect_all_shortcut(self, event):
         """Handle Ctrl+D shortcut"""
         if self.selection_mode == "multi":
-            if self.current_view == "grid":
+            if self._is_virtual_grid():
+                self._set_virtual_selection([])
+            elif self.current_view == "grid":
                 for card in self.displayed_cards:
                     card.set_selected(False)
             else:
@@ -134,7 +169,12 @@ class PaginatedGrid(ttk.Frame):
     def _invert_selection_shortcut(self, event):
         """Handle Ctrl+I shortcut"""
         if self.selection_mode == "multi":
-            if self.current_view == "grid":
+            if self._is_virtual_grid():
+                for card in self.displayed_cards:
+                    self._remember_card_selection(card)
+                self._set_virtual_selection([doc for doc in self._loaded_filtered_items()
+                                             if self._doc_key(doc) not in self._virtual_selection])
+            elif self.current_view == "grid":
                 for card in self.displayed_cards:
                     card.set_selected(not card.is_selected)
             else:
@@ -258,7 +298,7 @@ class PaginatedGrid(ttk.Frame):
         # 使用canvas支持滚动
         self.canvas = tk.Canvas(self.grid_frame, borderwidth=0, highlightthickness=0)
         self.scrollbar = ttk.Scrollbar(self.grid_frame, orient=tk.VERTICAL, command=self.canvas.yview)
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.configure(yscrollcommand=self._on_canvas_yscroll)
         
         # 设置最小尺寸
         self.canvas.configure(width=400, height=300)
@@ -351,6 +391,11 @@ class PaginatedGrid(ttk.Frame):
         # 新增：选择模式切换按钮
         self.select_mode_btn = ttk.Button(self.toolbar, text="Switch to Single Selection", command=self._toggle_selection_mode)
         self.select_mode_btn.pack(side=tk.LEFT, padx=5)
+        
+        # 网格渲染模式切换按钮（连续滚动/分页）
+        grid_mode_text = "Switch to Paged Grid" if self.grid_mode == "virtual" else "Switch to Continuous Scroll"
+        self.grid_mode_btn = ttk.Button(self.toolbar, text=grid_mode_text, command=self._toggle_grid_mode)
+        self.grid_mode_btn.pack(side=tk.LEFT, padx=5)
     
     def _switch_view_mode(self):
         """Switch view mode (grid/list)"""
@@ -381,30 +426,48 @@ class PaginatedGrid(ttk.Frame):
             callback (callable): Callback function
         """
         self.context_menu_callback = callback
+        for card in self._card_pool:
+            card.setup_context_menu(callback)
     
-    def _on_image_loaded(self, card, success):
-        """Image loaded callback
+    def _load_thumbnail(self, image_path, max_width, max_height):
+        """Produce a card thumbnail, served from the thumbnail cache when possible
+        
+        Runs in the image loader worker threads.
+        """
+        path = ImageCard.resolve_image_path(image_path)
+        if self.thumbnail_cache is None or not path:
+            return ImageCard.load_thumbnail(image_path, max_width, max_height)
+        return self.thumbnail_cache.get_thumbnail(path, max_width, max_height, ImageCard.load_thumbnail)
+    
+    def _on_image_loaded(self, card, image, error):
+        """Image loaded callback, runs on the Tk thread
         
         Args:
             card: Image card object
-            success (bool): Whether loading was successful
+            image (PIL.Image.Image): Decoded thumbnail, None if loading failed
+            error (Exception): Loading error, None on success
         """
         if not card or not card.winfo_exists():
             return
         
         # 更新卡片状态
-        if success:
-            card.update_status("Ready")
+        if error is None:
+            card.set_thumbnail(image)
         else:
-            card.update_status("Failed to load")
-        
-        # 刷新UI
-        self.update()
+            print(f"Error loading image for document {card.doc.get('_id')}: {str(error)}")
+            card.show_load_error(error)
     
     def refresh_grid(self):
         """Refresh grid view"""
+        if self.grid_mode == "virtual":
+            self._refresh_virtual_grid()
+            return
         try:
-            # 清除现有卡片
+            # 隐藏虚拟模式的卡片池
+            self._hide_card_pool()
+            
+            # 取消未完成的图片加载并清除现有卡片
+            self.image_loader.cancel_all()
             for card in self.displayed_cards:
                 if card.winfo_exists():
                     card.destroy()
@@ -436,6 +499,19 @@ class PaginatedGrid(ttk.Frame):
             col = 0
             for item in current_page_items:
                 try:
+                    # 尚未从服务器加载的文档显示占位卡片，页面加载后刷新
+                    if item is None:
+                        card = ImageCard(self.cards_frame, on_select_callback=self._on_card_selected)
+                        card.show_placeholder()
+                        card.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
+                        self.displayed_cards.append(card)
+                        col += 1
+                        if col >= self.columns:
+                            col = 0
+                            row += 1
+                            self.cards_frame.grid_rowconfigure(row, weight=1)
+                        continue
+                    
                     # 检查文档是否包含必要的字段
                     if not item:
                         print("Warning: Empty document encountered")
@@ -455,8 +531,8 @@ class PaginatedGrid(ttk.Frame):
                     # 添加到显示列表
                     self.displayed_cards.append(card)
                     
-                    # 加载图片
-                    card.load_image()
+                    # 在后台线程加载图片
+                    self.image_loader.add_task(card)
                     
                     # 设置右键菜单
                     if self.context_menu_callback:
@@ -523,6 +599,9 @@ class PaginatedGrid(ttk.Frame):
         columns = self.list_view["columns"]
         
         for item in current_page_items:
+            if item is None:
+                # 尚未加载，页面加载后刷新
+                continue
             item_id = str(item.get('_id'))
             # 构建每个字段的值
             values = []
@@ -555,6 +634,9 @@ class PaginatedGrid(ttk.Frame):
         self._update_status_bar()
     
     def _on_card_selected(self, card, is_selected, event=None):
+        if self._is_virtual_grid():
+            self._on_virtual_card_selected(card, event)
+            return
         try:
             idx = self.displayed_cards.index(card)
             if self.selection_mode == "single":
@@ -592,7 +674,12 @@ class PaginatedGrid(ttk.Frame):
     
     def _update_selection_ui(self):
         """Update selection state related UI（避免多余重绘）"""
-        self.selected_docs = [card.doc for card in self.displayed_cards if card.is_selected]
+        if self._is_virtual_grid():
+            for card in self.displayed_cards:
+                self._remember_card_selection(card)
+            self.selected_docs = list(self._virtual_selection.values())
+        else:
+            self.selected_docs = [card.doc for card in self.displayed_cards if card.is_selected and card.doc]
         has_selection = len(self.selected_docs) > 0
         for i in range(1, len(self.operations_frame.winfo_children())):
             self.operations_frame.winfo_children()[i].configure(state="normal" if has_selection else "disabled")
@@ -601,7 +688,15 @@ class PaginatedGrid(ttk.Frame):
     
     def _toggle_select_all(self):
         """全选/全不选当前页"""
-        if self.current_view == "grid":
+        if self._is_virtual_grid():
+            # 连续滚动模式下作用于全部结果
+            for card in self.displayed_cards:
+                self._remember_card_selection(card)
+            if self._all_virtual_selected():
+                self._set_virtual_selection([])
+            else:
+                self._set_virtual_selection(self._loaded_filtered_items())
+        elif self.current_view == "grid":
             # 网格视图模式
             all_selected = all(card.is_selected for card in self.displayed_cards) and len(self.displayed_cards) > 0
             # 暂时禁用卡片的回调，批量设置后再统一刷新
@@ -651,6 +746,9 @@ class PaginatedGrid(ttk.Frame):
     
     def _on_frame_configure(self, event):
         """处理内部frame大小变化"""
+        if self._is_virtual_grid():
+            # 虚拟模式的滚动区域由行数计算，不依赖内部frame
+            return
         # 更新canvas的滚动区域
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
         # 自动调整列数
@@ -660,6 +758,14 @@ class PaginatedGrid(ttk.Frame):
         """处理canvas大小变化"""
         # 更新内部frame的宽度以匹配canvas
         self.canvas.itemconfig(self.canvas_window, width=event.width)
+        if self._is_virtual_grid():
+            new_columns = max(1, event.width // MIN_CELL_WIDTH)
+            if new_columns != self.columns:
+                self.columns = new_columns
+                self.refresh_grid()
+            else:
+                self._schedule_viewport_update()
+            return
         # 重新计算滚动区域
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
     
@@ -692,6 +798,8 @@ class PaginatedGrid(ttk.Frame):
         
         # If Ctrl or Shift keys are not pressed, cancel previous selection
         if not (self.ctrl_pressed or self.shift_pressed):
+            if self._is_virtual_grid():
+                self._set_virtual_selection([])
             for card in self.displayed_cards:
                 card.set_selected(False)
     
@@ -806,6 +914,7 @@ class PaginatedGrid(ttk.Frame):
                 if new_size != self.page_size and new_size > 0:
                     self.page_size = new_size
             self.current_page = 1
+            self._virtual_anchor_index = 0
             if self.current_view == "grid":
                 self.refresh_grid()
             else:
@@ -814,32 +923,138 @@ class PaginatedGrid(ttk.Frame):
             self.page_size_var.set(str(self.page_size))
     
     def _on_search(self, event=None):
-        """Handle search event"""
+        """Handle search event (Enter, search button, history): search without debounce"""
         query = self.search_var.get().strip()
         if query:
-            # Add search term to history
-            if query not in self.search_history:
-                self.search_history.append(query)
-                # Limit history size
-                if len(self.search_history) > 10:
-                    self.search_history.pop(0)
-            
-            # Filter items
-            self.filtered_items = self._filter_items(query)
-            self.current_page = 1  # Reset to first page
-            
-            # Refresh view
-            if self.current_view == "grid":
-                self.refresh_grid()
-            else:
-                self.refresh_list()
+            self._search_scheduler.submit(query, delay_ms=0)
+    
+    def _prepare_search(self, query):
+        """Capture the items to search on the Tk thread
+        
+        Args:
+            query (str): Search text
+        
+        Returns:
+            callable: job(cancelled) run by the search worker, returns the filtered items
+        """
+        self.status_var.set(f"Searching {len(self.all_items)} documents...")
+        source = self.data_source
+        if source is None:
+            index = self._search_index
+            table = self.all_items
+            return lambda cancelled: self._search_view(table, query, cancelled, index)
+        
+        if source.is_fully_loaded():
+            def search_loaded(cancelled):
+                _, _, table, index, _ = self._loaded_corpus(source)
+                return self._search_view(table, query, cancelled, index)
+            return search_loaded
+        
+        def job(cancelled):
+            # 分页数据源未完全加载时在服务器端筛选候选文档，再与已加载文档一起排序
+            candidates = source.search(query)
+            if cancelled():
+                return None
+            if not source.has_search_index() and self.on_search_index_missing:
+                self.after(0, self.on_search_index_missing, source.database, source.collection)
+            
+            # 已加载文档使用保留的搜索索引，只为未加载的候选文档建立索引
+            _, _, table, index, _ = self._loaded_corpus(source)
+            scores = index.search_scores(query, cancelled)
+            if scores is None:
+                return None
+            extra = SearchIndex(doc for doc in candidates if table.row_of(self._doc_key(doc)) is None)
+            extra_scores = extra.search_scores(query, cancelled, narrow=False)
+            if extra_scores is None:
+                return None
+            if not extra_scores:
+                return table.view(sorted(scores, key=lambda row: (-scores[row], row)))
+            
+            ranked = [(-score, 0, row) for row, score in scores.items()]
+            ranked.extend((-score, 1, position) for position, score in extra_scores.items())
+            ranked.sort()
+            return DocumentTable(table[row] if part == 0 else extra.items[row] for _, part, row in ranked).view()
+        return job
+    
+    def _loaded_corpus(self, source):
+        """Table, search corpus and sort index of the loaded documents of a data source (any thread)
+        
+        Built lazily by the first search of a generation of the loaded
+        documents (in the search worker), so loading pages costs nothing, and
+        kept until a block is loaded, changed or dropped. Repeated searches
+        reuse the corpus and its query cache, sorting their results reuses the
+        cached sort orders.
+        
+        Args:
+            source (PagedDocumentSource): Data source
+        
+        Returns:
+            tuple: (source, generation, DocumentTable, SearchIndex, SortIndex)
+        """
+        with self._corpus_lock:
+            corpus = self._source_corpus
+            if corpus is None or corpus[0] is not source or corpus[1] != source.generation:
+                generation, items = source.loaded_snapshot()
+                table = DocumentTable(items)
+                corpus = (source, generation, table, SearchIndex(table), SortIndex(table))
+                if source is self.data_source:
+                    self._source_corpus = corpus
+            return corpus
+    
+    def _search_view(self, table, query, cancelled=None, index=None):
+        """Rank the documents of a table against query
+        
+        Args:
+            table (DocumentTable): Documents to search
+            query (str): Search text
+            cancelled (callable, optional): Stops the search when it returns True
+            index (SearchIndex, optional): Search corpus built from table, built here if omitted
+        
+        Returns:
+            DocumentView: Matching documents, best first, None if cancelled
+        """
+        if index is None:
+            index = SearchIndex(table)
+        positions = index.search_positions(query, cancelled)
+        return None if positions is None else table.view(positions)
+    
+    def _apply_search_result(self, query, items):
+        """Show the result of the latest search (Tk thread)
+        
+        Args:
+            query (str): Search text
+            items (list): Filtered items
+        """
+        # 搜索框已清空或改变，结果已过期
+        if self.search_var.get().strip() != query:
+            return
+        
+        # Add search term to history
+        if query not in self.search_history:
+            self.search_history.append(query)
+            # Limit history size
+            if len(self.search_history) > 10:
+                self.search_history.pop(0)
+        
+        self.filtered_items = items
+        self.current_page = 1  # Reset to first page
+        self._virtual_anchor_index = 0
+        
+        # Refresh view
+        if self.current_view == "grid":
+            self.refresh_grid()
+        else:
+            self.refresh_list()
+        self._update_status_bar()
     
     def _clear_search(self):
         """Clear search"""
+        self._search_scheduler.cancel()
         self.search_var.set("")
         # Clear filter, show all items
-        self.filtered_items = self.all_items[:]
+        self.filtered_items = self._unfiltered_items()
         self.current_page = 1  # Reset to first page
+        self._virtual_anchor_index = 0
         
         # Refresh view
         if self.current_view == "grid":
@@ -849,41 +1064,10 @@ class PaginatedGrid(ttk.Frame):
     
     def _filter_items(self, query):
         """Filter items based on query (fuzzy match with rapidfuzz)"""
-        query = query.lower()
-        filtered = []
-        scored = []
-        for item in self.all_items:
-            max_score = 0
-            # Check filename
-            filename = str(item.get('filename', '')).lower()
-            score = fuzz.partial_ratio(query, filename)
-            max_score = max(max_score, score)
-            # Check title
-            title = str(item.get('title', '')).lower()
-            score = fuzz.partial_ratio(query, title)
-            max_score = max(max_score, score)
-            # Check metadata
-            if 'metadata' in item and isinstance(item['metadata'], dict):
-                for key, value in item['metadata'].items():
-                    score1 = fuzz.partial_ratio(query, str(key).lower())
-                    score2 = fuzz.partial_ratio(query, str(value).lower())
-                    max_score = max(max_score, score1, score2)
-            # Check art movement
-            art_movement = str(item.get('artMovement', '')).lower()
-            score = fuzz.partial_ratio(query, art_movement)
-            max_score = max(max_score, score)
-            # Check all direct fields
-            for key, value in item.items():
-                if isinstance(value, (str, int, float)):
-                    score = fuzz.partial_ratio(query, str(value).lower())
-                    max_score = max(max_score, score)
-            # 命中阈值70
-            if max_score >= 70:
-                scored.append((item, max_score))
-        # 按相似度降序排序
-        scored.sort(key=lambda x: -x[1])
-        filtered = [x[0] for x in scored]
-        return filtered
+        if self.data_source is not None:
+            _, _, table, index, _ = self._loaded_corpus(self.data_source)
+            return self._search_view(table, query, index=index)
+        return self._search_view(self.all_items, query, index=self._search_index)
     
     def _show_search_history(self):
         """Show search history"""
@@ -930,11 +1114,12 @@ class PaginatedGrid(ttk.Frame):
     
     def _on_search_text_changed(self, *args):
         """Handle search text change event"""
-        # 实时搜索：只要有内容就自动搜索，无需回车
-        if not self.search_var.get().strip():
+        # 实时搜索：输入停顿后在后台线程搜索，新的输入取消正在进行的搜索
+        query = self.search_var.get().strip()
+        if not query:
             self._clear_search()
         else:
-            self._on_search()
+            self._search_scheduler.submit(query)
     
     def set_items(self, items):
         """Set items to display
@@ -947,11 +1132,16 @@ class PaginatedGrid(ttk.Frame):
             if items:
                 print(f"Sample item: {items[0]}")
             
-            self.all_items = items or []
-            self._sort_items()  # 新增：每次设置数据时先排序
-            self.filtered_items = self.all_items[:]
-            self._sort_items()  # 新增：filtered_items也排序
+            self._search_scheduler.cancel()
+            self.data_source = None
+            self.all_items = DocumentTable(items or [])
+            self._search_index = SearchIndex(self.all_items)
+            self._sort_index = SortIndex(self.all_items)
+            self.filtered_items = self.all_items.view()
+            self._sort_items()  # 每次设置数据时先排序
             self.current_page = 1
+            self._virtual_anchor_index = 0
+            self._virtual_selection = {}
             
             if self.current_view == "grid":
                 self.refresh_grid()
@@ -965,6 +1155,253 @@ class PaginatedGrid(ttk.Frame):
             import traceback
             traceback.print_exc()
     
+    def set_data_source(self, source):
+        """Display documents of a PagedDocumentSource, pages are fetched on demand
+        
+        Args:
+            source (PagedDocumentSource): Opened data source, sorted by the caller
+        """
+        try:
+            self._search_scheduler.cancel()
+            self.data_source = source
+            self._search_index = None
+            self._sort_index = SortIndex()
+            self._result_sort_index = None
+            with self._corpus_lock:
+                self._source_corpus = None
+            self._source_total = len(source)
+            self.all_items = source
+            self.filtered_items = source
+            self.current_page = 1
+            self._virtual_anchor_index = 0
+            self._virtual_selection = {}
+            
+            # 页面在后台线程加载完成后切换到Tk线程刷新
+            source.on_page_loaded = lambda block: self.after(0, self._on_source_page_loaded, source, block)
+            
+            if self.current_view == "grid":
+                self.refresh_grid()
+            else:
+                self.refresh_list()
+            
+            # 保留搜索条件，在新数据源上重新搜索
+            if self.search_var.get().strip():
+                self._on_search()
+            
+            self._update_status_bar()
+            
+        except Exception as e:
+            print(f"Error in set_data_source: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def _on_source_page_loaded(self, source, block):
+        """A page of the data source arrived, refresh the views showing it"""
+        if source is not self.data_source or self.filtered_items is not source:
+            return
+        
+        # 文档总数改变（集合变更后重新计数）时重新计算滚动区域
+        if len(source) != self._source_total:
+            self._source_total = len(source)
+            if self.current_view == "grid":
+                self.refresh_grid()
+            else:
+                self.refresh_list()
+            return
+        
+        if self._is_virtual_grid():
+            self._update_virtual_viewport()
+            return
+        
+        # 分页模式只在加载的页面与当前页重叠时刷新
+        block_start = block * source.page_size
+        block_end = block_start + source.page_size
+        page_start = (self.current_page - 1) * self.page_size
+        if block_start < page_start + self.page_size and page_start < block_end:
+            if self.current_view == "grid":
+                self.refresh_grid()
+            else:
+                self.refresh_list()
+        self._update_status_bar()
+    
+    def _unfiltered_items(self):
+        """Items shown without a search: the data source itself or a sorted view of all_items"""
+        if self.data_source is not None:
+            return self.data_source
+        view = self._sort_index.sorted_view(self.sort_field_var.get(), self.sort_reverse)
+        return view if view is not None else self.all_items.view()
+    
+    def _loaded_filtered_items(self):
+        """Filtered items that are already loaded (skips pending pages of the data source)"""
+        if self.data_source is not None and self.filtered_items is self.data_source:
+            return self.data_source.loaded_items()
+        return self.filtered_items
+    
+    def apply_changes(self, events):
+        """Apply incremental inserts, updates and deletes without a full reload
+        
+        Keeps the current scroll position, page and search. Cards of unchanged
+        documents keep their image.
+        
+        Args:
+            events (list): Change events {"op": insert/update/delete, "_id", "doc"}
+        """
+        if self.data_source is not None:
+            self._apply_source_changes(events)
+            return
+        try:
+            removed = set()
+            updated = {}
+            
+            for event in events:
+                key = str(event.get("_id"))
+                op = event.get("op")
+                if op == "delete":
+                    updated.pop(key, None)
+                    if self.all_items.row_of(key) is not None:
+                        removed.add(key)
+                elif op in ("insert", "update") and event.get("doc") is not None:
+                    removed.discard(key)
+                    updated[key] = event["doc"]
+            
+            if not removed and not updated:
+                return
+            
+            # 调用方在应用变更后重新读取all_items
+            items = [item for item in self.all_items if self._doc_key(item) not in removed]
+            for i, item in enumerate(items):
+                key = self._doc_key(item)
+                if key in updated:
+                    items[i] = updated.pop(key)
+            items.extend(updated.values())
+            self.all_items = DocumentTable(items)
+            self._search_index = SearchIndex(self.all_items)
+            self._sort_index = SortIndex(self.all_items)
+            
+            # 更新选择状态
+            for key in removed:
+                self._virtual_selection.pop(key, None)
+            self.selected_docs = [doc for doc in self.selected_docs if self._doc_key(doc) not in removed]
+            
+            # 重新应用搜索和排序
+            query = self.search_var.get().strip()
+            self.filtered_items = self._filter_items(query) if query else self._unfiltered_items()
+            self._sort_items()
+            
+            if self.current_view == "grid":
+                self.refresh_grid()
+            else:
+                self.refresh_list()
+            
+            self._update_status_bar()
+            
+        except Exception as e:
+            print(f"Error in apply_changes: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def _apply_source_changes(self, events):
+        """Apply change events to the data source, changed pages are refetched"""
+        try:
+            removed = {str(event.get("_id")) for event in events if event.get("op") == "delete"}
+            for key in removed:
+                self._virtual_selection.pop(key, None)
+            self.selected_docs = [doc for doc in self.selected_docs if self._doc_key(doc) not in removed]
+            
+            self.data_source.apply_changes(events)
+            self._source_total = len(self.data_source)
+            with self._corpus_lock:
+                self._source_corpus = None
+            
+            query = self.search_var.get().strip()
+            if query:
+                self._on_search()
+            elif self.current_view == "grid":
+                self.refresh_grid()
+            else:
+                self.refresh_list()
+            
+            self._update_status_bar()
+            
+        except Exception as e:
+            print(f"Error in apply_changes: {e}")
+            import traceback
+            traceback.print_exc()
+    
+    def locate(self, doc_id):
+        """Position of a document in the displayed (searched and sorted) items
+        
+        Args:
+            doc_id: Document _id or its string form
+        
+        Returns:
+            tuple: (index, page), None if the document is not loaded or filtered out
+        """
+        index_of = getattr(self.filtered_items, "index_of", None)
+        index = index_of(str(doc_id)) if index_of else None
+        if index is None:
+            return None
+        return index, index // max(1, self.page_size) + 1
+    
+    def reveal_document(self, doc_id):
+        """Scroll to a document and select it
+        
+        Args:
+            doc_id: Document _id or its string form
+        
+        Returns:
+            dict: The document, None if it is not loaded or filtered out
+        """
+        location = self.locate(doc_id)
+        if location is None:
+            return None
+        index, page = location
+        doc = self.filtered_items[index]
+        key = str(doc_id)
+        
+        if self._is_virtual_grid():
+            # 虚拟网格直接滚动到文档所在行
+            self._virtual_anchor_index = index
+            self.current_page = page
+            self._refresh_virtual_grid()
+            self._set_virtual_selection([doc])
+            self.last_selected_index = index
+        elif self.current_view == "grid":
+            self.go_to_page(page)
+            for card in self.displayed_cards:
+                selected = self._doc_key(card.doc) == key
+                card.set_selected(selected)
+                if selected:
+                    self.canvas.update_idletasks()
+                    self.canvas.yview_moveto(card.winfo_y() / max(1, self.cards_frame.winfo_height()))
+        else:
+            self.go_to_page(page)
+            iid = getattr(self, '_id_to_iid_map', {}).get(key)
+            if iid:
+                self.list_view.selection_set(iid)
+                self.list_view.see(iid)
+        return doc
+    
+    def get_projection(self):
+        """Fields rendered by the cards and the visible list columns
+        
+        Returns:
+            dict: Projection for fetching documents
+        """
+        fields = list(GRID_PROJECTION_FIELDS)
+        for column in self.list_view["columns"]:
+            if column and column not in fields:
+                fields.append(column)
+        return {field: 1 for field in fields}
+    
+    def get_sort(self):
+        """Current sort order
+        
+        Returns:
+            tuple: (field, reverse)
+        """
+        return self.sort_field_var.get(), self.sort_reverse
+    
     def set_columns(self, columns):
         """Set grid column count
         
@@ -977,32 +1414,59 @@ class PaginatedGrid(ttk.Frame):
     
     # --- Sorting related methods ---
     def _sort_items(self):
+        """Sort all_items and filtered_items with the cached orders of the sort index"""
         field = self.sort_field_var.get()
         reverse = self.sort_reverse
-        def get_key(item):
-            if field == "filename":
-                return str(item.get("filename") or item.get("title") or "").lower()
-            elif field == "importedAt":
-                value = item.get("importedAt")
-                import datetime
-                if isinstance(value, datetime.datetime):
-                    return value.timestamp()
-                elif isinstance(value, str):
-                    try:
-                        from dateutil import parser
-                        return parser.parse(value).timestamp()
-                    except Exception:
-                        return float('-inf') if not reverse else float('inf')
-                else:
-                    return float('-inf') if not reverse else float('inf')
-            elif field == "size":
-                return item.get("size") or 0
-            elif field == "artMovement":
-                return str(item.get("artMovement") or "").lower()
-            return ""
-        self.all_items.sort(key=get_key, reverse=reverse)
-        self.filtered_items.sort(key=get_key, reverse=reverse)
+        if self.data_source is not None:
+            # 分页数据源在服务器端排序，搜索结果在内存中排序
+            # (先取得排序索引，set_sort会重置数据源并在后台重建语料)
+            showing_results = self.filtered_items is not self.data_source
+            sort_index = self._result_sort_index_of(self.filtered_items) if showing_results else None
+            self.data_source.set_sort(field, reverse)
+            self._source_total = len(self.data_source)
+            if not showing_results:
+                return
+            ordered = sort_index.sort_view(self.filtered_items, field, reverse) if sort_index else None
+            if ordered is not None:
+                self.filtered_items = ordered
+            return
+        
+        ordered = self._sort_index.sorted_view(field, reverse)
+        if ordered is None:
+            return
+        if len(self.filtered_items) == len(ordered):
+            self.filtered_items = ordered
+        else:
+            # 搜索结果按全部文档的顺序排列，不再重新计算排序键
+            subset = self._sort_index.sort_view(self.filtered_items, field, reverse)
+            if subset is not None:
+                self.filtered_items = subset
 
+    def _result_sort_index_of(self, view):
+        """Sort index of the table behind search results of the data source
+        
+        Results over the loaded documents share the sort index of the corpus;
+        results merged with server candidates get one for their own table,
+        kept while they are displayed.
+        
+        Args:
+            view (DocumentView): Search results
+        
+        Returns:
+            SortIndex: Sort index of view.table, None if view is not a DocumentView
+        """
+        table = getattr(view, "table", None)
+        if table is None:
+            return None
+        if self._result_sort_index is not None and self._result_sort_index.table is table:
+            return self._result_sort_index
+        corpus = self._source_corpus
+        if corpus is not None and corpus[2] is table:
+            self._result_sort_index = corpus[4]
+        else:
+            self._result_sort_index = SortIndex(table)
+        return self._result_sort_index
+    
     def _on_sort_changed(self, event=None):
         self._sort_items()
         if self.current_view == "grid":
@@ -1060,7 +1524,10 @@ class PaginatedGrid(ttk.Frame):
 
     def _update_select_all_btn(self):
         """根据当前页选择状态切换按钮文本"""
-        all_selected = all(card.is_selected for card in self.displayed_cards) and len(self.displayed_cards) > 0
+        if self._is_virtual_grid():
+            all_selected = self._all_virtual_selected()
+        else:
+            all_selected = all(card.is_selected for card in self.displayed_cards) and len(self.displayed_cards) > 0
         if all_selected:
             self.select_all_btn.config(text="Deselect All")
         else:
@@ -1073,11 +1540,262 @@ class PaginatedGrid(ttk.Frame):
         else:
             self.selection_mode = "multi"
             self.select_mode_btn.config(text="Switch to Single Selection")
+        self._virtual_selection = {}
         for card in self.displayed_cards:
             card.set_selected(False)
         self.last_selected_index = None
         self._update_selection_ui()
 
+    # --- Virtualized grid methods ---
+    def _is_virtual_grid(self):
+        """Whether the grid view is currently rendered by the recycled card pool"""
+        return self.grid_mode == "virtual" and self.current_view == "grid"
+
+    def _toggle_grid_mode(self):
+        """Switch between continuous (virtualized) scrolling and the paged grid"""
+        if self.grid_mode == "virtual":
+            self.grid_mode = "paged"
+            self.grid_mode_btn.config(text="Switch to Continuous Scroll")
+            self.canvas.yview_moveto(0)
+        else:
+            self.grid_mode = "virtual"
+            self.grid_mode_btn.config(text="Switch to Paged Grid")
+        self._virtual_selection = {}
+        self.last_selected_index = None
+        if self.current_view == "grid":
+            self.refresh_grid()
+        self._update_selection_ui()
+
+    def _refresh_virtual_grid(self):
+        """Lay out all filtered items as rows and bind pooled cards to the visible ones"""
+        try:
+            # 清理分页模式遗留的卡片，隐藏分页模式使用的内部frame
+            for widget in self.cards_frame.winfo_children():
+                widget.destroy()
+            self.canvas.itemconfigure(self.canvas_window, state="hidden")
+            
+            canvas_width = self.canvas.winfo_width()
+            if canvas_width > 1:
+                self.columns = max(1, canvas_width // MIN_CELL_WIDTH)
+            
+            total = len(self.filtered_items)
+            page_size = max(1, self.page_size)
+            
+            # 确保当前页有效
+            self.total_pages = max(1, math.ceil(total / page_size))
+            self.current_page = min(max(1, self.current_page), self.total_pages)
+            
+            # 页码被外部改变（翻页、搜索）时滚动到该页起点，否则保持当前位置
+            if self._virtual_anchor_index // page_size + 1 != self.current_page:
+                self._virtual_anchor_index = (self.current_page - 1) * page_size
+            self._virtual_anchor_index = min(self._virtual_anchor_index, max(0, total - 1))
+            
+            # 滚动区域覆盖所有行，而不是只覆盖已创建的卡片
+            rows = math.ceil(total / self.columns)
+            content_height = max(1, rows * CELL_HEIGHT)
+            self.canvas.configure(scrollregion=(0, 0, max(canvas_width, 1), content_height))
+            anchor_row = self._virtual_anchor_index // self.columns
+            self.canvas.yview_moveto(anchor_row * CELL_HEIGHT / content_height)
+            
+            self._update_virtual_viewport()
+            self._update_select_all_btn()
+            self._update_status_bar()
+        except Exception as e:
+            print(f"Error in _refresh_virtual_grid: {e}")
+            import traceback
+            traceback.print_exc()
+
+    def _on_canvas_yscroll(self, first, last):
+        """Canvas scroll position changed: update scrollbar and visible cards"""
+        self.scrollbar.set(first, last)
+        if self._is_virtual_grid():
+            self._schedule_viewport_update()
+
+    def _schedule_viewport_update(self):
+        """Coalesce viewport updates triggered by scrolling into one idle callback"""
+        if self._viewport_job is None:
+            self._viewport_job = self.after_idle(self._update_virtual_viewport)
+
+    def _update_virtual_viewport(self):
+        """Bind pooled cards to the rows intersecting the viewport"""
+        self._viewport_job = None
+        if not self._is_virtual_grid():
+            return
+        
+        total = len(self.filtered_items)
+        columns = max(1, self.columns)
+        cell_width = max(self.canvas.winfo_width(), MIN_CELL_WIDTH) / columns
+        top = max(0, self.canvas.canvasy(0))
+        height = max(self.canvas.winfo_height(), CELL_HEIGHT)
+        
+        first_row = max(0, int(top // CELL_HEIGHT) - VIRTUAL_GRID_OVERSCAN_ROWS)
+        last_row = int((top + height) // CELL_HEIGHT) + VIRTUAL_GRID_OVERSCAN_ROWS
+        start = min(first_row * columns, total)
+        end = min((last_row + 1) * columns, total)
+        
+        # 仍然显示同一文档的卡片保持不动，其余卡片回收再利用
+        bound = {}
+        free = []
+        for card in self._card_pool:
+            index = card.item_index
+            if index is not None and start <= index < end and self._card_shows(card, index):
+                bound[index] = card
+            else:
+                free.append(card)
+        
+        # 卡片池只在可见区域变大时增长
+        while len(bound) + len(free) < end - start:
+            free.append(self._create_pool_card())
+        
+        for index in range(start, end):
+            card = bound.get(index)
+            if card is None:
+                card = free.pop()
+                self._bind_pool_card(card, index)
+                bound[index] = card
+            row, col = divmod(index, columns)
+            window = self._card_windows[card]
+            self.canvas.coords(window, col * cell_width + CELL_PADDING, row * CELL_HEIGHT + CELL_PADDING)
+            self.canvas.itemconfigure(window, width=int(cell_width) - 2 * CELL_PADDING, state="normal")
+        
+        for card in free:
+            self._release_pool_card(card)
+        
+        self.displayed_cards = [bound[index] for index in range(start, end)]
+        
+        # 当前页跟随可见区域的第一行
+        if total:
+            self._virtual_anchor_index = min(int(top // CELL_HEIGHT) * columns, total - 1)
+        else:
+            self._virtual_anchor_index = 0
+        self.current_page = self._virtual_anchor_index // max(1, self.page_size) + 1
+        self._update_pagination_controls()
+
+    def _create_pool_card(self):
+        """Create a card for the recycling pool
+        
+        Returns:
+            ImageCard: New hidden card placed on the canvas
+        """
+        card = ImageCard(self.canvas, on_select_callback=self._on_card_selected)
+        if self.context_menu_callback:
+            card.setup_context_menu(self.context_menu_callback)
+        self._card_windows[card] = self.canvas.create_window(0, 0, window=card, anchor=tk.NW, state="hidden")
+        self._card_pool.append(card)
+        return card
+
+    def _bind_pool_card(self, card, index):
+        """Bind a pooled card to the item at index
+        
+        Args:
+            card (ImageCard): Pooled card
+            index (int): Index into filtered_items
+        """
+        self._remember_card_selection(card)
+        item = self.filtered_items[index]
+        card.item_index = index
+        card.bind_doc(item)
+        card.set_selected(self._doc_key(item) in self._virtual_selection)
+        if item is not None:
+            self.image_loader.add_task(card)
+        else:
+            # 数据源页面尚未加载，加载完成后重新绑定
+            self.image_loader.cancel(card)
+    
+    def _card_shows(self, card, index):
+        """Whether a bound card already shows the item at index (placeholders match unloaded items)"""
+        item = self.filtered_items[index]
+        if item is None:
+            return not card.doc
+        return card.doc is item
+
+    def _release_pool_card(self, card):
+        """Hide a pooled card that is no longer in the viewport"""
+        self._remember_card_selection(card)
+        self.image_loader.cancel(card)
+        card.item_index = None
+        self.canvas.itemconfigure(self._card_windows[card], state="hidden")
+
+    def _hide_card_pool(self):
+        """Hide the card pool and restore the inner frame used by the paged grid"""
+        for card in self._card_pool:
+            self._release_pool_card(card)
+        if self._card_pool:
+            self.displayed_cards = []
+        self.canvas.itemconfigure(self.canvas_window, state="normal")
+
+    def _doc_key(self, doc):
+        """Key identifying a document in the virtual selection"""
+        return str(doc.get('_id')) if doc else None
+
+    def _remember_card_selection(self, card):
+        """Store the selection state of a bound card before it is recycled"""
+        if card.item_index is None or not card.doc:
+            return
+        key = self._doc_key(card.doc)
+        if card.is_selected:
+            self._virtual_selection[key] = card.doc
+        else:
+            self._virtual_selection.pop(key, None)
+
+    def _set_virtual_selection(self, docs):
+        """Replace the virtual grid selection and push it to the bound cards
+        
+        Args:
+            docs (list): Documents to select
+        """
+        self._virtual_selection = {self._doc_key(doc): doc for doc in docs if doc}
+        for card in self.displayed_cards:
+            card.set_selected(self._doc_key(card.doc) in self._virtual_selection)
+
+    def _all_virtual_selected(self):
+        """Whether every filtered item is selected in the virtual grid"""
+        items = self._loaded_filtered_items()
+        if not items or len(self._virtual_selection) < len(items):
+            return False
+        return all(self._doc_key(doc) in self._virtual_selection for doc in items)
+
+    def _on_virtual_card_selected(self, card, event=None):
+        """Handle card clicks in the virtual grid, selection is tracked per document"""
+        try:
+            idx = card.item_index
+            if idx is None:
+                return
+            for c in self.displayed_cards:
+                self._remember_card_selection(c)
+            
+            shift_pressed = False
+            ctrl_pressed = False
+            if event:
+                shift_pressed = (event.state & 0x0001) != 0
+                ctrl_pressed = (event.state & 0x0004) != 0
+            
+            if self.selection_mode == "multi" and shift_pressed and self.last_selected_index is not None:
+                # 范围选择可以跨越不在可见区域内的行
+                start = min(self.last_selected_index, idx)
+                end = min(max(self.last_selected_index, idx), len(self.filtered_items) - 1)
+                for i in range(start, end + 1):
+                    doc = self.filtered_items[i]
+                    if doc is not None:
+                        self._virtual_selection[self._doc_key(doc)] = doc
+                self._set_virtual_selection(list(self._virtual_selection.values()))
+            elif self.selection_mode == "multi" and ctrl_pressed:
+                card.set_selected(not card.is_selected)
+                self._remember_card_selection(card)
+                self.last_selected_index = idx if card.is_selected else self.last_selected_index
+            else:
+                self._set_virtual_selection([card.doc])
+                self.last_selected_index = idx
+        except Exception as e:
+            print(f"Selection error: {e}")
+        self._update_selection_ui()
+        try:
+            if self.on_show_details:
+                self.on_show_details(card.doc)
+        except Exception as e:
+            print(f"Auto show details error: {e}")
+    # --- End of virtualized grid methods ---
+
     def _on_list_selection_changed(self, event=None):
         """处理列表选择变更事件"""
         try:
@@ -1091,6 +1809,8 @@ class PaginatedGrid(ttk.Frame):
             current_page_items = self.filtered_items[current_page_start:current_page_end]
             
             for item in current_page_items:
+                if item is None:
+                    continue
                 item_id = str(item.get('_id'))
                 if item_id in self._id_to_iid_map:
                     iid = self._id_to_iid_map[item_id]
@@ -1196,6 +1916,10 @@ class PaginatedGrid(ttk.Frame):
         # 重新配置列表视图
         self.list_view["columns"] = columns
         
+        # 新显示的列需要重新从服务器获取
+        if self.data_source is not None:
+            self.data_source.set_projection(self.get_projection())
+        
         # 设置列标题和宽度
         for col in columns:
             # 标题首字母大写
@@ -1241,7 +1965,7 @@ class PaginatedGrid(ttk.Frame):
             return
             
         # 获取对应的文档
-        for item in self.filtered_items:
+        for item in self._loaded_filtered_items():
             item_id = str(item.get('_id'))
             if item_id in self._id_to_iid_map and self._id_to_iid_map[item_id] == iid:
                 if self.on_show_details:
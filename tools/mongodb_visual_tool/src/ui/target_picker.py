@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Target Document Picker - Type-ahead selection of a relationship target
+"""
+import threading
+import tkinter as tk
+from tkinter import ttk
+from collections import OrderedDict
+
+from ..config.settings import (SORT_COLLATION, TARGET_PICKER_FIELDS, TARGET_PICKER_LIMIT,
+                               TARGET_PICKER_CACHE_SIZE, TARGET_PICKER_DEBOUNCE_MS, TARGET_PICKER_CREATE_INDEXES)
+from ..utils.search_scheduler import SearchScheduler
+
+PICKER_PROJECTION = {field: 1 for field in TARGET_PICKER_FIELDS}
+
+
+def document_label(doc):
+    """Name shown for a target document: filename, title or _id"""
+    return str(doc.get('filename') or doc.get('title') or doc.get('_id', ''))
+
+
+class TargetDocPicker(ttk.Frame):
+    """Entry with a result list that finds target documents by name prefix
+    
+    Every keystroke (debounced) runs MongoDBManager.find_by_prefix in a
+    worker thread, so only a small window of matching documents is fetched,
+    whatever the size of the collection. Results are kept per prefix in an
+    LRU: a prefix seen before is shown at once, and a longer prefix is
+    filtered locally from a cached shorter one whose results were complete.
+    """
+    
+    _indexed = set()  # (db manager, database, collection) whose prefix indexes were ensured
+    
+    def __init__(self, parent, db_manager=None, on_select=None, limit=TARGET_PICKER_LIMIT, height=6, width=30):
+        """Initialize the picker
+        
+        Args:
+            parent: Parent component
+            db_manager: Database manager instance
+            on_select (callable, optional): on_select(doc) when a document is picked
+            limit (int): Documents fetched per field and prefix
+            height (int): Visible rows of the result list
+            width (int): Width of the entry in characters
+        """
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.on_select = on_select
+        self.limit = limit
+        self.database = None
+        self.collection = None
+        self._docs = []  # Documents in the result list
+        self._selected = None
+        self._results = OrderedDict()  # prefix -> (documents, complete), LRU order
+        
+        self.query_var = tk.StringVar()
+        self.entry = ttk.Entry(self, textvariable=self.query_var, width=width)
+        self.entry.pack(fill=tk.X)
+        self.entry.bind("<KeyRelease>", self._on_type)
+        self.entry.bind("<Down>", self._focus_list)
+        
+        list_frame = ttk.Frame(self)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+        self.listbox = tk.Listbox(list_frame, height=height, exportselection=False)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.listbox.yview)
+        self.listbox.configure(yscrollcommand=scrollbar.set)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox.bind("<<ListboxSelect>>", self._on_list_select)
+        
+        self.status_var = tk.StringVar()
+        ttk.Label(self, textvariable=self.status_var, foreground="gray").pack(fill=tk.X)
+        
+        self._scheduler = SearchScheduler(self, self._prepare_query, self._apply_result,
+                                          delay_ms=TARGET_PICKER_DEBOUNCE_MS)
+    
+    def set_collection(self, database, collection, db_manager=None):
+        """Pick targets from another collection
+        
+        Args:
+            database (str): Database name
+            collection (str): Collection name, None to clear the picker
+            db_manager (optional): Database manager, keeps the current one if omitted
+        """
+        if db_manager is not None:
+            self.db_manager = db_manager
+        self.database = database
+        self.collection = collection
+        self._results.clear()
+        self._selected = None
+        self._scheduler.cancel()
+        self.query_var.set("")
+        self._show([], True)
+        if self.db_manager and database and collection:
+            self._ensure_indexes()
+            self._scheduler.submit("", delay_ms=0)
+    
+    def selected_document(self):
+        """Picked document, None if nothing is picked"""
+        return self._selected
+    
+    def _ensure_indexes(self):
+        """Create the case-insensitive prefix indexes of the collection in the background, once
+        
+        Only when TARGET_PICKER_CREATE_INDEXES is enabled; otherwise the
+        prefix queries run without them.
+        """
+        key = (id(self.db_manager), self.database, self.collection)
+        if not TARGET_PICKER_CREATE_INDEXES or key in self._indexed:
+            return
+        self._indexed.add(key)
+        db_manager, database, collection = self.db_manager, self.database, self.collection
+        indexes = {f"{field}_prefix": [(field, 1)] for field in TARGET_PICKER_FIELDS}
+        
+        def create():
+            try:
+                created = db_manager.ensure_indexes(database, collection, indexes, collation=SORT_COLLATION)
+                if created:
+                    print(f"Created prefix indexes on {database}.{collection}: {', '.join(created)}")
+            except Exception as e:
+                # e.g. no createIndex privilege: queries still work, without the index
+                print(f"Failed to create prefix indexes on {database}.{collection}: {e}")
+        
+        threading.Thread(target=create, daemon=True).start()
+    
+    def _cached(self, prefix):
+        """Results of a prefix from the LRU, filtered from a complete shorter prefix if needed
+        
+        Returns:
+            tuple: (documents, complete), None if the server must be queried
+        """
+        if prefix in self._results:
+            self._results.move_to_end(prefix)
+            return self._results[prefix]
+        lowered = prefix.lower()
+        for length in range(len(prefix) - 1, -1, -1):
+            cached = self._results.get(prefix[:length])
+            if cached and cached[1]:
+                docs = [doc for doc in cached[0]
+                        if any(str(doc.get(field, '')).lower().startswith(lowered) for field in TARGET_PICKER_FIELDS)]
+                return self._remember(prefix, docs, True)
+        return None
+    
+    def _remember(self, prefix, docs, complete):
+        """Store the results of a prefix in the LRU"""
+        self._results[prefix] = (docs, complete)
+        self._results.move_to_end(prefix)
+        while len(self._results) > TARGET_PICKER_CACHE_SIZE:
+            self._results.popitem(last=False)
+        return docs, complete
+    
+    def _on_type(self, event=None):
+        """Entry changed: show cached results at once, otherwise query the server"""
+        if event is not None and event.keysym in ("Down", "Up", "Return", "Tab"):
+            return
+        if not self.db_manager or not self.collection:
+            return
+        prefix = self.query_var.get().strip()
+        cached = self._cached(prefix)
+        if cached is not None:
+            self._scheduler.cancel()
+            self._show(*cached)
+        else:
+            self.status_var.set("正在搜索...")
+            self._scheduler.submit(prefix)
+    
+    def _prepare_query(self, prefix):
+        """Build the worker job of a prefix query (Tk thread)"""
+        db_manager, database, collection, limit = self.db_manager, self.database, self.collection, self.limit
+        
+        def job(cancelled):
+            docs, complete = db_manager.find_by_prefix(database, collection, prefix, limit=limit,
+                                                       projection=PICKER_PROJECTION)
+            return database, collection, docs, complete
+        return job
+    
+    def _apply_result(self, prefix, result):
+        """Store a prefix query result and show it if the entry still holds that prefix"""
+        database, collection, docs, complete = result
+        if (database, collection) != (self.database, self.collection):
+            return
+        self._remember(prefix, docs, complete)
+        if self.query_var.get().strip() == prefix:
+            self._show(docs, complete)
+    
+    def _show(self, docs, complete):
+        """Fill the result list"""
+        self._docs = sorted(docs, key=lambda doc: document_label(doc).lower())
+        self.listbox.delete(0, tk.END)
+        for doc in self._docs:
+            self.listbox.insert(tk.END, document_label(doc))
+        
+        # Keep the picked document selected while it is still listed, drop it otherwise
+        if self._selected is not None:
+            for index, doc in enumerate(self._docs):
+                if doc.get('_id') == self._selected.get('_id'):
+                    self.listbox.selection_set(index)
+                    break
+            else:
+                self._selected = None
+        
+        if not self.collection:
+            self.status_var.set("")
+        elif not self._docs:
+            self.status_var.set("没有匹配的文档")
+        elif complete:
+            self.status_var.set(f"{len(self._docs)} 个文档")
+        else:
+            self.status_var.set(f"前 {len(self._docs)} 个匹配，继续输入以缩小范围")
+    
+    def _focus_list(self, event=None):
+        """Move from the entry to the result list"""
+        if self._docs:
+            self.listbox.focus_set()
+            if not self.listbox.curselection():
+                self.listbox.selection_set(0)
+                self._on_list_select()
+    
+    def _on_list_select(self, event=None):
+        """A document was picked in the result list"""
+        selection = self.listbox.curselection()
+        if not selection or selection[0] >= len(self._docs):
+            return
+        self._selected = self._docs[selection[0]]
+        if self.on_select:
+            self.on_select(self._selected)
@@ -4,7 +4,13 @@ Utility modules for MongoDB Visual Tool
 """
 from .image_loader import ImageLoader
 from .cache_manager import CacheManager
+from .thumbnail_cache import ThumbnailCache
+from .search_index import SearchIndex
+from .sort_index import SortIndex
+from .document_table import DocumentTable, DocumentView
+from .relationship_graph import RelationshipGraph
 
-__all__ = ['ImageLoader', 'CacheManager']
+__all__ = ['ImageLoader', 'CacheManager', 'ThumbnailCache', 'SearchIndex', 'SortIndex', 'DocumentTable', 'DocumentView',
+           'RelationshipGraph']
 
 # Import utility functions and classes 
\ No newline at end of file
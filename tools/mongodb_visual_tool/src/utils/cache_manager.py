@@ -3,21 +3,50 @@
 Cache Manager - 管理MongoDB可视化工具的缓存
 """
 import os
-import json
-import shutil
+import copy
+import sqlite3
 import time
 import threading
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import datetime
+from bson import json_util
+
+from ..config.settings import (CACHE_STATS_FLUSH_OPS, CACHE_STATS_FLUSH_INTERVAL, CACHE_EVICTION_POLICY,
+                               CACHE_CATEGORY_BUDGETS, CACHE_DEFAULT_BUDGET,
+                               CACHE_MEMORY_MAX_ENTRIES, CACHE_MEMORY_MAX_BYTES)
+
+# 缓存子目录（thumbnails等仍以独立文件保存）
+CACHE_SUBDIRS = ["images", "documents", "thumbnails", "temp"]
+
+# 淘汰顺序：已过期的条目优先，其次按策略排序
+EVICTION_ORDER = {
+    "lru": "accessed ASC",
+    "lfu": "hits ASC, accessed ASC",
+}
+EVICTION_BATCH = 32  # 每次查询的候选条目数
 
 
 class CacheManager:
-    """缓存管理器 - 管理应用程序的缓存文件"""
+    """缓存管理器 - 管理应用程序的缓存
+    
+    缓存条目保存在单个SQLite数据库（WAL模式）中，按 (category, key) 主键索引，
+    每个条目带有各自的过期时间。条目大小增量统计，命中/未命中统计批量写回，
+    避免每次读写都扫描缓存目录或重写统计文件。
     
-    def __init__(self, cache_dir=None):
+    每个类别有字节数和条目数预算，写入后超出预算时按LRU或LFU淘汰条目。
+    访问时间和访问次数先记录在内存中，随统计信息一起批量写回。
+    
+    数据库前面还有一层有容量上限的内存缓存（LRU），过期时间与磁盘条目相同。
+    内存层保存自己的副本，命中时返回新的副本，调用方修改返回的数据不会影响缓存。
+    """
+    
+    def __init__(self, cache_dir=None, eviction_policy=None, budgets=None):
         """初始化缓存管理器
         
         Args:
             cache_dir (str, optional): 缓存目录路径
+            eviction_policy (str, optional): 淘汰策略 (lru, lfu)，默认使用配置
+            budgets (dict, optional): 类别 -> {"max_bytes", "max_entries"}，默认使用配置
         """
         # 确定缓存目录
         if cache_dir is None:
@@ -25,20 +54,51 @@ class CacheManager:
             cache_dir = os.path.join(base_dir, "cache")
         
         self.cache_dir = cache_dir
+        self.db_path = os.path.join(cache_dir, "cache.db")
         self.stats = {
             "total_size": 0,
             "file_count": 0,
             "last_cleanup": None,
             "cache_hits": 0,
-            "cache_misses": 0
+            "cache_misses": 0,
+            "evictions": 0,
+            "memory_hits": 0
         }
         
+        # 淘汰策略和各类别预算
+        self.eviction_policy = eviction_policy or CACHE_EVICTION_POLICY
+        if self.eviction_policy not in EVICTION_ORDER:
+            raise ValueError(f"Unknown cache eviction policy: {self.eviction_policy}")
+        self.budgets = dict(CACHE_CATEGORY_BUDGETS if budgets is None else budgets)
+        
+        # 条目大小统计（增量维护）与目录文件统计（仅在update_cache_stats时扫描）
+        self._category_totals = {}  # category -> [字节数, 条目数]
+        self._file_bytes = 0
+        self._file_count = 0
+        
+        # 内存缓存层：(category, key) -> (数据, 过期时间, 序列化大小)
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self.memory_max_entries = CACHE_MEMORY_MAX_ENTRIES
+        self.memory_max_bytes = CACHE_MEMORY_MAX_BYTES
+        
+        # 命名空间（如 数据库.集合）的缓存代数，写入后递增使旧键失效
+        self._generations = {}
+        
+        # 统计信息和访问记录批量写回
+        self._pending_access = {}  # (category, key) -> [最后访问时间, 新增访问次数]
+        self._pending_stat_ops = 0
+        self._last_stats_flush = time.time()
+        
         # 缓存锁（用于线程安全操作）
         self._cache_lock = threading.RLock()
         
         # 确保缓存目录存在
         self._ensure_cache_dir()
         
+        # 打开缓存数据库
+        self._conn = self._open_db()
+        
         # 加载统计信息
         self._load_stats()
     
@@ -46,58 +106,164 @@ class CacheManager:
         """确保缓存目录存在"""
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir, exist_ok=True)
-            
+        
         # 创建子目录
-        for subdir in ["images", "documents", "thumbnails", "temp"]:
+        for subdir in CACHE_SUBDIRS:
             path = os.path.join(self.cache_dir, subdir)
             if not os.path.exists(path):
                 os.makedirs(path, exist_ok=True)
     
+    def _open_db(self):
+        """打开缓存数据库并创建表结构
+        
+        Returns:
+            sqlite3.Connection: 数据库连接
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                category TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                expires REAL,
+                accessed REAL NOT NULL DEFAULT 0,
+                hits INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (category, key)
+            ) WITHOUT ROWID
+        """)
+        
+        # 旧版本数据库没有访问记录列
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+        if "accessed" not in columns:
+            conn.execute("ALTER TABLE entries ADD COLUMN accessed REAL NOT NULL DEFAULT 0")
+            conn.execute("UPDATE entries SET accessed = created")
+        if "hits" not in columns:
+            conn.execute("ALTER TABLE entries ADD COLUMN hits INTEGER NOT NULL DEFAULT 0")
+        
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_lru ON entries (category, accessed)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_lfu ON entries (category, hits, accessed)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS generations (
+                namespace TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS stats (
+                name TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+        return conn
+    
     def _load_stats(self):
         """加载缓存统计信息"""
-        stats_file = os.path.join(self.cache_dir, "cache_stats.json")
-        if os.path.exists(stats_file):
+        with self._cache_lock:
             try:
-                with open(stats_file, 'r', encoding='utf-8') as f:
-                    self.stats = json.load(f)
-            except Exception as e:
+                for name, value in self._conn.execute("SELECT name, value FROM stats"):
+                    if name in ("cache_hits", "cache_misses", "evictions"):
+                        self.stats[name] = int(value)
+                    elif name == "last_cleanup":
+                        self.stats[name] = value
+                
+                self._reload_totals()
+            except sqlite3.Error as e:
                 print(f"无法加载缓存统计信息: {e}")
-                # 如果加载失败，使用默认值并重新计算
-                self.update_cache_stats()
-        else:
-            # 如果统计文件不存在，计算当前缓存状态
-            self.update_cache_stats()
+        
+        # 计算目录中的文件
+        self.update_cache_stats()
+    
+    def _reload_totals(self):
+        """从数据库重新计算各类别的大小和条目数"""
+        self._category_totals = {
+            category: [size, count]
+            for category, size, count in self._conn.execute(
+                "SELECT category, SUM(size), COUNT(*) FROM entries GROUP BY category"
+            )
+        }
+    
+    def _adjust_totals(self, category, size_delta, count_delta):
+        """增量更新类别的大小和条目数"""
+        totals = self._category_totals.setdefault(category, [0, 0])
+        totals[0] += size_delta
+        totals[1] += count_delta
+    
+    def _flush_access(self):
+        """将内存中的访问记录写回数据库"""
+        if not self._pending_access:
+            return
+        self._conn.executemany(
+            "UPDATE entries SET accessed = ?, hits = hits + ? WHERE category = ? AND key = ?",
+            [(accessed, hits, category, key)
+             for (category, key), (accessed, hits) in self._pending_access.items()]
+        )
+        self._pending_access.clear()
     
     def _save_stats(self):
-        """保存缓存统计信息"""
-        stats_file = os.path.join(self.cache_dir, "cache_stats.json")
-        try:
-            with open(stats_file, 'w', encoding='utf-8') as f:
-                json.dump(self.stats, f, indent=2)
-        except Exception as e:
-            print(f"无法保存缓存统计信息: {e}")
+        """保存缓存统计信息和访问记录"""
+        with self._cache_lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._flush_access()
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO stats (name, value) VALUES (?, ?)",
+                    [(name, None if self.stats[name] is None else str(self.stats[name]))
+                     for name in ("cache_hits", "cache_misses", "evictions", "last_cleanup")]
+                )
+                self._conn.execute("COMMIT")
+                self._pending_stat_ops = 0
+                self._last_stats_flush = time.time()
+            except sqlite3.Error as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                print(f"无法保存缓存统计信息: {e}")
+    
+    def _record_stat(self, name):
+        """累加命中/未命中计数，按操作数或时间间隔批量写回
+        
+        Args:
+            name (str): cache_hits 或 cache_misses
+        """
+        self.stats[name] += 1
+        self._pending_stat_ops += 1
+        if (self._pending_stat_ops >= CACHE_STATS_FLUSH_OPS or
+                time.time() - self._last_stats_flush >= CACHE_STATS_FLUSH_INTERVAL):
+            self._save_stats()
+    
+    def _refresh_totals(self):
+        """根据增量统计更新总大小和条目数"""
+        entry_bytes = sum(totals[0] for totals in self._category_totals.values())
+        entry_count = sum(totals[1] for totals in self._category_totals.values())
+        self.stats["total_size"] = entry_bytes + self._file_bytes
+        self.stats["file_count"] = entry_count + self._file_count
     
     def update_cache_stats(self):
-        """更新缓存统计信息"""
+        """更新缓存统计信息（扫描缓存子目录中的独立文件）"""
         with self._cache_lock:
             total_size = 0
             file_count = 0
             
-            # 遍历缓存目录
-            for root, _, files in os.walk(self.cache_dir):
-                for filename in files:
-                    if filename == "cache_stats.json":
-                        continue
-                    file_path = os.path.join(root, filename)
-                    try:
-                        file_size = os.path.getsize(file_path)
-                        total_size += file_size
-                        file_count += 1
-                    except:
-                        pass
+            # 遍历缓存子目录（缓存条目已在数据库中增量统计）
+            for subdir in CACHE_SUBDIRS:
+                path = os.path.join(self.cache_dir, subdir)
+                if not os.path.isdir(path):
+                    continue
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_file():
+                                total_size += entry.stat().st_size
+                                file_count += 1
+                        except OSError:
+                            pass
             
-            self.stats["total_size"] = total_size
-            self.stats["file_count"] = file_count
+            self._file_bytes = total_size
+            self._file_count = file_count
+            self._refresh_totals()
             self._save_stats()
     
     def get_cache_size(self):
@@ -130,7 +296,175 @@ class CacheManager:
         Returns:
             dict: 缓存统计信息
         """
-        return self.stats.copy()
+        with self._cache_lock:
+            self._refresh_totals()
+            return self.stats.copy()
+    
+    def get_generation(self, namespace):
+        """获取命名空间的当前缓存代数
+        
+        缓存键中包含代数，代数递增后旧条目不再被访问，随后被正常淘汰。
+        
+        Args:
+            namespace (str): 命名空间，如 "数据库.集合"
+            
+        Returns:
+            int: 当前代数
+        """
+        with self._cache_lock:
+            generation = self._generations.get(namespace)
+            if generation is None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT value FROM generations WHERE namespace = ?", (namespace,)
+                    ).fetchone()
+                    generation = row[0] if row else 0
+                except sqlite3.Error as e:
+                    print(f"读取缓存代数失败: {e}")
+                    generation = 0
+                self._generations[namespace] = generation
+            return generation
+    
+    def bump_generation(self, namespace):
+        """递增命名空间的缓存代数，使其下所有缓存键失效
+        
+        Args:
+            namespace (str): 命名空间，如 "数据库.集合"
+            
+        Returns:
+            int: 新的代数
+        """
+        with self._cache_lock:
+            generation = self.get_generation(namespace) + 1
+            self._generations[namespace] = generation
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO generations (namespace, value) VALUES (?, ?)",
+                    (namespace, generation)
+                )
+            except sqlite3.Error as e:
+                print(f"保存缓存代数失败: {e}")
+            return generation
+    
+    def get_category_usage(self):
+        """获取各类别缓存条目的用量和预算
+        
+        Returns:
+            dict: 类别 -> {"size", "entries", "max_bytes", "max_entries"}
+        """
+        with self._cache_lock:
+            usage = {}
+            for category, (size, count) in self._category_totals.items():
+                budget = self.budgets.get(category, CACHE_DEFAULT_BUDGET)
+                usage[category] = {
+                    "size": size,
+                    "entries": count,
+                    "max_bytes": budget.get("max_bytes"),
+                    "max_entries": budget.get("max_entries")
+                }
+            return usage
+    
+    def _memory_put(self, category, key, data, expires, size):
+        """放入内存缓存层，超出容量时淘汰最久未使用的条目"""
+        self._memory_pop(category, key)
+        if size > self.memory_max_bytes:
+            return
+        self._memory[(category, key)] = (data, expires, size)
+        self._memory_bytes += size
+        while self._memory and (len(self._memory) > self.memory_max_entries or
+                                self._memory_bytes > self.memory_max_bytes):
+            _, (_, _, old_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= old_size
+    
+    def _memory_pop(self, category, key):
+        """从内存缓存层删除条目"""
+        item = self._memory.pop((category, key), None)
+        if item is not None:
+            self._memory_bytes -= item[2]
+    
+    def _memory_clear(self, category=None):
+        """清空内存缓存层（或其中一个类别）"""
+        if category is None:
+            self._memory.clear()
+            self._memory_bytes = 0
+            return
+        for cache_key in [k for k in self._memory if k[0] == category]:
+            self._memory_pop(*cache_key)
+    
+    def _record_access(self, category, key):
+        """记录访问，稍后批量写回"""
+        access = self._pending_access.setdefault((category, key), [0, 0])
+        access[0] = time.time()
+        access[1] += 1
+    
+    def _over_budget(self, category):
+        """检查类别是否超出预算"""
+        budget = self.budgets.get(category, CACHE_DEFAULT_BUDGET)
+        size, count = self._category_totals.get(category, (0, 0))
+        max_bytes = budget.get("max_bytes")
+        max_entries = budget.get("max_entries")
+        return ((max_bytes is not None and size > max_bytes) or
+                (max_entries is not None and count > max_entries))
+    
+    def _evict(self, category, keep=None):
+        """淘汰条目直到类别回到预算内（持有锁时调用）
+        
+        刚写入的条目还没有访问记录，LFU下总是排在最前面，因此最后才淘汰它。
+        
+        Args:
+            category (str): 缓存类别
+            keep (str, optional): 刚写入的缓存键，其他条目不足以回到预算内时才淘汰
+            
+        Returns:
+            int: 淘汰的条目数
+        """
+        if not self._over_budget(category):
+            return 0
+        
+        # 先写回访问记录，保证淘汰顺序准确
+        self._flush_access()
+        
+        evicted = 0
+        order = EVICTION_ORDER[self.eviction_policy]
+        while self._over_budget(category):
+            victims = self._conn.execute(
+                f"SELECT key, size FROM entries WHERE category = ? AND key IS NOT ? "
+                f"ORDER BY (expires IS NOT NULL AND expires <= ?) DESC, {order} LIMIT ?",
+                (category, keep, time.time(), EVICTION_BATCH)
+            ).fetchall()
+            if not victims:
+                if keep is None:
+                    break
+                keep = None
+                continue
+            
+            # 只删除刚好够回到预算内的条目
+            batch = []
+            for key, size in victims:
+                batch.append((category, key))
+                self._adjust_totals(category, -size, -1)
+                if not self._over_budget(category):
+                    break
+            self._conn.executemany("DELETE FROM entries WHERE category = ? AND key = ?", batch)
+            for _, key in batch:
+                self._memory_pop(category, key)
+            evicted += len(batch)
+        
+        self.stats["evictions"] += evicted
+        return evicted
+    
+    def _remove_dir_files(self, category):
+        """删除缓存子目录中的独立文件
+        
+        Args:
+            category (str): 缓存类别
+        """
+        path = os.path.join(self.cache_dir, category)
+        if os.path.exists(path):
+            for item in os.listdir(path):
+                item_path = os.path.join(path, item)
+                if os.path.isfile(item_path):
+                    os.remove(item_path)
     
     def clear_cache(self, category=None):
         """清除缓存
@@ -146,23 +480,20 @@ class CacheManager:
             try:
                 if category is None:
                     # 清除所有缓存
-                    for subdir in ["images", "documents", "thumbnails", "temp"]:
-                        path = os.path.join(self.cache_dir, subdir)
-                        if os.path.exists(path):
-                            for item in os.listdir(path):
-                                item_path = os.path.join(path, item)
-                                if os.path.isfile(item_path):
-                                    os.remove(item_path)
+                    self._conn.execute("DELETE FROM entries")
+                    self._pending_access.clear()
+                    self._memory_clear()
+                    for subdir in CACHE_SUBDIRS:
+                        self._remove_dir_files(subdir)
                 else:
                     # 清除特定类别的缓存
-                    path = os.path.join(self.cache_dir, category)
-                    if os.path.exists(path):
-                        for item in os.listdir(path):
-                            item_path = os.path.join(path, item)
-                            if os.path.isfile(item_path):
-                                os.remove(item_path)
+                    self._conn.execute("DELETE FROM entries WHERE category = ?", (category,))
+                    self._pending_access = {k: v for k, v in self._pending_access.items() if k[0] != category}
+                    self._memory_clear(category)
+                    self._remove_dir_files(category)
                 
                 # 更新统计信息
+                self._reload_totals()
                 self.update_cache_stats()
                 return True
             except Exception as e:
@@ -170,7 +501,7 @@ class CacheManager:
                 return False
     
     def cleanup_old_cache(self, days=7):
-        """清理旧的缓存文件
+        """清理旧的缓存文件和过期条目
         
         Args:
             days (int): 清理超过指定天数的缓存文件
@@ -182,10 +513,23 @@ class CacheManager:
             try:
                 cleaned_count = 0
                 freed_space = 0
-                cutoff_time = time.time() - (days * 24 * 60 * 60)
+                now = time.time()
+                cutoff_time = now - (days * 24 * 60 * 60)
+                
+                # 清理数据库中的旧条目和已过期条目
+                condition = "created < ? OR (expires IS NOT NULL AND expires <= ?)"
+                count, size = self._conn.execute(
+                    f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE {condition}",
+                    (cutoff_time, now)
+                ).fetchone()
+                self._conn.execute(f"DELETE FROM entries WHERE {condition}", (cutoff_time, now))
+                self._reload_totals()
+                self._memory_clear()
+                cleaned_count += count
+                freed_space += size
                 
                 # 遍历缓存目录
-                for subdir in ["images", "documents", "thumbnails", "temp"]:
+                for subdir in CACHE_SUBDIRS:
                     path = os.path.join(self.cache_dir, subdir)
                     if os.path.exists(path):
                         for item in os.listdir(path):
@@ -199,9 +543,8 @@ class CacheManager:
                                     freed_space += file_size
                 
                 # 更新统计信息
-                self.update_cache_stats()
                 self.stats["last_cleanup"] = datetime.now().isoformat()
-                self._save_stats()
+                self.update_cache_stats()
                 
                 return (cleaned_count, freed_space)
             except Exception as e:
@@ -216,46 +559,88 @@ class CacheManager:
             category (str): 缓存类别
         
         Returns:
-            dict or None: 缓存数据
+            object or None: 缓存数据，不存在或已过期时返回None
         """
         with self._cache_lock:
+            # 先查内存缓存层
+            item = self._memory.get((category, key))
+            if item is not None:
+                data, expires, _ = item
+                if expires is None or expires > time.time():
+                    self._memory.move_to_end((category, key))
+                    self._record_access(category, key)
+                    self.stats["memory_hits"] += 1
+                    self._record_stat("cache_hits")
+                    return copy.deepcopy(data)
+                self._memory_pop(category, key)
+            
             try:
-                cache_file = os.path.join(self.cache_dir, category, f"{key}.json")
-                if os.path.exists(cache_file):
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        self.stats["cache_hits"] += 1
-                        self._save_stats()
-                        return data
-                else:
-                    self.stats["cache_misses"] += 1
-                    self._save_stats()
+                row = self._conn.execute(
+                    "SELECT value, size, expires FROM entries WHERE category = ? AND key = ?",
+                    (category, key)
+                ).fetchone()
+                if row is None:
+                    self._record_stat("cache_misses")
+                    return None
+                
+                value, size, expires = row
+                if expires is not None and expires <= time.time():
+                    # 条目已过期，顺便删除
+                    self._conn.execute("DELETE FROM entries WHERE category = ? AND key = ?", (category, key))
+                    self._adjust_totals(category, -size, -1)
+                    self._pending_access.pop((category, key), None)
+                    self._record_stat("cache_misses")
                     return None
+                
+                # 记录访问，稍后批量写回；放入内存缓存层供后续读取
+                self._record_access(category, key)
+                self._record_stat("cache_hits")
+                data = json_util.loads(value)
+                self._memory_put(category, key, copy.deepcopy(data), expires, size)
+                return data
             except Exception as e:
                 print(f"获取缓存失败: {e}")
-                self.stats["cache_misses"] += 1
-                self._save_stats()
+                self._record_stat("cache_misses")
                 return None
     
-    def set_cache_entry(self, key, data, category="documents"):
+    def set_cache_entry(self, key, data, category="documents", ttl=None):
         """设置缓存条目
         
         Args:
             key (str): 缓存键
-            data (dict): 要缓存的数据
+            data: 要缓存的数据（支持BSON类型，如ObjectId、datetime）
             category (str): 缓存类别
+            ttl (float, optional): 有效期（秒），为None时永不过期
         
         Returns:
             bool: 操作是否成功
         """
         with self._cache_lock:
             try:
-                cache_file = os.path.join(self.cache_dir, category, f"{key}.json")
-                with open(cache_file, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2)
+                value = json_util.dumps(data)
+                size = len(value.encode("utf-8"))
+                now = time.time()
+                expires = now + ttl if ttl is not None else None
                 
-                # 更新统计信息
-                self.update_cache_stats()
+                old = self._conn.execute(
+                    "SELECT size FROM entries WHERE category = ? AND key = ?", (category, key)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (category, key, value, size, created, expires, accessed, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                    (category, key, value, size, now, expires, now)
+                )
+                self._pending_access.pop((category, key), None)
+                self._memory_put(category, key, copy.deepcopy(data), expires, size)
+                
+                # 增量更新统计信息
+                if old is None:
+                    self._adjust_totals(category, size, 1)
+                else:
+                    self._adjust_totals(category, size - old[0], 0)
+                
+                # 超出预算时淘汰条目
+                self._evict(category, keep=key)
                 return True
             except Exception as e:
                 print(f"设置缓存失败: {e}")
@@ -273,12 +658,28 @@ class CacheManager:
         """
         with self._cache_lock:
             try:
-                cache_file = os.path.join(self.cache_dir, category, f"{key}.json")
-                if os.path.exists(cache_file):
-                    os.remove(cache_file)
-                    self.update_cache_stats()
-                    return True
-                return False
+                self._memory_pop(category, key)
+                row = self._conn.execute(
+                    "SELECT size FROM entries WHERE category = ? AND key = ?", (category, key)
+                ).fetchone()
+                if row is None:
+                    return False
+                self._conn.execute("DELETE FROM entries WHERE category = ? AND key = ?", (category, key))
+                self._adjust_totals(category, -row[0], -1)
+                self._pending_access.pop((category, key), None)
+                return True
             except Exception as e:
                 print(f"删除缓存失败: {e}")
-                return False 
\ No newline at end of file
+                return False
+    
+    def close(self):
+        """写回统计信息并关闭缓存数据库"""
+        with self._cache_lock:
+            if self._conn is None:
+                return
+            self._save_stats()
+            try:
+                self._conn.close()
+            except sqlite3.Error as e:
+                print(f"关闭缓存数据库失败: {e}")
+            self._conn = None
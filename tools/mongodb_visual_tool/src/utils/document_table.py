@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+MongoDB Visual Tool - Columnar Document Table
+"""
+import datetime
+import sys
+from array import array
+from collections.abc import Sequence
+
+try:
+    from dateutil import parser as date_parser
+except ImportError:
+    date_parser = None
+
+MISSING_TIME = float('-inf')  # importedAt values that cannot be read
+ROW_TYPECODE = 'i'  # Row numbers of views and sort orders
+
+
+def _number(value):
+    """Numeric value of a size field, 0 if missing or not a number"""
+    if isinstance(value, bool) or not value:
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _timestamp(value):
+    """Timestamp of an importedAt value, MISSING_TIME if it cannot be read"""
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    if isinstance(value, str) and date_parser is not None:
+        try:
+            return date_parser.parse(value).timestamp()
+        except Exception:
+            pass
+    return MISSING_TIME
+
+
+class DocumentTable(Sequence):
+    """Loaded documents with the fields the grid sorts on stored as columns
+    
+    Rows keep the document dicts (cards and the list view render them), and
+    an _id -> row map locates them. size and importedAt are kept in arrays of
+    doubles (importedAt is parsed on first use, each distinct string once),
+    artMovement as interned strings. Filtering, sorting and paging work on
+    DocumentView objects, which only hold row numbers, instead of copies of
+    the document list.
+    """
+    
+    def __init__(self, items=()):
+        """Build the table
+        
+        Args:
+            items (iterable): Documents, None entries are skipped
+        """
+        self._docs = [item for item in items if item is not None]
+        self.ids = {}  # str(_id) -> row
+        self.sizes = array('d')
+        self.art_movements = []
+        self._timestamps = None
+        
+        for row, doc in enumerate(self._docs):
+            self.ids[str(doc.get('_id'))] = row
+            self.sizes.append(_number(doc.get('size')))
+            art_movement = doc.get('artMovement')
+            self.art_movements.append(sys.intern(str(art_movement)) if art_movement else "")
+    
+    def __len__(self):
+        return len(self._docs)
+    
+    def __getitem__(self, index):
+        return self._docs[index]
+    
+    def __iter__(self):
+        return iter(self._docs)
+    
+    @property
+    def timestamps(self):
+        """importedAt timestamps by row, MISSING_TIME where it cannot be read"""
+        if self._timestamps is None:
+            parsed = {}
+            timestamps = array('d')
+            for doc in self._docs:
+                value = doc.get('importedAt')
+                if isinstance(value, str):
+                    if value not in parsed:
+                        parsed[value] = _timestamp(value)
+                    timestamps.append(parsed[value])
+                else:
+                    timestamps.append(_timestamp(value))
+            self._timestamps = timestamps
+        return self._timestamps
+    
+    def row_of(self, key):
+        """Row of a document
+        
+        Args:
+            key (str): str() of the document _id
+        
+        Returns:
+            int: Row, None if the document is not in the table
+        """
+        return self.ids.get(key)
+    
+    def view(self, rows=None):
+        """View over some rows of the table
+        
+        Args:
+            rows (sequence, optional): Row numbers in display order, every row in table order if omitted
+        
+        Returns:
+            DocumentView: View
+        """
+        if rows is None:
+            rows = range(len(self._docs))
+        return DocumentView(self, rows)
+    
+    def sort_keys(self, field):
+        """Sort keys of every row for a field
+        
+        Numeric keys are the table columns. Text keys are built on each call
+        and not kept, SortIndex caches the orders computed from them.
+        
+        Args:
+            field (str): filename, importedAt, size or artMovement
+        
+        Returns:
+            sequence: Keys indexed by row, None if the field is not sortable
+        """
+        if field == "size":
+            return self.sizes
+        if field == "importedAt":
+            return self.timestamps
+        if field == "filename":
+            return [str(doc.get("filename") or doc.get("title") or "").lower() for doc in self._docs]
+        if field == "artMovement":
+            lowered = {value: value.lower() for value in set(self.art_movements)}
+            return [lowered[value] for value in self.art_movements]
+        return None
+
+
+class DocumentView(Sequence):
+    """Read-only sequence of documents selected and ordered by row numbers"""
+    
+    def __init__(self, table, rows):
+        """Initialize the view
+        
+        Args:
+            table (DocumentTable): Table holding the documents
+            rows (sequence): Row numbers in display order
+        """
+        self.table = table
+        self.rows = rows
+        self._positions = None  # row -> position, built on the first index_of()
+    
+    def __len__(self):
+        return len(self.rows)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.table[row] for row in self.rows[index]]
+        return self.table[self.rows[index]]
+    
+    def index_of(self, key):
+        """Position of a document in the view
+        
+        Args:
+            key (str): str() of the document _id
+        
+        Returns:
+            int: Position, None if the document is not in the view
+        """
+        row = self.table.row_of(key)
+        if row is None:
+            return None
+        if isinstance(self.rows, range):
+            return self.rows.index(row) if row in self.rows else None
+        if self._positions is None:
+            self._positions = {row: position for position, row in enumerate(self.rows)}
+        return self._positions.get(row)
@@ -4,24 +4,39 @@ Image Loader - Asynchronously load images using threads
 """
 import threading
 import queue
-import time
-import tkinter as tk
 
 class ImageLoader:
-    """Asynchronous image loader using thread pool to load images"""
+    """Asynchronous image loader using a thread pool
     
-    def __init__(self, callback, num_workers=4):
+    Worker threads open and resize the images and produce ready-to-display PIL
+    thumbnails. Only the handoff of the finished thumbnail runs on the Tk thread,
+    scheduled with after(). Each card has at most one live request: queuing a new
+    request for a card, or cancelling it, makes older requests stale so their
+    results are dropped.
+    """
+    
+    def __init__(self, callback, num_workers=4, load_func=None):
         """Initialize image loader
         
         Args:
-            callback (callable): Callback function when image loading completes
+            callback (callable): Called on the Tk thread as callback(card, image, error)
+                when a request completes; image is a PIL image or None on error
             num_workers (int): Number of worker threads
+            load_func (callable, optional): load_func(path, max_width, max_height) returning
+                a PIL image, runs in the worker threads. Defaults to card.load_thumbnail
         """
         self.queue = queue.Queue()
         self.running = True
         self.callback = callback
+        self.load_func = load_func
         self.threads = []
         self.num_workers = num_workers
+        
+        # card -> generation of its live request
+        self._pending = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        
         for _ in range(self.num_workers):
             t = threading.Thread(target=self._process_queue)
             t.daemon = True
@@ -29,13 +44,18 @@ class ImageLoader:
             self.threads.append(t)
     
     def add_task(self, card):
-        """Add image loading task
+        """Add image loading task, superseding any pending request for the card
         
         Args:
             card: Card object containing the image
         """
-        if self._is_widget_valid(card):
-            self.queue.put(card)
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._pending[card] = generation
+        
+        # Capture path and size now, the card may be rebound before a worker runs
+        self.queue.put((card, generation, card.image_path, card.width - 20, card.height - 20))
     
     def queue_image(self, card):
         """Add image loading task (alias for add_task)
@@ -45,51 +65,79 @@ class ImageLoader:
         """
         self.add_task(card)
     
+    def cancel(self, card):
+        """Cancel the pending request of a card (scrolled away or destroyed)
+        
+        Args:
+            card: Card object
+        """
+        with self._lock:
+            self._pending.pop(card, None)
+    
+    def cancel_all(self):
+        """Cancel all pending requests"""
+        with self._lock:
+            self._pending.clear()
+        self.clear_queue()
+    
+    def _is_current(self, card, generation):
+        """Check whether a request is still the live request of its card"""
+        with self._lock:
+            return self._pending.get(card) == generation
+    
     def _process_queue(self):
         """Process image loading tasks from queue"""
         while self.running:
             try:
-                # Get card from queue
-                card = self.queue.get(timeout=0.5)
-                
-                # Check if card is still valid (not destroyed)
-                if not self._is_widget_valid(card):
-                    # Silently skip destroyed cards
-                    self.queue.task_done()
+                card, generation, path, max_width, max_height = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            try:
+                # Silently skip cancelled or superseded requests
+                if not self._is_current(card, generation):
                     continue
                 
-                # Load image
+                image = None
+                error = None
                 try:
-                    success = card.load_image()
-                    
-                    # Call callback (if card and callback are still valid)
-                    if self.callback and self._is_widget_valid(card):
-                        self.callback(card, success)
-                except tk.TclError as e:
-                    if "invalid command name" not in str(e):
-                        print(f"Tkinter error: {str(e)}")
+                    load_func = self.load_func or card.load_thumbnail
+                    image = load_func(path, max_width, max_height)
                 except Exception as e:
-                    print(f"Error loading image: {str(e)}")
-                
-                # Mark task as done
-                self.queue.task_done()
+                    error = e
                 
-                # Brief pause to reduce CPU load
-                time.sleep(0.005)
-            except queue.Empty:
-                # Queue empty, wait for new tasks
-                time.sleep(0.05)
+                if self._is_current(card, generation):
+                    self._deliver(card, generation, image, error)
             except Exception as e:
                 print(f"Image loading error: {str(e)}")
-                # Continue processing next task
-                continue
+            finally:
+                # Mark task as done
+                self.queue.task_done()
+    
+    def _deliver(self, card, generation, image, error):
+        """Hand a finished thumbnail over to the Tk thread"""
+        try:
+            card.after(0, self._finish, card, generation, image, error)
+        except Exception:
+            # Card destroyed or Tk already shut down
+            self.cancel(card)
+    
+    def _finish(self, card, generation, image, error):
+        """Run the callback on the Tk thread if the request is still live"""
+        with self._lock:
+            if self._pending.get(card) != generation:
+                return
+            del self._pending[card]
+        
+        if self.callback and self._is_widget_valid(card):
+            self.callback(card, image, error)
     
     def _is_widget_valid(self, widget):
         """Check if widget is still valid (not destroyed)
         
         Args:
             widget: Tkinter widget
-            
+        
         Returns:
             bool: Whether valid
         """
@@ -101,19 +149,25 @@ class ImageLoader:
     def stop(self):
         """Stop the image loader"""
         self.running = False
+        self.cancel_all()
         for t in self.threads:
             if t.is_alive():
                 t.join(timeout=1.0)
-            
+    
     def clear_queue(self):
         """Clear all tasks from the queue"""
         with self.queue.mutex:
+            # Only drop queued items, tasks already taken by a worker still call task_done()
+            dropped = len(self.queue.queue)
             self.queue.queue.clear()
-            
+            self.queue.unfinished_tasks -= dropped
+            if self.queue.unfinished_tasks <= 0:
+                self.queue.all_tasks_done.notify_all()
+    
     def get_queue_size(self):
         """Get number of pending tasks in the queue
         
         Returns:
             int: Queue size
         """
-        return self.queue.qsize() 
\ No newline at end of file
+        return self.queue.qsize()
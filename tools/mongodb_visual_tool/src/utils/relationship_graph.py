@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+MongoDB Visual Tool - In-Memory Relationship Graph
+"""
+import json
+import os
+import threading
+from array import array
+from collections import Counter, deque
+
+GRAPH_COMPACT_THRESHOLD = 4096  # Edge changes kept in the delta before the CSR arrays are rebuilt
+INFLUENCED_BY = "Influenced By"  # source was influenced by target
+INFLUENCED = "Influenced"  # source influenced target
+ART_STYLE_COLLECTION = "artStyles"  # Collection name of the nodes read from the art movement data files
+
+
+def load_art_movement_edges(data_dir, collection=ART_STYLE_COLLECTION):
+    """Influence edges of the art movement data files
+    
+    connections.json holds source -> target influence edges between style ids.
+    artStyles.json lists, per style, the titles of what influenced it in
+    influences and influencedBy; titles of other styles are resolved to their
+    id, other influences (artists, events) become nodes of their own.
+    
+    Args:
+        data_dir (str): Directory containing connections.json and artStyles.json
+        collection (str): Collection part of the node keys
+    
+    Returns:
+        list: (source key, target key, relationship type) edges, keys are (collection, id)
+    """
+    edges = []
+    connections_path = os.path.join(data_dir, "connections.json")
+    if os.path.exists(connections_path):
+        with open(connections_path, "r", encoding="utf-8") as f:
+            for connection in json.load(f):
+                if connection.get("source") and connection.get("target"):
+                    edges.append(((collection, connection["source"]), (collection, connection["target"]), INFLUENCED))
+    
+    styles_path = os.path.join(data_dir, "artStyles.json")
+    if os.path.exists(styles_path):
+        with open(styles_path, "r", encoding="utf-8") as f:
+            styles = json.load(f)
+        ids_by_title = {style.get("title"): style.get("id") for style in styles if style.get("id")}
+        for style in styles:
+            if not style.get("id"):
+                continue
+            influencers = dict.fromkeys(style.get("influences", []) + style.get("influencedBy", []))
+            for title in influencers:
+                edges.append(((collection, style["id"]), (collection, ids_by_title.get(title, title)), INFLUENCED_BY))
+    return edges
+
+
+def _build_csr(count, sources, targets, types):
+    """Compressed sparse rows of an edge list
+    
+    Returns:
+        tuple: (offsets, neighbours, types), the edges of node n are at
+            offsets[n]:offsets[n + 1] of neighbours and types
+    """
+    offsets = array('i', [0]) * (count + 1)
+    for source in sources:
+        offsets[source + 1] += 1
+    for node in range(count):
+        offsets[node + 1] += offsets[node]
+    
+    neighbours = array('i', [0]) * len(sources)
+    edge_types = array('H', [0]) * len(sources)
+    cursor = offsets[:-1]
+    for source, target, edge_type in zip(sources, targets, types):
+        position = cursor[source]
+        neighbours[position] = target
+        edge_types[position] = edge_type
+        cursor[source] = position + 1
+    return offsets, neighbours, edge_types
+
+
+class RelationshipGraph:
+    """Typed, directed relationship edges held in memory for multi-hop queries
+    
+    Node keys (e.g. (collection, str(_id))) and relationship types are
+    interned to integers. Edges are stored twice in compressed sparse row
+    arrays, by source (outbound) and by target (inbound), so neighbours in
+    either direction are a slice of an array.
+    
+    Edges added or removed after the arrays are built go to a delta: added
+    edges in per-node lists, removed ones as tombstones that are skipped
+    while reading the arrays. The arrays are rebuilt once the delta holds
+    GRAPH_COMPACT_THRESHOLD changes.
+    """
+    
+    def __init__(self, edges=()):
+        """Build the graph
+        
+        Args:
+            edges (iterable): (source key, target key, relationship type) edges
+        """
+        self._node_ids = {}  # node key -> int
+        self._nodes = []  # int -> node key
+        self._type_ids = {}  # relationship type -> int
+        self._types = []  # int -> relationship type
+        self._lock = threading.RLock()
+        
+        sources = array('i')
+        targets = array('i')
+        types = array('H')
+        for source, target, rel_type in edges:
+            sources.append(self._intern(source))
+            targets.append(self._intern(target))
+            types.append(self._intern_type(rel_type))
+        self._influenced_by = self._intern_type(INFLUENCED_BY)
+        self._influenced = self._intern_type(INFLUENCED)
+        self._build(sources, targets, types)
+    
+    def _intern(self, key):
+        """Integer id of a node key, added if new"""
+        node = self._node_ids.get(key)
+        if node is None:
+            node = self._node_ids[key] = len(self._nodes)
+            self._nodes.append(key)
+        return node
+    
+    def _intern_type(self, rel_type):
+        """Integer id of a relationship type, added if new"""
+        type_id = self._type_ids.get(rel_type)
+        if type_id is None:
+            type_id = self._type_ids[rel_type] = len(self._types)
+            self._types.append(rel_type)
+        return type_id
+    
+    def _build(self, sources, targets, types):
+        """Rebuild both CSR arrays from an edge list and clear the delta"""
+        self._csr_nodes = len(self._nodes)
+        self._out = _build_csr(self._csr_nodes, sources, targets, types)
+        self._in = _build_csr(self._csr_nodes, targets, sources, types)
+        self._edge_count = len(sources)
+        self._added_out = {}  # node -> [(target, type)] added since the build
+        self._added_in = {}  # node -> [(source, type)] added since the build
+        self._removed = Counter()  # (source, target, type) -> array edges removed since the build
+        self._changes = 0
+    
+    def __len__(self):
+        """Number of edges"""
+        return self._edge_count
+    
+    @property
+    def node_count(self):
+        """Number of nodes, including nodes whose edges were all removed"""
+        return len(self._nodes)
+    
+    def __contains__(self, key):
+        return key in self._node_ids
+    
+    def _edges(self, node, outbound):
+        """(neighbour, type) pairs of a node's current edges in one direction"""
+        csr = self._out if outbound else self._in
+        added = self._added_out if outbound else self._added_in
+        if node < self._csr_nodes:
+            offsets, neighbours, types = csr
+            start, end = offsets[node], offsets[node + 1]
+            if not self._removed:
+                yield from zip(neighbours[start:end], types[start:end])
+            else:
+                skipped = Counter()
+                for position in range(start, end):
+                    neighbour, edge_type = neighbours[position], types[position]
+                    edge = (node, neighbour, edge_type) if outbound else (neighbour, node, edge_type)
+                    if self._removed[edge] > skipped[edge]:
+                        skipped[edge] += 1
+                        continue
+                    yield neighbour, edge_type
+        yield from added.get(node, ())
+    
+    def _count_array_edges(self, source, target, edge_type):
+        """Occurrences of an edge in the CSR arrays"""
+        if source >= self._csr_nodes:
+            return 0
+        offsets, neighbours, types = self._out
+        return sum(1 for position in range(offsets[source], offsets[source + 1])
+                   if neighbours[position] == target and types[position] == edge_type)
+    
+    def add_edge(self, source, target, rel_type):
+        """Add an edge
+        
+        Args:
+            source: Source node key
+            target: Target node key
+            rel_type (str): Relationship type
+        """
+        with self._lock:
+            source_id = self._intern(source)
+            target_id = self._intern(target)
+            type_id = self._intern_type(rel_type)
+            edge = (source_id, target_id, type_id)
+            if self._removed[edge]:
+                # Revive a removed array edge instead of growing the delta
+                self._removed[edge] -= 1
+                if not self._removed[edge]:
+                    del self._removed[edge]
+            else:
+                self._added_out.setdefault(source_id, []).append((target_id, type_id))
+                self._added_in.setdefault(target_id, []).append((source_id, type_id))
+            self._edge_count += 1
+            self._changed()
+    
+    def remove_edge(self, source, target, rel_type):
+        """Remove one edge
+        
+        Args:
+            source: Source node key
+            target: Target node key
+            rel_type (str): Relationship type
+        
+        Returns:
+            bool: Whether the edge was in the graph
+        """
+        with self._lock:
+            source_id = self._node_ids.get(source)
+            target_id = self._node_ids.get(target)
+            type_id = self._type_ids.get(rel_type)
+            if source_id is None or target_id is None or type_id is None:
+                return False
+            
+            added = self._added_out.get(source_id, [])
+            if (target_id, type_id) in added:
+                added.remove((target_id, type_id))
+                self._added_in[target_id].remove((source_id, type_id))
+            else:
+                edge = (source_id, target_id, type_id)
+                if self._count_array_edges(*edge) <= self._removed[edge]:
+                    return False
+                self._removed[edge] += 1
+            self._edge_count -= 1
+            self._changed()
+            return True
+    
+    def _changed(self):
+        """Count a delta change and rebuild the arrays when the delta is large"""
+        self._changes += 1
+        if self._changes >= GRAPH_COMPACT_THRESHOLD:
+            self.compact()
+    
+    def compact(self):
+        """Merge the delta into rebuilt CSR arrays"""
+        with self._lock:
+            sources = array('i')
+            targets = array('i')
+            types = array('H')
+            for node in range(len(self._nodes)):
+                for target, edge_type in self._edges(node, True):
+                    sources.append(node)
+                    targets.append(target)
+                    types.append(edge_type)
+            self._build(sources, targets, types)
+    
+    def _type_filter(self, types):
+        """Set of type ids for a list of relationship types, None for every type"""
+        if types is None:
+            return None
+        return {self._type_ids[rel_type] for rel_type in types if rel_type in self._type_ids}
+    
+    def _neighbours(self, node, direction, type_ids):
+        """Neighbour ids of a node: direction is "out", "in" or "both" """
+        if direction in ("out", "both"):
+            for neighbour, edge_type in self._edges(node, True):
+                if type_ids is None or edge_type in type_ids:
+                    yield neighbour
+        if direction in ("in", "both"):
+            for neighbour, edge_type in self._edges(node, False):
+                if type_ids is None or edge_type in type_ids:
+                    yield neighbour
+    
+    def _influencers(self, node):
+        """Nodes that influenced a node: Influenced By edges out of it, Influenced edges into it"""
+        for neighbour, edge_type in self._edges(node, True):
+            if edge_type == self._influenced_by:
+                yield neighbour
+        for neighbour, edge_type in self._edges(node, False):
+            if edge_type == self._influenced:
+                yield neighbour
+    
+    def _influencees(self, node):
+        """Nodes a node influenced, the reverse of _influencers"""
+        for neighbour, edge_type in self._edges(node, True):
+            if edge_type == self._influenced:
+                yield neighbour
+        for neighbour, edge_type in self._edges(node, False):
+            if edge_type == self._influenced_by:
+                yield neighbour
+    
+    def _bfs(self, start, expand, max_depth=None, goal=None):
+        """Breadth-first search from a node id
+        
+        Returns:
+            dict: Reached node id -> (depth, parent id), in visiting order
+        """
+        reached = {start: (0, None)}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            depth = reached[node][0]
+            if node == goal or (max_depth is not None and depth >= max_depth):
+                continue
+            for neighbour in expand(node):
+                if neighbour not in reached:
+                    reached[neighbour] = (depth + 1, node)
+                    if neighbour == goal:
+                        return reached
+                    queue.append(neighbour)
+        return reached
+    
+    def _path(self, reached, goal):
+        """Node keys from the search start to goal"""
+        path = []
+        node = goal
+        while node is not None:
+            path.append(self._nodes[node])
+            node = reached[node][1]
+        return path[::-1]
+    
+    def k_hop(self, key, k, direction="both", types=None):
+        """Nodes within k hops of a node
+        
+        Args:
+            key: Start node key
+            k (int): Maximum number of hops
+            direction (str): "out", "in" or "both"
+            types (list, optional): Relationship types followed, every type if omitted
+        
+        Returns:
+            dict: Node key -> hops, nearest first, the start node excluded
+        """
+        with self._lock:
+            start = self._node_ids.get(key)
+            if start is None:
+                return {}
+            type_ids = self._type_filter(types)
+            reached = self._bfs(start, lambda node: self._neighbours(node, direction, type_ids), max_depth=k)
+            return {self._nodes[node]: depth for node, (depth, _) in reached.items() if node != start}
+    
+    def shortest_path(self, source, target, direction="both", types=None):
+        """Fewest-hop path between two nodes
+        
+        Args:
+            source: Start node key
+            target: End node key
+            direction (str): "out", "in" or "both"
+            types (list, optional): Relationship types followed, every type if omitted
+        
+        Returns:
+            list: Node keys from source to target, None if target cannot be reached
+        """
+        with self._lock:
+            start = self._node_ids.get(source)
+            goal = self._node_ids.get(target)
+            if start is None or goal is None:
+                return None
+            type_ids = self._type_filter(types)
+            reached = self._bfs(start, lambda node: self._neighbours(node, direction, type_ids), goal=goal)
+            return self._path(reached, goal) if goal in reached else None
+    
+    def influence_chain(self, key, max_depth=None):
+        """What influenced a node, transitively
+        
+        Follows Influenced By edges forwards and Influenced edges backwards.
+        
+        Args:
+            key: Node key
+            max_depth (int, optional): Maximum chain length, unlimited if omitted
+        
+        Returns:
+            list: (node key, depth) of the influences, nearest first
+        """
+        with self._lock:
+            start = self._node_ids.get(key)
+            if start is None:
+                return []
+            reached = self._bfs(start, self._influencers, max_depth=max_depth)
+            return [(self._nodes[node], depth) for node, (depth, _) in reached.items() if node != start]
+    
+    def shortest_influence_path(self, source, target):
+        """Shortest chain of influence from one node to another
+        
+        Args:
+            source: Node key of the influence
+            target: Node key of the influenced node
+        
+        Returns:
+            list: Node keys from source to target, each influencing the next,
+                None if source did not influence target
+        """
+        with self._lock:
+            start = self._node_ids.get(source)
+            goal = self._node_ids.get(target)
+            if start is None or goal is None:
+                return None
+            reached = self._bfs(start, self._influencees, goal=goal)
+            return self._path(reached, goal) if goal in reached else None
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+MongoDB Visual Tool - Fuzzy Search Index
+"""
+import bisect
+import math
+import threading
+from collections import OrderedDict
+
+from rapidfuzz import fuzz, process
+
+try:
+    import numpy  # noqa: F401 (rapidfuzz.process.cdist returns numpy arrays)
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+SEARCH_SCORE_CUTOFF = 70
+SEARCH_CHUNK_SIZE = 4096  # Choices scored between two cancellation checks
+SEARCH_RESULT_CACHE_SIZE = 32  # Queries whose matches are memoized per index
+SEARCH_RETAIN_CUTOFF = 40  # Full scans keep near matches down to this score for later narrowing
+
+
+def document_search_strings(item):
+    """Lower-cased strings of a document that take part in fuzzy search
+    
+    filename, title, artMovement, metadata keys and values and every direct
+    string/number field, the same fields the grid has always searched.
+    
+    Args:
+        item (dict): Document
+    
+    Returns:
+        list: Unique search strings
+    """
+    strings = [
+        str(item.get('filename', '')).lower(),
+        str(item.get('title', '')).lower(),
+        str(item.get('artMovement', '')).lower(),
+    ]
+    metadata = item.get('metadata')
+    if isinstance(metadata, dict):
+        for key, value in metadata.items():
+            strings.append(str(key).lower())
+            strings.append(str(value).lower())
+    for value in item.values():
+        if isinstance(value, (str, int, float)):
+            strings.append(str(value).lower())
+    return list(dict.fromkeys(strings))
+
+
+def narrowed_cutoff(cutoff, length):
+    """Score down to which a narrowed search is exact
+    
+    partial_ratio is not monotonic in the query length, but it is bounded:
+    adding one character at either end of a query raises the longest common
+    subsequence with any window by at most one. If every string scoring at
+    least cutoff against a query of the given length is known, rescoring
+    only those (and the strings not longer than the extended query, which
+    partial_ratio aligns the other way round) finds every string scoring at
+    least the returned value against the extended query.
+    
+    Args:
+        cutoff (float): Score down to which the matches of the shorter query are complete
+        length (int): Length of the shorter query
+    
+    Returns:
+        int: Lowest exact score of the extended query, above 100 if narrowing is useless
+    """
+    n = length
+    for score in range(math.ceil(cutoff), 101):
+        # Full windows: n + 1 characters against the query's window of n
+        common = math.ceil(score * (n + 1) / 100 - 1e-9)
+        exact = 100 * (common - 1) / n >= cutoff + 1e-6
+        # Windows at the string ends shorter than the extended query
+        for width in range(1, n + 1):
+            common = math.ceil(score * (n + 1 + width) / 200 - 1e-9)
+            if common <= width and 200 * (common - 1) / (n + width) < cutoff + 1e-6:
+                exact = False
+        if exact:
+            return score
+    return 101
+
+
+class SearchIndex:
+    """Precomputed search corpus over a list of documents
+    
+    Every distinct string of the corpus is scored once per query with
+    rapidfuzz.process (cdist on all cores when numpy is available), and a
+    document's score is the best score of its strings. Results are ranked by
+    score, ties keep the document order.
+    
+    The scores of the last SEARCH_RESULT_CACHE_SIZE queries are kept in an
+    LRU: repeating a query (e.g. after backspacing) is a lookup, and a query
+    that extends a cached one by a character only rescores that query's near
+    matches, as long as narrowed_cutoff shows the result stays exact. Full
+    scans keep the near matches down to SEARCH_RETAIN_CUTOFF for this.
+    """
+    
+    def __init__(self, items=(), score_cutoff=SEARCH_SCORE_CUTOFF, workers=-1):
+        """Build the corpus
+        
+        Args:
+            items (iterable): Documents, None entries are skipped
+            score_cutoff (int): Minimum partial_ratio score of a match
+            workers (int): Threads used by cdist, -1 for all cores
+        """
+        self.score_cutoff = score_cutoff
+        self.workers = workers
+        self.items = [item for item in items if item is not None]
+        self._choices = []  # Distinct search strings
+        self._owners = []  # Per choice: indexes of the documents containing it
+        self._results = OrderedDict()  # query -> ({choice position: score}, complete down to score), LRU order
+        self._lock = threading.Lock()
+        
+        positions = {}
+        for index, item in enumerate(self.items):
+            for text in document_search_strings(item):
+                position = positions.get(text)
+                if position is None:
+                    position = positions[text] = len(self._choices)
+                    self._choices.append(text)
+                    self._owners.append([])
+                self._owners[position].append(index)
+        
+        # Choice positions ordered by string length, for the short strings of narrowed searches
+        self._by_length = sorted(range(len(self._choices)), key=lambda position: len(self._choices[position]))
+        self._lengths = [len(self._choices[position]) for position in self._by_length]
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def _score_choices(self, query, positions, cutoff):
+        """Score the choices at positions against query
+        
+        Args:
+            query (str): Lower-cased query
+            positions (range or list): Choice positions
+            cutoff (float): Minimum score kept
+        
+        Returns:
+            list: (choice position, score) pairs at or above the cutoff
+        """
+        if isinstance(positions, range):
+            choices = self._choices[positions.start:positions.stop]
+        else:
+            choices = [self._choices[position] for position in positions]
+        if HAS_NUMPY:
+            scores = process.cdist([query], choices, scorer=fuzz.partial_ratio,
+                                   score_cutoff=cutoff, workers=self.workers)[0]
+            return [(positions[int(i)], scores[i]) for i in scores.nonzero()[0]]
+        matches = process.extract(query, choices, scorer=fuzz.partial_ratio,
+                                  score_cutoff=cutoff, limit=None)
+        return [(positions[i], score) for _, score, i in matches]
+    
+    def _cached_matches(self, query, narrow):
+        """Memoized matches of query, or the positions to rescore when it extends a cached query
+        
+        Returns:
+            tuple: (matches or None, positions to rescore or None for a full scan, score down to
+                which rescoring the positions is exact)
+        """
+        with self._lock:
+            if query in self._results:
+                self._results.move_to_end(query)
+                return self._results[query][0], None, None
+            if not narrow or len(query) < 2:
+                return None, None, None
+            for base in (query[:-1], query[1:]):
+                if base not in self._results:
+                    continue
+                matches, complete = self._results[base]
+                cutoff = narrowed_cutoff(complete, len(base))
+                if cutoff <= self.score_cutoff:
+                    self._results.move_to_end(base)
+                    positions = set(matches)
+                    break
+            else:
+                return None, None, None
+        
+        short = bisect.bisect_right(self._lengths, len(query))
+        positions.update(self._by_length[:short])
+        return None, sorted(positions), cutoff
+    
+    def _remember(self, query, matches, complete):
+        """Store the matches of a query in the LRU"""
+        with self._lock:
+            self._results[query] = (matches, complete)
+            self._results.move_to_end(query)
+            while len(self._results) > SEARCH_RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+    
+    def search(self, query, cancelled=None, narrow=True):
+        """Documents matching query, best matches first
+        
+        Args:
+            query (str): Search text
+            cancelled (callable, optional): Checked between chunks, the search stops when it returns True
+            narrow (bool): Rescore only the near matches of a cached query that query extends, when exact
+        
+        Returns:
+            list: Matching documents, None if cancelled
+        """
+        ranked = self.search_positions(query, cancelled, narrow)
+        if ranked is None:
+            return None
+        return [self.items[index] for index in ranked]
+    
+    def search_positions(self, query, cancelled=None, narrow=True):
+        """Positions in items of the documents matching query, best matches first
+        
+        Same arguments as search(), for callers that keep the documents in a
+        DocumentTable built from the same items.
+        
+        Returns:
+            list: Document positions, None if cancelled
+        """
+        best = self.search_scores(query, cancelled, narrow)
+        if best is None:
+            return None
+        return sorted(best, key=lambda index: (-best[index], index))
+    
+    def search_scores(self, query, cancelled=None, narrow=True):
+        """Best score of every document matching query
+        
+        Same arguments as search(), for callers that merge the results of
+        several indexes.
+        
+        Returns:
+            dict: Document position -> score, None if cancelled
+        """
+        query = query.lower()
+        if not query or not self._choices:
+            return {}
+        
+        matches, positions, cutoff = self._cached_matches(query, narrow)
+        if matches is None:
+            if positions is None:
+                positions = range(len(self._choices))
+                cutoff = min(self.score_cutoff, SEARCH_RETAIN_CUTOFF)
+            matches = {}
+            for start in range(0, len(positions), SEARCH_CHUNK_SIZE):
+                if cancelled and cancelled():
+                    return None
+                matches.update(self._score_choices(query, positions[start:start + SEARCH_CHUNK_SIZE], cutoff))
+            self._remember(query, matches, cutoff)
+        
+        best = {}
+        for position, score in matches.items():
+            if score < self.score_cutoff:
+                continue
+            for index in self._owners[position]:
+                if score > best.get(index, -1):
+                    best[index] = score
+        return best
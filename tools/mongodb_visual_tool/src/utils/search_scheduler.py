@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+MongoDB Visual Tool - Debounced Background Search Scheduler
+"""
+import threading
+import traceback
+
+from ..config.settings import SEARCH_DEBOUNCE_MS
+
+
+class SearchScheduler:
+    """Run searches off the Tk thread, only the latest one is applied
+    
+    submit() restarts a debounce timer. When it fires, prepare(query) runs on
+    the Tk thread and returns a job; job(cancelled) runs in a worker thread and
+    its result is handed to on_result(query, result) on the Tk thread. Every
+    submit or cancel bumps a generation: older jobs see cancelled() return
+    True and their results are dropped.
+    """
+    
+    def __init__(self, widget, prepare, on_result, delay_ms=SEARCH_DEBOUNCE_MS):
+        """Initialize scheduler
+        
+        Args:
+            widget: Tk widget used for after() scheduling
+            prepare (callable): prepare(query) -> job, called on the Tk thread
+            on_result (callable): on_result(query, result), called on the Tk thread
+            delay_ms (int): Debounce delay
+        """
+        self.widget = widget
+        self.prepare = prepare
+        self.on_result = on_result
+        self.delay_ms = delay_ms
+        self._generation = 0
+        self._timer = None
+    
+    def submit(self, query, delay_ms=None):
+        """Schedule a search, replacing any pending or running one
+        
+        Args:
+            query (str): Search text
+            delay_ms (int, optional): Debounce delay, 0 starts on the next idle cycle
+        """
+        self.cancel()
+        delay = self.delay_ms if delay_ms is None else delay_ms
+        generation = self._generation
+        self._timer = self.widget.after(delay, self._start, query, generation)
+    
+    def cancel(self):
+        """Drop the pending search and cancel the running one"""
+        self._generation += 1
+        if self._timer is not None:
+            try:
+                self.widget.after_cancel(self._timer)
+            except Exception:
+                pass
+            self._timer = None
+    
+    def is_current(self, generation):
+        """Whether a search generation is still the latest"""
+        return generation == self._generation
+    
+    def _start(self, query, generation):
+        """Debounce elapsed: prepare the job and run it in a worker thread"""
+        self._timer = None
+        if not self.is_current(generation):
+            return
+        job = self.prepare(query)
+        cancelled = lambda: not self.is_current(generation)
+        threading.Thread(target=self._run, args=(job, query, generation, cancelled), daemon=True).start()
+    
+    def _run(self, job, query, generation, cancelled):
+        """Worker thread"""
+        try:
+            result = job(cancelled)
+        except Exception as e:
+            print(f"Search failed for '{query}': {str(e)}")
+            traceback.print_exc()
+            return
+        if result is None or cancelled():
+            return
+        self.widget.after(0, self._deliver, query, generation, result)
+    
+    def _deliver(self, query, generation, result):
+        """Apply the result on the Tk thread if no newer search started"""
+        if self.is_current(generation):
+            self.on_result(query, result)
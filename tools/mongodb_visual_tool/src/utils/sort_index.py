@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+MongoDB Visual Tool - Cached Sort Orders
+"""
+import threading
+from array import array
+
+from .document_table import DocumentTable, DocumentView, MISSING_TIME, ROW_TYPECODE
+
+
+class SortIndex:
+    """Sorted row orders of a DocumentTable
+    
+    Sort keys are the columns of the table, computed once per document. The
+    sorted permutation is cached per (field, direction), so switching the sort
+    order back and forth is a lookup. Views over some of the rows, e.g.
+    search results, are ordered by the rank of their rows in the cached
+    permutation instead of being sorted by key again.
+    """
+    
+    def __init__(self, table=None):
+        """Initialize the index
+        
+        Args:
+            table (DocumentTable, optional): Documents, in load order (ties keep this order)
+        """
+        self.table = table if table is not None else DocumentTable()
+        self._orders = {}  # (field, reverse) -> array of rows in sort order
+        self._views = {}  # (field, reverse) -> DocumentView over the order, keeps its position index
+        self._ranks = {}  # (field, reverse) -> array of the rank of every row
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self.table)
+    
+    def order(self, field, reverse=False):
+        """Rows of the table in sort order
+        
+        Args:
+            field (str): Sort field
+            reverse (bool): Descending order
+        
+        Returns:
+            array: Rows, None if the field is not sortable
+        """
+        with self._lock:
+            order = self._orders.get((field, reverse))
+            if order is None:
+                keys = self.table.sort_keys(field)
+                if keys is None:
+                    return None
+                rows = range(len(keys))
+                if field == "importedAt":
+                    # Unreadable times sort first in both directions
+                    missing = [row for row in rows if keys[row] == MISSING_TIME]
+                    present = [row for row in rows if keys[row] != MISSING_TIME]
+                    order = missing + sorted(present, key=keys.__getitem__, reverse=reverse)
+                else:
+                    order = sorted(rows, key=keys.__getitem__, reverse=reverse)
+                order = self._orders[(field, reverse)] = array(ROW_TYPECODE, order)
+            return order
+    
+    def sorted_view(self, field, reverse=False):
+        """All documents in sort order
+        
+        Args:
+            field (str): Sort field
+            reverse (bool): Descending order
+        
+        Returns:
+            DocumentView: View, None if the field is not sortable
+        """
+        view = self._views.get((field, reverse))
+        if view is None:
+            order = self.order(field, reverse)
+            if order is None:
+                return None
+            view = self._views[(field, reverse)] = self.table.view(order)
+        return view
+    
+    def sort_view(self, view, field, reverse=False):
+        """Order a view of the table like the whole table
+        
+        Args:
+            view (DocumentView): View of this index's table, e.g. search results
+            field (str): Sort field
+            reverse (bool): Descending order
+        
+        Returns:
+            DocumentView: Sorted view, None if the field is not sortable or the
+                view belongs to another table
+        """
+        if not isinstance(view, DocumentView) or view.table is not self.table:
+            return None
+        order = self.order(field, reverse)
+        if order is None:
+            return None
+        with self._lock:
+            ranks = self._ranks.get((field, reverse))
+            if ranks is None:
+                ranks = array(ROW_TYPECODE, [0]) * len(order)
+                for rank, row in enumerate(order):
+                    ranks[row] = rank
+                self._ranks[(field, reverse)] = ranks
+        return self.table.view(array(ROW_TYPECODE, sorted(view.rows, key=ranks.__getitem__)))
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Thumbnail Cache - Persistent on-disk store for card thumbnails
+"""
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from PIL import Image, features
+
+from ..config.settings import THUMBNAIL_CACHE_MAX_BYTES, THUMBNAIL_CACHE_QUALITY
+
+
+class ThumbnailCache:
+    """Size-bounded LRU store of encoded thumbnails
+    
+    Entries are keyed by (resolved path, mtime, file size, target size), so an
+    edited or replaced original gets a new key and the old thumbnail simply ages
+    out. Recency is kept in memory and mirrored to the file mtime, which lets the
+    LRU order be rebuilt from a directory scan on startup.
+    """
+    
+    def __init__(self, cache_dir=None, max_bytes=THUMBNAIL_CACHE_MAX_BYTES, quality=THUMBNAIL_CACHE_QUALITY):
+        """Initialize thumbnail cache
+        
+        Args:
+            cache_dir (str, optional): Directory for thumbnail files, defaults to cache/thumbnails
+            max_bytes (int): Maximum total size of the stored thumbnails
+            quality (int): Encoder quality for WebP/JPEG
+        """
+        if cache_dir is None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            cache_dir = os.path.join(base_dir, "cache", "thumbnails")
+        
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.quality = quality
+        
+        # WebP is smaller, fall back to JPEG if Pillow was built without it
+        if features.check("webp"):
+            self.format, self.extension = "WEBP", ".webp"
+        else:
+            self.format, self.extension = "JPEG", ".jpg"
+        
+        # key -> file size, least recently used first
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        
+        # Background batch generation
+        self._batch_thread = None
+        self._batch_stop = threading.Event()
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._remove_temp_files()
+        self._load_index()
+    
+    def _remove_temp_files(self):
+        """Delete .tmp files left by writes interrupted by a crash (startup only, no writer runs yet)"""
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith(".tmp"):
+                        try:
+                            os.remove(entry.path)
+                        except OSError:
+                            pass
+        except OSError as e:
+            print(f"Failed to scan thumbnail cache: {str(e)}")
+    
+    def _load_index(self):
+        """Rebuild the LRU index from the files on disk"""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.is_file() or not entry.name.endswith((".webp", ".jpg")):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, entry.name, stat.st_size))
+        except OSError as e:
+            print(f"Failed to scan thumbnail cache: {str(e)}")
+        
+        entries.sort()
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            for _, name, size in entries:
+                self._entries[name] = size
+                self._total_bytes += size
+            self._evict()
+    
+    def reset(self):
+        """Reload the index, e.g. after the thumbnails directory was cleared"""
+        self._load_index()
+    
+    def make_key(self, path, max_width, max_height):
+        """Build the cache file name of a thumbnail
+        
+        Args:
+            path (str): Resolved image path
+            max_width (int): Thumbnail width
+            max_height (int): Thumbnail height
+        
+        Returns:
+            str: File name, or None if the original cannot be stat'ed
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        raw = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{max_width}x{max_height}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest() + self.extension
+    
+    def get(self, key):
+        """Read a cached thumbnail
+        
+        Args:
+            key (str): Key from make_key
+        
+        Returns:
+            PIL.Image.Image: Decoded thumbnail, or None on miss
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        
+        file_path = os.path.join(self.cache_dir, key)
+        try:
+            with Image.open(file_path) as img:
+                img.load()
+                image = img.copy()
+            # Persist recency for the next startup
+            os.utime(file_path)
+        except (OSError, ValueError):
+            # Deleted behind our back or corrupt, treat as a miss
+            self._drop(key)
+            with self._lock:
+                self.misses += 1
+            return None
+        
+        with self._lock:
+            self.hits += 1
+        return image
+    
+    def put(self, key, image):
+        """Store a thumbnail
+        
+        Args:
+            key (str): Key from make_key
+            image (PIL.Image.Image): Thumbnail to encode
+        """
+        if self.format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        elif image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+        
+        file_path = os.path.join(self.cache_dir, key)
+        tmp_path = f"{file_path}.{threading.get_ident()}.tmp"
+        try:
+            image.save(tmp_path, self.format, quality=self.quality)
+            os.replace(tmp_path, file_path)
+            size = os.path.getsize(file_path)
+        except (OSError, ValueError) as e:
+            print(f"Failed to write thumbnail {key}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict()
+    
+    def get_thumbnail(self, path, max_width, max_height, render):
+        """Return the thumbnail of an image, rendering and storing it on a miss
+        
+        Args:
+            path (str): Resolved image path
+            max_width (int): Thumbnail width
+            max_height (int): Thumbnail height
+            render (callable): render(path, max_width, max_height) producing a PIL image
+        
+        Returns:
+            PIL.Image.Image: Thumbnail
+        """
+        key = self.make_key(path, max_width, max_height)
+        if key is None:
+            return render(path, max_width, max_height)
+        
+        image = self.get(key)
+        if image is None:
+            image = render(path, max_width, max_height)
+            self.put(key, image)
+        return image
+    
+    def _drop(self, key):
+        """Forget an entry whose file is gone"""
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+    
+    def _evict(self):
+        """Remove least recently used files until under the size cap (lock held)"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(os.path.join(self.cache_dir, key))
+            except OSError:
+                pass
+    
+    def get_stats(self):
+        """Get cache statistics
+        
+        Returns:
+            dict: Entry count, total size, hits and misses
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "total_size": self._total_bytes,
+                "max_size": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+    
+    def generate_batch(self, paths, max_width, max_height, render, on_progress=None, on_done=None):
+        """Generate missing thumbnails in a background thread
+        
+        A running batch is stopped first. The callbacks run in the worker
+        thread, callers updating Tk widgets should hand over with after().
+        
+        Args:
+            paths (list): Resolved image paths
+            max_width (int): Thumbnail width
+            max_height (int): Thumbnail height
+            render (callable): render(path, max_width, max_height) producing a PIL image
+            on_progress (callable, optional): on_progress(done, total)
+            on_done (callable, optional): on_done(generated, failed)
+        """
+        self.stop_batch()
+        self._batch_stop = threading.Event()
+        self._batch_thread = threading.Thread(
+            target=self._run_batch,
+            args=(list(paths), max_width, max_height, render, on_progress, on_done, self._batch_stop),
+            daemon=True
+        )
+        self._batch_thread.start()
+    
+    def stop_batch(self):
+        """Stop the running batch generation, if any"""
+        self._batch_stop.set()
+        if self._batch_thread is not None and self._batch_thread.is_alive():
+            self._batch_thread.join(timeout=1.0)
+        self._batch_thread = None
+    
+    def is_batch_running(self):
+        """Check whether a batch generation is running
+        
+        Returns:
+            bool: Whether running
+        """
+        return self._batch_thread is not None and self._batch_thread.is_alive()
+    
+    def _run_batch(self, paths, max_width, max_height, render, on_progress, on_done, stop_event):
+        """Batch generation worker"""
+        generated = 0
+        failed = 0
+        total = len(paths)
+        for done, path in enumerate(paths, 1):
+            if stop_event.is_set():
+                break
+            try:
+                key = self.make_key(path, max_width, max_height)
+                if key is None:
+                    failed += 1
+                else:
+                    with self._lock:
+                        cached = key in self._entries
+                    if not cached:
+                        self.put(key, render(path, max_width, max_height))
+                        generated += 1
+            except Exception as e:
+                print(f"Failed to generate thumbnail for {path}: {str(e)}")
+                failed += 1
+            if on_progress:
+                on_progress(done, total)
+        
+        if on_done and not stop_event.is_set():
+            on_done(generated, failed)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Thumbnailer - Fast thumbnail decoding that picks the cheapest path per format
+"""
+from PIL import Image
+
+# Modes ImageTk.PhotoImage can display directly
+DISPLAY_MODES = ("RGB", "RGBA", "L", "P")
+
+
+def make_thumbnail(path, max_width, max_height):
+    """Decode an image at the smallest cost that still fills the target box
+    
+    - JPEG: draft() lets libjpeg decode at 1/2, 1/4 or 1/8 scale
+    - GIF and other animated formats: only the first frame is decoded
+    - PNG and everything else: full decode, then reduce() by an integer factor
+      so the final LANCZOS pass works on a small image
+    
+    Images already inside the box are returned at their original size.
+    
+    Args:
+        path (str): Image file path
+        max_width (int): Maximum thumbnail width
+        max_height (int): Maximum thumbnail height
+    
+    Returns:
+        PIL.Image.Image: Loaded thumbnail, detached from the file
+    """
+    with Image.open(path) as img:
+        if img.format == "JPEG":
+            # Keep at least the target size so the final resample stays sharp
+            img.draft(None, (max_width, max_height))
+        elif getattr(img, "is_animated", False):
+            img.seek(0)
+        
+        img.load()
+        if img.mode not in DISPLAY_MODES:
+            has_alpha = "A" in img.getbands() or "transparency" in img.info
+            img = img.convert("RGBA" if has_alpha else "RGB")
+        
+        if img.width <= max_width and img.height <= max_height:
+            return img.copy()
+        
+        # Palette images cannot be reduced or resampled with LANCZOS
+        if img.mode == "P":
+            img = img.convert("RGBA")
+        
+        # Integer box reduction down to at most twice the target size
+        factor = min(img.width // (2 * max_width), img.height // (2 * max_height))
+        if factor >= 2:
+            img = img.reduce(factor)
+        
+        img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS, reducing_gap=None)
+        return img
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+测试缓存管理器模块
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+# 添加工具目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils.cache_manager import CacheManager
+from src.db.mongo_manager import MongoDBManager
+
+
+class CacheManagerTestCase(unittest.TestCase):
+    """每个测试使用独立的临时缓存目录"""
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.managers = []
+    
+    def tearDown(self):
+        for manager in self.managers:
+            manager.close()
+        self._tmp.cleanup()
+    
+    def make_manager(self, **kwargs):
+        manager = CacheManager(cache_dir=self._tmp.name, **kwargs)
+        self.managers.append(manager)
+        return manager
+
+
+class EvictionTest(CacheManagerTestCase):
+    """按类别预算淘汰条目"""
+    
+    def test_lru_evicts_least_recently_used(self):
+        cache = self.make_manager(eviction_policy="lru", budgets={"documents": {"max_entries": 3}})
+        for key in ("a", "b", "c"):
+            cache.set_cache_entry(key, {"key": key})
+        cache.get_cache_entry("a")
+        cache.set_cache_entry("d", {"key": "d"})
+        
+        self.assertIsNone(cache.get_cache_entry("b"))
+        for key in ("a", "c", "d"):
+            self.assertEqual(cache.get_cache_entry(key), {"key": key})
+        self.assertEqual(cache.get_cache_stats()["evictions"], 1)
+    
+    def test_lfu_evicts_least_frequently_used(self):
+        cache = self.make_manager(eviction_policy="lfu", budgets={"documents": {"max_entries": 3}})
+        for key in ("a", "b", "c"):
+            cache.set_cache_entry(key, {"key": key})
+        for key in ("a", "a", "c", "b", "a", "c"):
+            cache.get_cache_entry(key)
+        cache.set_cache_entry("d", {"key": "d"})
+        
+        # b只被访问过一次，虽然不是最久未访问的条目
+        self.assertIsNone(cache.get_cache_entry("b"))
+        for key in ("a", "c", "d"):
+            self.assertIsNotNone(cache.get_cache_entry(key))
+    
+    def test_expired_entries_go_first(self):
+        cache = self.make_manager(eviction_policy="lru", budgets={"documents": {"max_entries": 2}})
+        cache.set_cache_entry("a", 1)
+        cache.set_cache_entry("expired", 2, ttl=-1)
+        cache.set_cache_entry("b", 3)
+        
+        self.assertEqual(cache.get_cache_entry("a"), 1)
+        self.assertEqual(cache.get_cache_entry("b"), 3)
+        self.assertIsNone(cache.get_cache_entry("expired"))
+    
+    def test_byte_budget(self):
+        cache = self.make_manager(budgets={"documents": {"max_bytes": 250}})
+        for index in range(10):
+            cache.set_cache_entry(f"k{index}", "x" * 100)
+        
+        usage = cache.get_category_usage()["documents"]
+        self.assertLessEqual(usage["size"], 250)
+        self.assertEqual(usage["entries"], 2)
+        self.assertEqual(cache.get_cache_entry("k9"), "x" * 100)
+        self.assertIsNone(cache.get_cache_entry("k0"))
+    
+    def test_entry_over_budget_is_evicted_last(self):
+        cache = self.make_manager(budgets={"documents": {"max_bytes": 50}})
+        cache.set_cache_entry("small", "x")
+        cache.set_cache_entry("big", "x" * 100)
+        
+        self.assertIsNone(cache.get_cache_entry("big"))
+        self.assertLessEqual(cache.get_category_usage()["documents"]["size"], 50)
+    
+    def test_budgets_are_per_category(self):
+        cache = self.make_manager(budgets={"documents": {"max_entries": 2}, "images": {"max_entries": 10}})
+        for index in range(5):
+            cache.set_cache_entry(f"k{index}", index, category="documents")
+            cache.set_cache_entry(f"k{index}", index, category="images")
+        
+        usage = cache.get_category_usage()
+        self.assertEqual(usage["documents"]["entries"], 2)
+        self.assertEqual(usage["images"]["entries"], 5)
+        self.assertEqual(cache.get_cache_entry("k0", category="images"), 0)
+    
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            self.make_manager(eviction_policy="fifo")
+
+
+class MemoryTierTest(CacheManagerTestCase):
+    """数据库前面的内存缓存层"""
+    
+    def test_hits_are_served_from_memory(self):
+        cache = self.make_manager()
+        cache.set_cache_entry("a", {"value": 1})
+        self.assertEqual(cache.get_cache_entry("a"), {"value": 1})
+        self.assertEqual(cache.get_cache_stats()["memory_hits"], 1)
+    
+    def test_callers_get_private_copies(self):
+        cache = self.make_manager()
+        data = {"items": [1, 2]}
+        cache.set_cache_entry("a", data)
+        data["items"].append(3)
+        
+        first = cache.get_cache_entry("a")
+        first["items"].append(4)
+        self.assertEqual(cache.get_cache_entry("a"), {"items": [1, 2]})
+    
+    def test_copies_after_database_hit(self):
+        cache = self.make_manager()
+        cache.set_cache_entry("a", {"items": [1]})
+        cache._memory_clear()
+        
+        cache.get_cache_entry("a")["items"].append(2)
+        self.assertEqual(cache.get_cache_entry("a"), {"items": [1]})
+    
+    def test_entry_limit(self):
+        cache = self.make_manager()
+        cache.memory_max_entries = 2
+        for key in ("a", "b", "c"):
+            cache.set_cache_entry(key, key)
+        
+        self.assertEqual(list(cache._memory), [("documents", "b"), ("documents", "c")])
+        # 被挤出内存层的条目仍可从数据库读取
+        self.assertEqual(cache.get_cache_entry("a"), "a")
+        self.assertEqual(cache.get_cache_stats()["memory_hits"], 0)
+    
+    def test_expired_entries_are_not_served(self):
+        cache = self.make_manager()
+        cache.set_cache_entry("a", 1, ttl=-1)
+        self.assertIsNone(cache.get_cache_entry("a"))
+        self.assertNotIn(("documents", "a"), cache._memory)
+    
+    def test_invalidate_and_clear(self):
+        cache = self.make_manager()
+        cache.set_cache_entry("a", 1)
+        cache.set_cache_entry("b", 2, category="images")
+        cache.invalidate_cache_entry("a")
+        self.assertIsNone(cache.get_cache_entry("a"))
+        
+        cache.clear_cache("images")
+        self.assertIsNone(cache.get_cache_entry("b", category="images"))
+        self.assertEqual(cache._memory_bytes, 0)
+
+
+
+class CountingCollection:
+    """只记录查询次数的集合"""
+    
+    def __init__(self):
+        self.finds = 0
+    
+    def find(self, query, projection=None, collation=None):
+        self.finds += 1
+        return self
+    
+    def sort(self, spec):
+        return self
+    
+    def skip(self, count):
+        return self
+    
+    def limit(self, count):
+        return iter([{"_id": 1}])
+
+
+class GenerationTest(CacheManagerTestCase):
+    """按命名空间递增缓存代数"""
+    
+    def test_bump_is_per_namespace(self):
+        cache = self.make_manager()
+        self.assertEqual(cache.get_generation("db.a"), 0)
+        self.assertEqual(cache.bump_generation("db.a"), 1)
+        self.assertEqual(cache.get_generation("db.a"), 1)
+        self.assertEqual(cache.get_generation("db.b"), 0)
+    
+    def test_generations_persist(self):
+        cache = self.make_manager()
+        cache.bump_generation("db.a")
+        cache.bump_generation("db.a")
+        cache.close()
+        
+        self.assertEqual(self.make_manager().get_generation("db.a"), 2)
+    
+    def test_invalidation_only_misses_the_collection(self):
+        manager = MongoDBManager(cache_manager=self.make_manager())
+        collections = {"a": CountingCollection(), "b": CountingCollection()}
+        manager.client = {"db": collections}
+        for name in ("a", "b"):
+            manager.get_documents_page("db", name, limit=10)
+            manager.get_documents_page("db", name, limit=10)
+        self.assertEqual([c.finds for c in collections.values()], [1, 1])
+        
+        manager.invalidate_collection_cache("db", "a")
+        for name in ("a", "b"):
+            manager.get_documents_page("db", name, limit=10)
+        self.assertEqual([c.finds for c in collections.values()], [2, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
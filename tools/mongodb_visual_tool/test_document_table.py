@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar document table and its views
+"""
+import os
+import sys
+import datetime
+import unittest
+
+from bson.objectid import ObjectId
+
+# Make the src package importable when run from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils.document_table import DocumentTable, DocumentView, MISSING_TIME
+
+
+OID = ObjectId()
+DOCS = [
+    {"_id": OID, "filename": "a.jpg", "size": 1024, "artMovement": "Cubism", "importedAt": "2024-01-01T00:00:00"},
+    None,
+    {"_id": 2, "title": "Untitled", "size": "2048", "importedAt": datetime.datetime(2024, 1, 2)},
+    {"_id": 3, "filename": "c.jpg", "size": True, "artMovement": "Cubism", "importedAt": "2024-01-01T00:00:00"},
+    {"_id": 4, "filename": "d.jpg", "size": "large", "importedAt": 12},
+]
+
+
+class DocumentTableTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.table = DocumentTable(DOCS)
+    
+    def test_rows(self):
+        self.assertEqual(len(self.table), 4)
+        self.assertEqual(self.table[1]["_id"], 2)
+        self.assertEqual([doc["_id"] for doc in self.table], [OID, 2, 3, 4])
+    
+    def test_row_of_uses_string_ids(self):
+        self.assertEqual(self.table.row_of(str(OID)), 0)
+        self.assertEqual(self.table.row_of("3"), 2)
+        self.assertIsNone(self.table.row_of("missing"))
+    
+    def test_columns(self):
+        self.assertEqual(list(self.table.sizes), [1024.0, 2048.0, 0.0, 0.0])
+        self.assertEqual(self.table.art_movements, ["Cubism", "", "Cubism", ""])
+        self.assertIs(self.table.art_movements[0], self.table.art_movements[2])
+    
+    def test_timestamps(self):
+        timestamps = self.table.timestamps
+        self.assertEqual(timestamps[0], timestamps[2])
+        self.assertEqual(timestamps[1], datetime.datetime(2024, 1, 2).timestamp())
+        self.assertEqual(timestamps[3], MISSING_TIME)
+        self.assertIs(self.table.timestamps, timestamps)
+    
+    def test_sort_keys(self):
+        self.assertIs(self.table.sort_keys("size"), self.table.sizes)
+        self.assertEqual(self.table.sort_keys("filename"), ["a.jpg", "untitled", "c.jpg", "d.jpg"])
+        self.assertEqual(self.table.sort_keys("artMovement"), ["cubism", "", "cubism", ""])
+        self.assertIsNone(self.table.sort_keys("title"))
+
+
+class DocumentViewTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.table = DocumentTable(DOCS)
+    
+    def test_full_view(self):
+        view = self.table.view()
+        self.assertIsInstance(view, DocumentView)
+        self.assertEqual(len(view), 4)
+        self.assertEqual(view.index_of("4"), 3)
+        self.assertEqual([doc["_id"] for doc in view[1:3]], [2, 3])
+    
+    def test_partial_view(self):
+        view = self.table.view([3, 0])
+        self.assertEqual([doc["_id"] for doc in view], [4, OID])
+        self.assertEqual(view[-1]["_id"], OID)
+        self.assertEqual(view.index_of(str(OID)), 1)
+        self.assertIsNone(view.index_of("2"))
+        self.assertIsNone(view.index_of("missing"))
+    
+    def test_range_view(self):
+        view = self.table.view(range(1, 3))
+        self.assertEqual(view.index_of("3"), 1)
+        self.assertIsNone(view.index_of("4"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Tests for the lazily loaded document source and its change handling
+"""
+import os
+import sys
+import random
+import unittest
+
+# Make the src package importable when run from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.db.paged_source import PagedDocumentSource
+
+
+PAGE_SIZE = 10
+
+
+class FakeManager:
+    """Collection in a list, tokens are plain offsets"""
+    
+    def __init__(self, docs, sort_field="_id"):
+        self.docs = docs
+        if sort_field == "_id":
+            self.key = lambda doc: doc["_id"]
+        else:
+            self.key = lambda doc: (doc[sort_field].lower(), doc["_id"])
+    
+    def sorted(self):
+        return sorted(self.docs, key=self.key)
+    
+    def count_documents(self, database, collection, query=None):
+        return len(self.docs)
+    
+    def get_documents_page(self, database, collection, limit, query, sort_field, reverse, token, skip, projection):
+        start = skip if token is None else token
+        docs = [dict(doc) for doc in self.sorted()[start:start + limit]]
+        return docs, start + limit if start + limit < len(self.docs) else None
+
+
+def make_docs(count, rng=None):
+    rng = rng or random.Random(10)
+    return [{"_id": i, "filename": f"f{rng.randint(0, 500):04d}", "ok": rng.random() > 0.1} for i in range(count)]
+
+
+class PagedSourceTestCase(unittest.TestCase):
+    
+    def make_source(self, manager, **kwargs):
+        # Blocks are fetched synchronously by the tests, not by the worker
+        source = PagedDocumentSource(manager, "db", "coll", page_size=PAGE_SIZE, **kwargs)
+        source.close()
+        self.addCleanup(source.close)
+        return source.open()
+    
+    def load(self, source, blocks):
+        for block in blocks:
+            if block * PAGE_SIZE < len(source) and block not in source._blocks:
+                source._fetch_block(block, source._epoch)
+
+
+class LoadingTest(PagedSourceTestCase):
+    
+    def test_open_loads_the_first_block(self):
+        source = self.make_source(FakeManager(make_docs(35)))
+        self.assertEqual(len(source), 35)
+        self.assertEqual(source[0]["_id"], 0)
+        self.assertTrue(source.is_loaded(9))
+        self.assertFalse(source.is_loaded(10))
+    
+    def test_missing_blocks_are_requested(self):
+        source = self.make_source(FakeManager(make_docs(35)))
+        self.assertIsNone(source[25])
+        self.assertIn(2, source._requested)
+        with self.assertRaises(IndexError):
+            source[35]
+    
+    def test_blocks_continue_from_tokens(self):
+        source = self.make_source(FakeManager(make_docs(35)))
+        self.load(source, [1, 2, 3])
+        self.assertEqual([doc["_id"] for doc in source.loaded_items()], list(range(35)))
+        self.assertTrue(source.is_fully_loaded())
+        self.assertEqual(source.index_of("17"), 17)
+    
+    def test_load_all_reports_progress(self):
+        manager = FakeManager(make_docs(35))
+        source = PagedDocumentSource(manager, "db", "coll", page_size=PAGE_SIZE)
+        self.addCleanup(source.close)
+        source._total = manager.count_documents("db", "coll")
+        progress = []
+        docs = source.load_all(on_progress=lambda loaded, total: progress.append((loaded, total)))
+        self.assertEqual(len(docs), 35)
+        self.assertEqual(progress, [(10, 35), (20, 35), (30, 35), (35, 35)])
+    
+    def test_generation_changes_with_the_loaded_documents(self):
+        source = self.make_source(FakeManager(make_docs(35)))
+        generation, items = source.loaded_snapshot()
+        self.assertEqual(len(items), 10)
+        self.load(source, [1])
+        self.assertGreater(source.generation, generation)
+
+
+class ApplyChangesTest(PagedSourceTestCase):
+    
+    def test_update_replaces_in_place(self):
+        source = self.make_source(FakeManager(make_docs(35)))
+        blocks = source._blocks[0]
+        self.assertFalse(source.apply_changes([{"op": "update", "_id": 3, "doc": {"_id": 3, "filename": "new"}}]))
+        self.assertEqual(source[3]["filename"], "new")
+        self.assertIsNot(source._blocks[0], blocks)
+        self.assertNotEqual(blocks[3]["filename"], "new")
+    
+    def test_insert_after_the_last_document_is_appended(self):
+        manager = FakeManager(make_docs(35))
+        source = self.make_source(manager)
+        self.load(source, [3])
+        doc = {"_id": 100, "filename": "x"}
+        manager.docs.append(doc)
+        self.assertFalse(source.apply_changes([{"op": "insert", "_id": 100, "doc": dict(doc)}]))
+        self.assertEqual(len(source), 36)
+        self.assertEqual(source[35]["_id"], 100)
+    
+    def test_insert_elsewhere_resets(self):
+        source = self.make_source(FakeManager(make_docs(35)))
+        self.assertTrue(source.apply_changes([{"op": "insert", "_id": -1, "doc": {"_id": -1}}]))
+        self.assertEqual(source._blocks, {})
+    
+    def test_delete_shifts_loaded_blocks(self):
+        manager = FakeManager(make_docs(35))
+        source = self.make_source(manager)
+        self.load(source, [1, 2, 3])
+        manager.docs = [doc for doc in manager.docs if doc["_id"] != 4]
+        self.assertFalse(source.apply_changes([{"op": "delete", "_id": 4, "doc": None}]))
+        self.assertEqual(len(source), 34)
+        self.assertEqual([doc["_id"] for doc in source.loaded_items()], [doc["_id"] for doc in manager.sorted()])
+        self.assertEqual(source.index_of("5"), 4)
+    
+    def test_delete_of_a_document_not_loaded_resets(self):
+        source = self.make_source(FakeManager(make_docs(35)))
+        self.assertTrue(source.apply_changes([{"op": "delete", "_id": 30, "doc": None}]))
+    
+    def test_random_changes_match_the_collection(self):
+        for sort_field in ("_id", "filename"):
+            for transform in (None, lambda docs: [doc for doc in docs if doc["ok"]]):
+                with self.subTest(sort_field=sort_field, transform=transform is not None):
+                    self.check_random_changes(sort_field, transform)
+    
+    def check_random_changes(self, sort_field, transform):
+        rng = random.Random(10)
+        manager = FakeManager(make_docs(120, rng), sort_field)
+        source = self.make_source(manager, sort_field=sort_field, transform=transform)
+        next_id = 1000
+        for _ in range(150):
+            self.load(source, rng.sample(range(15), 4))
+            events = []
+            for _ in range(rng.randint(1, 3)):
+                choice = rng.random()
+                if choice < 0.4:
+                    next_id += 1
+                    name = f"f{rng.randint(0, 600):04d}" if rng.random() < 0.5 else "f9999"
+                    doc = {"_id": next_id, "filename": name, "ok": rng.random() > 0.1}
+                    manager.docs.append(doc)
+                    events.append({"op": "insert", "_id": next_id, "doc": dict(doc)})
+                elif choice < 0.8 and manager.docs:
+                    doc = rng.choice(manager.docs)
+                    manager.docs.remove(doc)
+                    events.append({"op": "delete", "_id": doc["_id"], "doc": None})
+                elif manager.docs:
+                    doc = rng.choice(manager.docs)
+                    doc["x"] = rng.random()
+                    events.append({"op": "update", "_id": doc["_id"], "doc": dict(doc)})
+            if source.apply_changes(events):
+                # The stopped worker cannot recount
+                source._total = len(manager.docs)
+            
+            expected = manager.sorted()
+            self.assertEqual(len(source), len(expected))
+            for block, docs in source._blocks.items():
+                block_docs = expected[block * PAGE_SIZE:(block + 1) * PAGE_SIZE]
+                self.assertEqual(docs, transform(block_docs) if transform else block_docs)
+            for key, index in source._positions.items():
+                block, offset = divmod(index, PAGE_SIZE)
+                self.assertEqual(str(source._blocks[block][offset]["_id"]), key)
+
+
+if __name__ == "__main__":
+    unittest.main()
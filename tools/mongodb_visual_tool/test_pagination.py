@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Tests for the keyset pagination helpers and MongoDBManager.get_documents_page
+"""
+import os
+import sys
+import datetime
+import unittest
+
+from bson.objectid import ObjectId
+
+# Make the src package importable when run from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.db.pagination import (TYPE_BRACKETS, type_bracket, sort_spec, position_after, local_sort_key,
+                               encode_token, decode_token, keyset_filter)
+from src.db.mongo_manager import MongoDBManager
+
+
+class FakeCursor:
+    """Cursor over a list, sorted like the server sorts (arrays by their smallest element)"""
+    
+    def __init__(self, docs):
+        self.docs = docs
+    
+    def sort(self, spec):
+        field = spec[0][0]
+        
+        def value(doc):
+            value = doc.get(field)
+            return min(value) if isinstance(value, list) else value
+        
+        self.docs = sorted(self.docs, key=lambda doc: (value(doc), doc["_id"]))
+        return self
+    
+    def skip(self, count):
+        self.docs = self.docs[count:]
+        return self
+    
+    def limit(self, count):
+        self.docs = self.docs[:count]
+        return self
+    
+    def __iter__(self):
+        return iter(self.docs)
+
+
+class FakeCollection:
+    """Collection returning every document, recording the queries it receives"""
+    
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+    
+    def find(self, query, projection=None, collation=None):
+        self.queries.append(query)
+        return FakeCursor(list(self.docs))
+    
+    def find_one(self, query, projection=None):
+        field = next(iter(query))
+        return next((doc for doc in self.docs if isinstance(doc.get(field), list)), None)
+
+
+class FakeCacheManager:
+    """Cache manager stand-in, only generations are used with use_cache off"""
+    
+    def get_generation(self, namespace):
+        return 0
+
+
+class TypeBracketTest(unittest.TestCase):
+    
+    def test_brackets(self):
+        self.assertEqual(type_bracket(None), 0)
+        self.assertEqual(type_bracket(3), 1)
+        self.assertEqual(type_bracket(2.5), 1)
+        self.assertEqual(type_bracket("a"), 2)
+        self.assertEqual(type_bracket({"a": 1}), 3)
+        self.assertEqual(type_bracket([1]), 4)
+        self.assertEqual(type_bracket(ObjectId()), 6)
+        self.assertEqual(type_bracket(datetime.datetime(2024, 1, 1)), 8)
+    
+    def test_bool_is_not_a_number(self):
+        self.assertEqual(type_bracket(True), 7)
+    
+    def test_unsupported_type(self):
+        self.assertIsNone(type_bracket(object()))
+
+
+class SortSpecTest(unittest.TestCase):
+    
+    def test_id_breaks_ties(self):
+        self.assertEqual(sort_spec("title"), [("title", 1), ("_id", 1)])
+        self.assertEqual(sort_spec("title", reverse=True), [("title", -1), ("_id", -1)])
+        self.assertEqual(sort_spec("_id", reverse=True), [("_id", -1)])
+
+
+class KeysetFilterTest(unittest.TestCase):
+    
+    def test_id_sort(self):
+        self.assertEqual(keyset_filter("_id", False, None, 5), {"_id": {"$gt": 5}})
+        self.assertEqual(keyset_filter("_id", True, None, 5), {"_id": {"$lt": 5}})
+    
+    def test_ascending_adds_later_brackets(self):
+        query = keyset_filter("title", False, "m", 7)
+        following = [name for bracket in TYPE_BRACKETS[3:] for name in bracket]
+        self.assertEqual(query, {"$or": [
+            {"title": {"$gt": "m"}},
+            {"title": "m", "_id": {"$gt": 7}},
+            {"title": {"$type": following}},
+        ]})
+    
+    def test_descending_adds_earlier_brackets_and_null(self):
+        query = keyset_filter("title", True, "m", 7)
+        self.assertEqual(query, {"$or": [
+            {"title": {"$lt": "m"}},
+            {"title": "m", "_id": {"$lt": 7}},
+            {"title": None},
+            {"title": {"$type": TYPE_BRACKETS[1]}},
+        ]})
+    
+    def test_null_value(self):
+        query = keyset_filter("title", False, None, 7)
+        clauses = query["$or"]
+        self.assertEqual(clauses[0], {"title": None, "_id": {"$gt": 7}})
+        self.assertEqual(clauses[1]["title"]["$type"], [name for bracket in TYPE_BRACKETS[1:] for name in bracket])
+    
+    def test_null_value_descending_is_last_bracket(self):
+        self.assertEqual(keyset_filter("title", True, None, 7), {"title": None, "_id": {"$lt": 7}})
+
+
+class TokenTest(unittest.TestCase):
+    
+    def test_round_trip(self):
+        after = (datetime.datetime(2024, 5, 1, 12, 30), ObjectId())
+        token = encode_token("importedAt", True, after)
+        self.assertEqual(decode_token(token, "importedAt", True), (after, 0))
+    
+    def test_offset_only(self):
+        token = encode_token("tags", False, None, 40)
+        self.assertEqual(decode_token(token, "tags", False), (None, 40))
+    
+    def test_other_sort_order_is_rejected(self):
+        token = encode_token("title", False, ("a", 1))
+        with self.assertRaises(ValueError):
+            decode_token(token, "filename", False)
+        with self.assertRaises(ValueError):
+            decode_token(token, "title", True)
+    
+    def test_malformed_token(self):
+        with self.assertRaises(ValueError):
+            decode_token("not a token", "title", False)
+
+
+class PositionTest(unittest.TestCase):
+    
+    def test_position(self):
+        self.assertEqual(position_after("title", {"_id": 1, "title": "a"}), ("a", 1))
+        self.assertEqual(position_after("title", {"_id": 1}), (None, 1))
+        self.assertEqual(position_after("_id", {"_id": 1, "title": "a"}), (None, 1))
+    
+    def test_arrays_have_no_position(self):
+        self.assertIsNone(position_after("tags", {"_id": 1, "tags": ["a", "b"]}))
+
+
+class LocalSortKeyTest(unittest.TestCase):
+    
+    def test_collated_strings_are_lowered(self):
+        docs = [{"_id": 1, "title": "b"}, {"_id": 2, "title": "A"}, {"_id": 3, "title": "a"}]
+        docs.sort(key=lambda doc: local_sort_key("title", doc))
+        self.assertEqual([doc["_id"] for doc in docs], [2, 3, 1])
+    
+    def test_id_strings_are_not_collated(self):
+        self.assertEqual(local_sort_key("_id", {"_id": "B"}), (2, "B"))
+    
+    def test_type_brackets_order(self):
+        docs = [{"_id": 1, "n": "x"}, {"_id": 2, "n": 5}, {"_id": 3}]
+        docs.sort(key=lambda doc: local_sort_key("n", doc))
+        self.assertEqual([doc["_id"] for doc in docs], [3, 2, 1])
+    
+    def test_unreproducible_orders(self):
+        self.assertIsNone(local_sort_key("title", {"_id": 1, "title": "Émile"}))
+        self.assertIsNone(local_sort_key("title", {"_id": 1, "title": "a_b"}))
+        self.assertIsNone(local_sort_key("tags", {"_id": 1, "tags": ["a"]}))
+
+
+class DocumentsPageTest(unittest.TestCase):
+    
+    def manager(self, docs):
+        manager = MongoDBManager(cache_manager=FakeCacheManager())
+        manager.use_cache = False
+        collection = FakeCollection(docs)
+        manager.client = {"db": {"coll": collection}}
+        return manager, collection
+    
+    def test_keyset_token(self):
+        docs = [{"_id": i, "n": i} for i in range(10)]
+        manager, collection = self.manager(docs)
+        page, token = manager.get_documents_page("db", "coll", limit=4, sort_field="n")
+        self.assertEqual([doc["_id"] for doc in page], [0, 1, 2, 3])
+        self.assertEqual(decode_token(token, "n", False), ((3, 3), 0))
+        
+        manager.get_documents_page("db", "coll", limit=4, sort_field="n", token=token)
+        self.assertIn("$or", collection.queries[-1])
+    
+    def test_array_field_falls_back_to_offsets(self):
+        docs = [{"_id": i, "n": [i, 100 - i] if i % 5 == 0 else i} for i in range(20)]
+        manager, collection = self.manager(docs)
+        seen = []
+        token = None
+        while True:
+            page, token = manager.get_documents_page("db", "coll", limit=6, sort_field="n", token=token)
+            seen.extend(doc["_id"] for doc in page)
+            if token is None:
+                break
+            self.assertIsNone(decode_token(token, "n", False)[0])
+        
+        # No range filter on the array field: every document once, in server order
+        self.assertEqual(seen, list(range(20)))
+        self.assertTrue(all(query == {} for query in collection.queries))
+        self.assertEqual(len(collection.queries), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
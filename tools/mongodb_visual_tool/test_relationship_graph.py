@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory relationship graph
+"""
+import os
+import sys
+import json
+import random
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+
+# Make the src package importable when run from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils import relationship_graph
+from src.utils.relationship_graph import (RelationshipGraph, load_art_movement_edges,
+                                          INFLUENCED, INFLUENCED_BY, ART_STYLE_COLLECTION)
+
+
+def node(name):
+    return ("artStyles", name)
+
+
+def edges_of(graph):
+    """Multiset of the current (source, target, type) edges of a graph"""
+    edges = Counter()
+    for source in range(graph.node_count):
+        for target, edge_type in graph._edges(source, True):
+            edges[(graph._nodes[source], graph._nodes[target], graph._types[edge_type])] += 1
+    return edges
+
+
+class EdgeUpdateTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.graph = RelationshipGraph([
+            (node("a"), node("b"), "Related"),
+            (node("a"), node("b"), "Related"),
+            (node("b"), node("c"), INFLUENCED),
+        ])
+    
+    def test_build(self):
+        self.assertEqual(len(self.graph), 3)
+        self.assertEqual(self.graph.node_count, 3)
+        self.assertIn(node("c"), self.graph)
+        self.assertNotIn(node("d"), self.graph)
+    
+    def test_add_and_remove(self):
+        self.graph.add_edge(node("c"), node("d"), "Related")
+        self.assertEqual(len(self.graph), 4)
+        self.assertEqual(self.graph.k_hop(node("c"), 1, direction="out"), {node("d"): 1})
+        
+        self.assertTrue(self.graph.remove_edge(node("c"), node("d"), "Related"))
+        self.assertEqual(self.graph.k_hop(node("c"), 1, direction="out"), {})
+        self.assertFalse(self.graph.remove_edge(node("c"), node("d"), "Related"))
+        self.assertFalse(self.graph.remove_edge(node("x"), node("d"), "Related"))
+        self.assertEqual(len(self.graph), 3)
+    
+    def test_duplicate_edges_are_removed_one_at_a_time(self):
+        self.assertTrue(self.graph.remove_edge(node("a"), node("b"), "Related"))
+        self.assertEqual(self.graph.k_hop(node("a"), 1, direction="out"), {node("b"): 1})
+        self.assertTrue(self.graph.remove_edge(node("a"), node("b"), "Related"))
+        self.assertEqual(self.graph.k_hop(node("a"), 1, direction="out"), {})
+        self.assertFalse(self.graph.remove_edge(node("a"), node("b"), "Related"))
+    
+    def test_revive_removed_array_edge(self):
+        self.graph.remove_edge(node("b"), node("c"), INFLUENCED)
+        self.graph.add_edge(node("b"), node("c"), INFLUENCED)
+        self.assertFalse(self.graph._removed)
+        self.assertFalse(self.graph._added_out)
+        self.assertEqual(self.graph.k_hop(node("c"), 1, direction="in"), {node("b"): 1})
+    
+    def test_compact_keeps_edges(self):
+        self.graph.remove_edge(node("a"), node("b"), "Related")
+        self.graph.add_edge(node("d"), node("a"), INFLUENCED_BY)
+        before = edges_of(self.graph)
+        self.graph.compact()
+        self.assertEqual(edges_of(self.graph), before)
+        self.assertEqual(len(self.graph), 3)
+        self.assertFalse(self.graph._removed or self.graph._added_out or self.graph._changes)
+    
+    def test_random_updates_match_an_edge_list(self):
+        rng = random.Random(23)
+        names = [node(str(i)) for i in range(12)]
+        types = ["Related", INFLUENCED, INFLUENCED_BY]
+        expected = Counter()
+        graph = RelationshipGraph()
+        with mock.patch.object(relationship_graph, "GRAPH_COMPACT_THRESHOLD", 7):
+            for _ in range(2000):
+                edge = (rng.choice(names), rng.choice(names), rng.choice(types))
+                if rng.random() < 0.55:
+                    graph.add_edge(*edge)
+                    expected[edge] += 1
+                else:
+                    self.assertEqual(graph.remove_edge(*edge), expected[edge] > 0)
+                    if expected[edge]:
+                        expected[edge] -= 1
+                self.assertEqual(len(graph), sum(expected.values()))
+        self.assertEqual(edges_of(graph), +expected)
+
+
+class TraversalTest(unittest.TestCase):
+    """a influenced b (Influenced), c was influenced by b (Influenced By), d is only related to c"""
+    
+    def setUp(self):
+        self.graph = RelationshipGraph([
+            (node("a"), node("b"), INFLUENCED),
+            (node("c"), node("b"), INFLUENCED_BY),
+            (node("c"), node("d"), "Related"),
+            (node("e"), node("a"), "Related"),
+        ])
+    
+    def test_k_hop(self):
+        self.assertEqual(self.graph.k_hop(node("a"), 1), {node("b"): 1, node("e"): 1})
+        self.assertEqual(self.graph.k_hop(node("a"), 2, direction="out"), {node("b"): 1})
+        self.assertEqual(self.graph.k_hop(node("b"), 2, direction="in"), {node("a"): 1, node("c"): 1, node("e"): 2})
+        self.assertEqual(self.graph.k_hop(node("a"), 3, types=[INFLUENCED, INFLUENCED_BY]),
+                         {node("b"): 1, node("c"): 2})
+        self.assertEqual(self.graph.k_hop(node("missing"), 3), {})
+    
+    def test_shortest_path(self):
+        self.assertEqual(self.graph.shortest_path(node("e"), node("d")),
+                         [node("e"), node("a"), node("b"), node("c"), node("d")])
+        self.assertIsNone(self.graph.shortest_path(node("e"), node("d"), direction="out"))
+    
+    def test_influence_chain(self):
+        self.assertEqual(self.graph.influence_chain(node("c")), [(node("b"), 1), (node("a"), 2)])
+        self.assertEqual(self.graph.influence_chain(node("c"), max_depth=1), [(node("b"), 1)])
+        self.assertEqual(self.graph.influence_chain(node("d")), [])
+        self.assertEqual(self.graph.influence_chain(node("missing")), [])
+    
+    def test_shortest_influence_path(self):
+        self.assertEqual(self.graph.shortest_influence_path(node("a"), node("c")),
+                         [node("a"), node("b"), node("c")])
+        self.assertIsNone(self.graph.shortest_influence_path(node("c"), node("a")))
+        self.assertIsNone(self.graph.shortest_influence_path(node("a"), node("d")))
+    
+    def test_traversals_see_the_delta(self):
+        self.graph.remove_edge(node("c"), node("b"), INFLUENCED_BY)
+        self.assertEqual(self.graph.influence_chain(node("c")), [])
+        self.graph.add_edge(node("d"), node("c"), INFLUENCED)
+        self.assertEqual(self.graph.shortest_influence_path(node("d"), node("c")), [node("d"), node("c")])
+
+
+class ArtMovementEdgesTest(unittest.TestCase):
+    
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            with open(os.path.join(data_dir, "connections.json"), "w", encoding="utf-8") as f:
+                json.dump([{"source": "s1", "target": "s2"}, {"source": "s1"}], f)
+            with open(os.path.join(data_dir, "artStyles.json"), "w", encoding="utf-8") as f:
+                json.dump([
+                    {"id": "s1", "title": "Realism"},
+                    {"id": "s2", "title": "Impressionism", "influences": ["Realism", "Photography"],
+                     "influencedBy": ["Realism"]},
+                ], f)
+            edges = load_art_movement_edges(data_dir)
+        
+        key = lambda name: (ART_STYLE_COLLECTION, name)
+        self.assertEqual(edges, [
+            (key("s1"), key("s2"), INFLUENCED),
+            (key("s2"), key("s1"), INFLUENCED_BY),
+            (key("s2"), key("Photography"), INFLUENCED_BY),
+        ])
+        self.assertEqual(RelationshipGraph(edges).influence_chain(key("s2")), [(key("s1"), 1), (key("Photography"), 1)])
+    
+    def test_missing_files(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            self.assertEqual(load_art_movement_edges(data_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
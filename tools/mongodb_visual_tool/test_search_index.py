@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the fuzzy search index
+"""
+import os
+import sys
+import random
+import unittest
+
+# Make the src package importable when run from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils.search_index import (SearchIndex, document_search_strings, narrowed_cutoff,
+                                    SEARCH_RESULT_CACHE_SIZE, SEARCH_RETAIN_CUTOFF)
+
+
+DOCS = [
+    {"_id": 1, "filename": "starry_night.jpg", "title": "The Starry Night", "artMovement": "Post-Impressionism"},
+    {"_id": 2, "filename": "water_lilies.jpg", "title": "Water Lilies", "artMovement": "Impressionism"},
+    {"_id": 3, "filename": "guernica.jpg", "title": "Guernica", "artMovement": "Cubism"},
+    {"_id": 4, "filename": "sunflowers.jpg", "title": "Sunflowers", "metadata": {"artist": "Van Gogh"}},
+]
+
+
+class DocumentSearchStringsTest(unittest.TestCase):
+    
+    def test_strings(self):
+        strings = document_search_strings(DOCS[3])
+        self.assertEqual(strings[:3], ["sunflowers.jpg", "sunflowers", ""])
+        self.assertIn("artist", strings)
+        self.assertIn("van gogh", strings)
+        self.assertIn("4", strings)
+        self.assertEqual(len(strings), len(set(strings)))
+
+
+class SearchTest(unittest.TestCase):
+    
+    def test_best_matches_first(self):
+        index = SearchIndex(DOCS)
+        self.assertEqual([doc["_id"] for doc in index.search("Impressionism")], [1, 2])
+        self.assertEqual(index.search("guernica")[0]["_id"], 3)
+        self.assertEqual(index.search("van gogh"), [DOCS[3]])
+    
+    def test_ties_keep_document_order(self):
+        docs = [{"_id": i, "title": "same title"} for i in range(5)]
+        self.assertEqual(SearchIndex(docs).search_positions("same"), [0, 1, 2, 3, 4])
+    
+    def test_empty_query_and_corpus(self):
+        self.assertEqual(SearchIndex(DOCS).search(""), [])
+        self.assertEqual(SearchIndex([]).search("night"), [])
+    
+    def test_none_items_are_skipped(self):
+        index = SearchIndex([None, DOCS[2], None])
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.search("cubism"), [DOCS[2]])
+    
+    def test_cancelled(self):
+        self.assertIsNone(SearchIndex(DOCS).search("night", cancelled=lambda: True))
+    
+    def test_scores(self):
+        scores = SearchIndex(DOCS).search_scores("guernica")
+        self.assertEqual(scores[2], 100)
+        self.assertTrue(all(score >= 70 for score in scores.values()))
+
+
+
+class CountingIndex(SearchIndex):
+    """SearchIndex recording how many choices every scoring call gets"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scored = []
+    
+    def _score_choices(self, query, positions, cutoff):
+        self.scored.append(len(positions))
+        return super()._score_choices(query, positions, cutoff)
+
+
+class NarrowedCutoffTest(unittest.TestCase):
+    
+    def test_bounds(self):
+        for length in range(1, 30):
+            cutoff = narrowed_cutoff(SEARCH_RETAIN_CUTOFF, length)
+            self.assertGreater(cutoff, SEARCH_RETAIN_CUTOFF)
+            self.assertLessEqual(cutoff, 101)
+    
+    def test_useless_when_nothing_was_retained(self):
+        self.assertEqual(narrowed_cutoff(100, 3), 101)
+    
+    def test_narrowed_search_is_exact(self):
+        rng = random.Random(16)
+        words = ["".join(rng.choice("abcde") for _ in range(rng.randint(1, 12))) for _ in range(400)]
+        docs = [{"title": word} for word in words]
+        for _ in range(40):
+            base = "".join(rng.choice("abcde") for _ in range(rng.randint(2, 6)))
+            extended = rng.choice([base + rng.choice("abcde"), rng.choice("abcde") + base])
+            narrowed = SearchIndex(docs)
+            narrowed.search_scores(base)
+            expected = SearchIndex(docs).search_scores(extended, narrow=False)
+            self.assertEqual(narrowed.search_scores(extended), expected, (base, extended))
+
+
+class MemoizationTest(unittest.TestCase):
+    
+    def test_repeated_query_is_a_lookup(self):
+        index = CountingIndex(DOCS)
+        first = index.search("night")
+        calls = len(index.scored)
+        self.assertEqual(index.search("Night"), first)
+        self.assertEqual(len(index.scored), calls)
+    
+    def test_extension_rescores_near_matches_only(self):
+        rng = random.Random(16)
+        docs = [{"title": "".join(rng.choice("vwxyz") for _ in range(20))} for _ in range(1000)]
+        docs.append({"title": "starry night over the rhone"})
+        index = CountingIndex(docs)
+        index.search("starry nig")
+        self.assertEqual(index.scored, [len(index._choices)])
+        
+        index.scored.clear()
+        self.assertEqual(index.search("starry nigh"), [docs[-1]])
+        self.assertLess(sum(index.scored), len(index._choices) // 10)
+        
+        index.scored.clear()
+        index.search("starry nigh")
+        self.assertEqual(index.scored, [])
+    
+    def test_lru_size(self):
+        index = SearchIndex(DOCS)
+        for i in range(SEARCH_RESULT_CACHE_SIZE + 1):
+            index.search(f"query {i}")
+        self.assertNotIn("query 0", index._results)
+        self.assertIn(f"query {SEARCH_RESULT_CACHE_SIZE}", index._results)
+        self.assertEqual(len(index._results), SEARCH_RESULT_CACHE_SIZE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached sort orders of the grid
+"""
+import os
+import sys
+import datetime
+import unittest
+
+# Make the src package importable when run from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils.document_table import DocumentTable
+from src.utils.sort_index import SortIndex
+
+
+DOCS = [
+    {"_id": 0, "filename": "b.jpg", "size": 30, "artMovement": "Cubism", "importedAt": "2024-03-01T10:00:00"},
+    {"_id": 1, "title": "A title", "size": 10, "artMovement": "baroque", "importedAt": "not a date"},
+    {"_id": 2, "filename": "C.jpg", "size": 30, "importedAt": datetime.datetime(2024, 1, 1)},
+    {"_id": 3, "filename": "a.jpg", "size": "20", "artMovement": "Cubism"},
+    {"_id": 4, "filename": "b.jpg", "size": 10, "artMovement": "Baroque", "importedAt": "2024-02-01T10:00:00"},
+]
+
+
+def ids(view):
+    return [doc["_id"] for doc in view]
+
+
+class SortIndexTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.index = SortIndex(DocumentTable(DOCS))
+    
+    def test_text_sorts_are_case_insensitive_and_fall_back_to_title(self):
+        self.assertEqual(ids(self.index.sorted_view("filename")), [1, 3, 0, 4, 2])
+        self.assertEqual(ids(self.index.sorted_view("artMovement")), [2, 1, 4, 0, 3])
+    
+    def test_ties_keep_load_order_in_both_directions(self):
+        self.assertEqual(ids(self.index.sorted_view("size")), [1, 4, 3, 0, 2])
+        self.assertEqual(ids(self.index.sorted_view("size", reverse=True)), [0, 2, 3, 1, 4])
+        self.assertEqual(ids(self.index.sorted_view("filename", reverse=True)), [2, 0, 4, 3, 1])
+    
+    def test_unreadable_times_sort_first_in_both_directions(self):
+        self.assertEqual(ids(self.index.sorted_view("importedAt")), [1, 3, 2, 4, 0])
+        self.assertEqual(ids(self.index.sorted_view("importedAt", reverse=True)), [1, 3, 0, 4, 2])
+    
+    def test_orders_are_cached(self):
+        self.assertIs(self.index.order("size"), self.index.order("size"))
+        self.assertIs(self.index.sorted_view("size", True), self.index.sorted_view("size", True))
+    
+    def test_unsortable_field(self):
+        self.assertIsNone(self.index.order("title"))
+        self.assertIsNone(self.index.sorted_view("title"))
+    
+    def test_sort_view_follows_the_full_order(self):
+        view = self.index.table.view([4, 0, 2, 1])
+        for field in ("filename", "size", "importedAt", "artMovement"):
+            for reverse in (False, True):
+                expected = [doc for doc in ids(self.index.sorted_view(field, reverse)) if doc in (0, 1, 2, 4)]
+                self.assertEqual(ids(self.index.sort_view(view, field, reverse)), expected, (field, reverse))
+    
+    def test_sort_view_of_another_table(self):
+        other = DocumentTable(DOCS).view()
+        self.assertIsNone(self.index.sort_view(other, "size"))
+        self.assertIsNone(self.index.sort_view(list(DOCS), "size"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent thumbnail cache
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+from PIL import Image
+
+# Make the src package importable when run from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils.thumbnail_cache import ThumbnailCache
+
+
+def make_image(color=(200, 40, 40)):
+    return Image.new("RGB", (32, 32), color)
+
+
+class ThumbnailCacheTest(unittest.TestCase):
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self._tmp.name, "thumbnails")
+        self.cache = ThumbnailCache(cache_dir=self.cache_dir)
+        self.cache.put("probe" + self.cache.extension, make_image())
+        self.entry_size = self.cache.get_stats()["total_size"]
+    
+    def tearDown(self):
+        self._tmp.cleanup()
+    
+    def files(self):
+        return sorted(os.listdir(self.cache_dir))
+    
+    def key(self, name):
+        return name + self.cache.extension
+    
+    def test_round_trip(self):
+        image = self.cache.get(self.key("probe"))
+        self.assertEqual(image.size, (32, 32))
+        self.assertIsNone(self.cache.get(self.key("missing")))
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+    
+    def test_evicts_least_recently_used(self):
+        cache = ThumbnailCache(cache_dir=self.cache_dir, max_bytes=self.entry_size * 2)
+        cache.put(self.key("a"), make_image())
+        cache.get(self.key("probe"))
+        cache.put(self.key("b"), make_image())
+        
+        # a was read less recently than probe
+        self.assertEqual(self.files(), sorted([self.key("probe"), self.key("b")]))
+        self.assertIsNone(cache.get(self.key("a")))
+        self.assertLessEqual(cache.get_stats()["total_size"], self.entry_size * 2)
+    
+    def test_startup_trims_to_max_bytes_by_mtime(self):
+        for index, name in enumerate(("a", "b", "c")):
+            self.cache.put(self.key(name), make_image())
+            os.utime(os.path.join(self.cache_dir, self.key(name)), (1000 + index, 1000 + index))
+        os.utime(os.path.join(self.cache_dir, self.key("probe")), (900, 900))
+        
+        cache = ThumbnailCache(cache_dir=self.cache_dir, max_bytes=self.entry_size * 2)
+        self.assertEqual(self.files(), sorted([self.key("b"), self.key("c")]))
+        self.assertEqual(cache.get_stats()["entries"], 2)
+    
+    def test_startup_removes_temp_files(self):
+        leftover = os.path.join(self.cache_dir, self.key("a") + ".123.tmp")
+        with open(leftover, "wb") as f:
+            f.write(b"partial")
+        ThumbnailCache(cache_dir=self.cache_dir)
+        self.assertFalse(os.path.exists(leftover))
+    
+    def test_reset_after_directory_was_cleared(self):
+        os.remove(os.path.join(self.cache_dir, self.key("probe")))
+        self.cache.reset()
+        self.assertEqual(self.cache.get_stats()["entries"], 0)
+        self.assertEqual(self.cache.get_stats()["total_size"], 0)
+    
+    def test_deleted_file_is_a_miss(self):
+        os.remove(os.path.join(self.cache_dir, self.key("probe")))
+        self.assertIsNone(self.cache.get(self.key("probe")))
+        self.assertEqual(self.cache.get_stats()["entries"], 0)
+    
+    def test_key_follows_the_original(self):
+        original = os.path.join(self._tmp.name, "original.png")
+        make_image().save(original)
+        key = self.cache.make_key(original, 64, 64)
+        self.assertEqual(self.cache.make_key(original, 64, 64), key)
+        self.assertNotEqual(self.cache.make_key(original, 128, 128), key)
+        
+        stat = os.stat(original)
+        os.utime(original, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertNotEqual(self.cache.make_key(original, 64, 64), key)
+        self.assertIsNone(self.cache.make_key(os.path.join(self._tmp.name, "missing.png"), 64, 64))
+    
+    def test_get_thumbnail_renders_once(self):
+        original = os.path.join(self._tmp.name, "original.png")
+        make_image().save(original)
+        rendered = []
+        
+        def render(path, max_width, max_height):
+            rendered.append(path)
+            return make_image()
+        
+        self.cache.get_thumbnail(original, 64, 64, render)
+        self.cache.get_thumbnail(original, 64, 64, render)
+        self.assertEqual(rendered, [original])
+
+
+if __name__ == "__main__":
+    unittest.main()